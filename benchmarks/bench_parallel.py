@@ -0,0 +1,76 @@
+# Copyright 2026 Spanish National Research Council (CSIC)
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Scaling of the parallel privatization with the number of workers.
+
+Run from the root of the repository:
+
+    python benchmarks/bench_parallel.py [n_rows]
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from trasgodp.pipeline import PrivatizationPlan, parallel_apply
+
+
+def synthetic_data(n_rows, seed=0):
+    """Generate a dataframe with numerical and categorical columns."""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame(
+        {
+            "age": rng.integers(17, 91, n_rows),
+            "hours": rng.normal(40, 12, n_rows),
+            "sex": rng.choice(["Female", "Male"], n_rows).astype(object),
+            "workclass": rng.choice([f"w{i}" for i in range(9)], n_rows).astype(object),
+        }
+    )
+
+
+def main():
+    """Time the plan with 1, 2, 4... workers for both executors."""
+    n_rows = int(float(sys.argv[1])) if len(sys.argv) > 1 else 2_000_000
+    data = synthetic_data(n_rows)
+    plan = PrivatizationPlan(
+        {
+            "age": {"mechanism": "laplace", "epsilon": 1, "lower_bound": 17},
+            "hours": {"mechanism": "gaussian", "epsilon": 1, "delta": 1e-5},
+            "sex": {"mechanism": "randomized_response_binary", "epsilon": 1},
+            "workclass": {"mechanism": "randomized_response_kary", "epsilon": 1},
+        }
+    )
+    workers = [1]
+    while workers[-1] * 2 <= (os.cpu_count() or 1):
+        workers.append(workers[-1] * 2)
+
+    print(f"{'executor':<10}{'workers':>8}{'seconds':>10}{'rows/s':>14}{'speedup':>9}")
+    for executor in ("thread", "process"):
+        base = None
+        for n_workers in workers:
+            start = time.perf_counter()
+            parallel_apply(plan, data, n_workers=n_workers, seed=0, executor=executor)
+            seconds = time.perf_counter() - start
+            base = base or seconds
+            print(
+                f"{executor:<10}{n_workers:>8}{seconds:>10.3f}"
+                f"{n_rows / seconds:>14.0f}{base / seconds:>9.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
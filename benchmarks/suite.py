@@ -0,0 +1,430 @@
+# Copyright 2026 Spanish National Research Council (CSIC)
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Throughput and memory of every mechanism and metric, with stored baselines.
+
+Each function of ``trasgodp.numerical``, ``trasgodp.categorical`` and
+``trasgodp.metrics`` is run on synthetic data, scaling the number of rows (with
+10 categories) and the number of categories (with a fixed number of rows), and
+on examples/adult.csv. For each case the best time of several runs is reported
+as rows per second, together with the peak memory traced in a separate run.
+
+Run from the root of the repository:
+
+    python benchmarks/suite.py [--max-rows 1e7] [--filter exponential]
+    python benchmarks/suite.py --save main         # store a baseline
+    python benchmarks/suite.py --compare main      # compare against it
+
+The baselines are stored in benchmarks/baselines/<name>.json. The comparison
+exits with status 1 if some case is slower than the baseline by more than the
+tolerance.
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from trasgodp import categorical, metrics, numerical
+
+BASELINES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines")
+ROWS = [10**3, 10**4, 10**5, 10**6, 10**7]
+CARDINALITIES = [2, 10, 100, 1_000, 10_000]
+EPSILON = 1
+
+
+def numerical_data(n_rows, n_categories, tmpdir, seed=0):
+    """Generate a dataframe with an integer and a float column."""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame(
+        {"age": rng.integers(17, 91, n_rows), "hours": rng.normal(40, 12, n_rows)}
+    )
+
+
+def categorical_data(n_rows, n_categories, tmpdir, seed=0):
+    """Generate a dataframe with a string column with some categories."""
+    rng = np.random.default_rng(seed)
+    labels = np.array([f"c{i}" for i in range(n_categories)], dtype=object)
+    # Zipf-like frequencies, as in real categorical attributes.
+    weights = 1 / np.arange(1, n_categories + 1)
+    codes = rng.choice(n_categories, n_rows, p=weights / weights.sum())
+    codes[:n_categories] = np.arange(min(n_categories, n_rows))
+    return pd.DataFrame({"x": labels[codes]})
+
+
+def npy_file(n_rows, n_categories, tmpdir, seed=0):
+    """Write a .npy file with a float column and return the input and output paths."""
+    data = numerical_data(n_rows, n_categories, tmpdir, seed)["hours"].values
+    input_path = os.path.join(tmpdir, "input.npy")
+    np.save(input_path, data)
+    return input_path, os.path.join(tmpdir, "output.npy")
+
+
+def counts_data(n_rows, n_categories, tmpdir, seed=0):
+    """Generate the number of rows of each category, as given by value_counts."""
+    rng = np.random.default_rng(seed)
+    weights = 1 / np.arange(1, n_categories + 1)
+    return rng.multinomial(n_rows, weights / weights.sum())
+
+
+def metrics_data(n_rows, n_categories, tmpdir, seed=0):
+    """Generate a dataframe and its version with DP for the metrics."""
+    df = categorical_data(n_rows, n_categories, tmpdir, seed)
+    df["age"] = numerical_data(n_rows, n_categories, tmpdir, seed)["age"]
+    df_dp = categorical.dp_exponential(df, "x", EPSILON, new_column=True, rng=seed)
+    df_dp = numerical.dp_clip_laplace(df_dp, "age", EPSILON, new_column=True, rng=seed)
+    return df, df_dp
+
+
+# name: (group, data generator, function of the generated data, scaled in
+# categories, number of categories: the minimum if scaled, otherwise the one of
+# the data or None if it has no categories)
+CASES = {
+    "dp_clip_laplace": (
+        "numerical",
+        numerical_data,
+        lambda df: numerical.dp_clip_laplace(df, "age", EPSILON, rng=0),
+        False,
+        None,
+    ),
+    "dp_clip_laplace_array": (
+        "numerical",
+        numerical_data,
+        lambda df: numerical.dp_clip_laplace_array(df["hours"].values, EPSILON, rng=0),
+        False,
+        None,
+    ),
+    "dp_clip_gaussian": (
+        "numerical",
+        numerical_data,
+        lambda df: numerical.dp_clip_gaussian(df, "hours", EPSILON, 1e-5, rng=0),
+        False,
+        None,
+    ),
+    "dp_clip_gaussian_array": (
+        "numerical",
+        numerical_data,
+        lambda df: numerical.dp_clip_gaussian_array(
+            df["age"].values, EPSILON, 1e-5, rng=0
+        ),
+        False,
+        None,
+    ),
+    "dp_clip_laplace_memmap": (
+        "numerical",
+        npy_file,
+        lambda paths: numerical.dp_clip_laplace_memmap(
+            paths[0], EPSILON, output_path=paths[1], rng=0
+        ),
+        False,
+        None,
+    ),
+    "dp_clip_gaussian_memmap": (
+        "numerical",
+        npy_file,
+        lambda paths: numerical.dp_clip_gaussian_memmap(
+            paths[0], EPSILON, 1e-5, output_path=paths[1], rng=0
+        ),
+        False,
+        None,
+    ),
+    "dp_exponential": (
+        "categorical",
+        categorical_data,
+        lambda df: categorical.dp_exponential(df, "x", EPSILON, rng=0),
+        True,
+        2,
+    ),
+    "dp_exponential[category]": (
+        "categorical",
+        lambda *args: categorical_data(*args).astype("category"),
+        lambda df: categorical.dp_exponential(df, "x", EPSILON, rng=0),
+        True,
+        2,
+    ),
+    "dp_exponential_array": (
+        "categorical",
+        categorical_data,
+        lambda df: categorical.dp_exponential_array(df["x"].values, EPSILON, rng=0),
+        True,
+        2,
+    ),
+    "dp_randomized_response_binary": (
+        "categorical",
+        categorical_data,
+        lambda df: categorical.dp_randomized_response_binary(df, "x", EPSILON, rng=0),
+        False,
+        2,
+    ),
+    "dp_randomized_response_binary_array": (
+        "categorical",
+        categorical_data,
+        lambda df: categorical.dp_randomized_response_binary_array(
+            df["x"].values, EPSILON, packed=True, rng=0
+        ),
+        False,
+        2,
+    ),
+    "dp_randomized_response_kary": (
+        "categorical",
+        categorical_data,
+        lambda df: categorical.dp_randomized_response_kary(df, "x", EPSILON, rng=0),
+        True,
+        3,
+    ),
+    "dp_randomized_response_kary_array": (
+        "categorical",
+        categorical_data,
+        lambda df: categorical.dp_randomized_response_kary_array(
+            df["x"].values, EPSILON, rng=0
+        ),
+        True,
+        3,
+    ),
+    "FrequencyEstimator.update": (
+        "categorical",
+        categorical_data,
+        lambda df: categorical.FrequencyEstimator(
+            np.sort(df["x"].unique()), EPSILON
+        ).update(df["x"]),
+        True,
+        3,
+    ),
+    "correlation_loss": (
+        "metrics",
+        metrics_data,
+        lambda data: metrics.correlation_loss(
+            data[0], data[1], ["x", "age"], new_column=True
+        ),
+        True,
+        2,
+    ),
+    "divergence_distributions": (
+        "metrics",
+        metrics_data,
+        lambda data: metrics.divergence_distributions(
+            data[0], data[1], "x", new_column=True
+        ),
+        True,
+        2,
+    ),
+    "expected_divergence": (
+        "metrics",
+        counts_data,
+        lambda counts: metrics.expected_divergence(counts, "exponential", EPSILON),
+        True,
+        2,
+    ),
+    "UtilityEvaluator.evaluate": (
+        "metrics",
+        metrics_data,
+        lambda data: metrics.UtilityEvaluator(data[0], ["x", "age"]).evaluate(
+            data[1], new_column=True
+        ),
+        True,
+        2,
+    ),
+}
+
+# Functions applied to examples/adult.csv and to its version with DP:
+# (column, function of both dataframes).
+ADULT = {
+    "dp_clip_laplace": (
+        "age",
+        lambda data: numerical.dp_clip_laplace(data[0], "age", EPSILON, rng=0),
+    ),
+    "dp_clip_gaussian": (
+        "hours-per-week",
+        lambda data: numerical.dp_clip_gaussian(
+            data[0], "hours-per-week", EPSILON, rng=0
+        ),
+    ),
+    "dp_exponential": (
+        "native-country",
+        lambda data: categorical.dp_exponential(
+            data[0], "native-country", EPSILON, rng=0
+        ),
+    ),
+    "dp_randomized_response_binary": (
+        "sex",
+        lambda data: categorical.dp_randomized_response_binary(
+            data[0], "sex", EPSILON, rng=0
+        ),
+    ),
+    "dp_randomized_response_kary": (
+        "education",
+        lambda data: categorical.dp_randomized_response_kary(
+            data[0], "education", EPSILON, rng=0
+        ),
+    ),
+    "correlation_loss": (
+        "workclass",
+        lambda data: metrics.correlation_loss(data[0], data[1]),
+    ),
+    "divergence_distributions": (
+        "workclass",
+        lambda data: metrics.divergence_distributions(data[0], data[1], "workclass"),
+    ),
+}
+
+
+def measure(function, data, n_rows, repeat):
+    """Get the best time of several runs and the peak memory of another one."""
+    # A first run, not measured, loads the modules imported lazily.
+    function(data)
+    seconds = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(data)
+        seconds = min(seconds, time.perf_counter() - start)
+
+    tracemalloc.start()
+    function(data)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "rows": n_rows,
+        "seconds": seconds,
+        "rows_per_second": n_rows / seconds if seconds > 0 else float("inf"),
+        "peak_mb": peak / 2**20,
+    }
+
+
+def synthetic_cases(max_rows, rows_for_categories):
+    """List the synthetic cases: (name, number of rows, number of categories)."""
+    cases = []
+    for name, (_, _, _, scaled, categories) in CASES.items():
+        k_rows = max(10, categories) if scaled else categories
+        for n_rows in ROWS:
+            if n_rows <= max_rows:
+                cases.append((name, n_rows, k_rows))
+        if scaled:
+            for k in CARDINALITIES:
+                if k >= categories and k != 10:
+                    cases.append((name, rows_for_categories, k))
+    return cases
+
+
+def run(max_rows, repeat, pattern):
+    """Run every case whose name contains the pattern."""
+    results = {}
+    rows_for_categories = min(10**6, max_rows)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for name, n_rows, k in synthetic_cases(max_rows, rows_for_categories):
+            if pattern not in name:
+                continue
+            group, generate, function, _, _ = CASES[name]
+            data = generate(n_rows, k, tmpdir)
+            key = (
+                f"{name}[rows={n_rows}]"
+                if k is None
+                else f"{name}[rows={n_rows},k={k}]"
+            )
+            results[key] = {"group": group, "categories": k}
+            results[key].update(measure(function, data, n_rows, repeat))
+            report(key, results[key])
+            del data
+
+    adult_path = os.path.join("examples", "adult.csv")
+    if os.path.exists(adult_path):
+        adult = pd.read_csv(adult_path, skipinitialspace=True)
+        adult.columns = adult.columns.str.strip()
+        adult_dp = categorical.dp_exponential(adult, "workclass", EPSILON, rng=0)
+        for name, (column, function) in ADULT.items():
+            if pattern not in name:
+                continue
+            key = f"{name}[adult.csv:{column}]"
+            results[key] = {"group": "adult", "categories": adult[column].nunique()}
+            data = (adult, adult_dp)
+            results[key].update(measure(function, data, len(adult), repeat))
+            report(key, results[key])
+    return results
+
+
+def report(key, result):
+    """Print the result of a case."""
+    print(
+        f"{key:<60}{result['rows_per_second']:>14.0f}{result['peak_mb']:>10.1f}",
+        flush=True,
+    )
+
+
+def environment():
+    """Describe the environment where the benchmarks are run."""
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpus": os.cpu_count(),
+        "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+
+def compare(results, baseline, tolerance):
+    """Print the ratio of throughputs against a baseline and count regressions."""
+    regressions = 0
+    print(f"\n{'case':<60}{'baseline':>14}{'current':>14}{'ratio':>8}")
+    for key, result in results.items():
+        if key not in baseline:
+            continue
+        before = baseline[key]["rows_per_second"]
+        after = result["rows_per_second"]
+        ratio = after / before
+        flag = ""
+        if ratio < 1 - tolerance:
+            flag = "  REGRESSION"
+            regressions += 1
+        print(f"{key:<60}{before:>14.0f}{after:>14.0f}{ratio:>8.2f}{flag}")
+    return regressions
+
+
+def main():
+    """Run the suite, and store or compare the baselines."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--max-rows", type=float, default=1e6)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--filter", default="", help="run the cases with this name")
+    parser.add_argument("--save", metavar="NAME", help="store the results as NAME")
+    parser.add_argument("--compare", metavar="NAME", help="compare with baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args()
+
+    print(f"{'case':<60}{'rows/s':>14}{'peak MB':>10}")
+    results = run(int(args.max_rows), args.repeat, args.filter)
+
+    if args.save:
+        os.makedirs(BASELINES, exist_ok=True)
+        path = os.path.join(BASELINES, f"{args.save}.json")
+        with open(path, "w") as f:
+            json.dump({"environment": environment(), "results": results}, f, indent=1)
+        print(f"\nBaseline stored in {path}")
+
+    if args.compare:
+        with open(os.path.join(BASELINES, f"{args.compare}.json")) as f:
+            baseline = json.load(f)["results"]
+        if compare(results, baseline, args.tolerance):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,17 @@
+import asyncio
+import concurrent.futures
+import contextlib
+import importlib.util
+import io
+import json
+import os
+import pickle
+import tempfile
+import threading
+import tracemalloc
 import unittest
-from trasgodp import numerical, categorical, metrics
+import trasgodp
+from trasgodp import numerical, categorical, metrics, pipeline, cli
 import numpy as np
 import pandas as pd
 
@@ -30,6 +42,19 @@ class TestInvalidValues(unittest.TestCase):
         with self.assertRaises(ValueError):
             numerical.dp_clip_laplace(self.data, column, epsilon)
 
+    def test_error_bounds_laplace(self):
+        with self.assertRaises(ValueError):
+            numerical.dp_clip_laplace_array(np.arange(10), 1, 9, 1)
+        with self.assertRaises(ValueError):
+            numerical.dp_clip_gaussian_array(np.arange(10.0), 1, 1e-5, [0, 5], [1, 4])
+
+    def test_integer_bounds_laplace(self):
+        result = numerical.dp_clip_laplace_array(np.arange(11), 1, 0.5, 10.5, rng=0)
+        self.assertGreaterEqual(result.min(), 1)
+        self.assertLessEqual(result.max(), 10)
+        with self.assertRaises(ValueError):
+            numerical.dp_clip_laplace_array(np.arange(11), 1, 0.2, 0.8)
+
     def test_output_laplace(self):
         epsilon = 1
         column = "age"
@@ -54,6 +79,77 @@ class TestInvalidValues(unittest.TestCase):
         data_dp = numerical.dp_clip_laplace(self.data, column, epsilon, new_column=True)
         assert len(data_dp.columns) == len(self.data.columns) + 1
 
+    def test_output_laplace_array(self):
+        epsilon = 1
+        data = self.data["age"].values
+        data_dp = numerical.dp_clip_laplace_array(data, epsilon)
+        assert isinstance(data_dp, np.ndarray)
+        assert data_dp.dtype == data.dtype
+        assert data_dp.min() >= data.min() and data_dp.max() <= data.max()
+
+    def test_laplace_array_2d(self):
+        data = self.data[["age", "hours-per-week"]].values.astype(float)
+        lower_bound = [17, 1]
+        upper_bound = [90, 60]
+        data_dp = numerical.dp_clip_laplace_array(
+            data, [0.5, 2], lower_bound, upper_bound
+        )
+        assert data_dp.shape == data.shape
+        assert np.all(data_dp.min(axis=0) >= lower_bound)
+        assert np.all(data_dp.max(axis=0) <= upper_bound)
+
+    def test_laplace_array_inplace(self):
+        data = self.data["age"].values.astype(float)
+        data_dp = numerical.dp_clip_laplace_array(data, 1, copy=False)
+        assert data_dp is data
+
+    def test_error_epsilon_laplace_array(self):
+        data = self.data[["age", "hours-per-week"]].values
+        with self.assertRaises(ValueError):
+            numerical.dp_clip_laplace_array(data, [1, 0])
+
+    def test_error_type_laplace_array(self):
+        with self.assertRaises(ValueError):
+            numerical.dp_clip_laplace_array(self.data["education"].values, 1)
+
+    def test_laplace_memmap_new_file(self):
+        data = self.data[["age", "hours-per-week"]].values.astype(float)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            input_path = os.path.join(tmpdir, "input.npy")
+            output_path = os.path.join(tmpdir, "output.npy")
+            np.save(input_path, data)
+            data_dp = numerical.dp_clip_laplace_memmap(
+                input_path, [1, 2], output_path=output_path, block_rows=1000
+            )
+            assert isinstance(data_dp, np.memmap)
+            data_dp = np.load(output_path)
+            assert np.array_equal(np.load(input_path), data)
+        assert data_dp.shape == data.shape
+        assert np.all(data_dp.min(axis=0) >= data.min(axis=0))
+        assert np.all(data_dp.max(axis=0) <= data.max(axis=0))
+
+    def test_laplace_memmap_inplace(self):
+        data = self.data["age"].values
+        with tempfile.TemporaryDirectory() as tmpdir:
+            input_path = os.path.join(tmpdir, "input.npy")
+            np.save(input_path, data)
+            numerical.dp_clip_laplace_memmap(input_path, 1, block_rows=1000)
+            data_dp = np.load(input_path)
+        assert data_dp.dtype == data.dtype
+        assert not np.array_equal(data_dp, data)
+
+    def test_gaussian_memmap(self):
+        data = self.data["age"].values.astype(float)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            input_path = os.path.join(tmpdir, "input.npy")
+            output_path = os.path.join(tmpdir, "output.npy")
+            np.save(input_path, data)
+            numerical.dp_clip_gaussian_memmap(
+                input_path, 1, 1e-5, 20, 60, output_path=output_path
+            )
+            data_dp = np.load(output_path)
+        assert data_dp.min() >= 20 and data_dp.max() <= 60
+
     def test_error_column_gaussian(self):
         column = "educatin"
         epsilon = 1
@@ -111,6 +207,22 @@ class TestInvalidValues(unittest.TestCase):
         )
         assert len(data_dp.columns) == len(self.data.columns) + 1
 
+    def test_gaussian_array_2d(self):
+        data = self.data[["age", "hours-per-week"]].values
+        data_dp = numerical.dp_clip_gaussian_array(data, [1, 2], [1e-5, 1e-3])
+        assert data_dp.shape == data.shape
+        assert np.issubdtype(data_dp.dtype, np.integer)
+        assert np.all(data_dp.max(axis=0) <= data.max(axis=0))
+
+    def test_gaussian_array_inplace_int(self):
+        data = self.data["age"].values.copy()
+        data_dp = numerical.dp_clip_gaussian_array(data, 1, copy=False)
+        assert data_dp is data
+
+    def test_error_delta_gaussian_array(self):
+        with self.assertRaises(ValueError):
+            numerical.dp_clip_gaussian_array(self.data["age"].values, 1, delta=2)
+
     def test_error_column_exponential(self):
         column = "educatin"
         epsilon = 1
@@ -158,6 +270,16 @@ class TestInvalidValues(unittest.TestCase):
         )
         assert isinstance(data_dp, np.ndarray)
 
+    def test_distribution_exponential_array(self):
+        epsilon = 1
+        data = self.data["education"].values
+        k = len(np.unique(data))
+        np.random.seed(0)
+        data_dp = categorical.dp_exponential_array(data, epsilon)
+        p_same = np.exp(epsilon / 2) / (np.exp(epsilon / 2) + k - 1)
+        assert abs(np.mean(data_dp == data) - p_same) < 0.01
+        assert set(np.unique(data_dp)) <= set(np.unique(data))
+
     def test_output_exponential_newcolumn(self):
         epsilon = 1
         column = "education"
@@ -186,6 +308,33 @@ class TestInvalidValues(unittest.TestCase):
         data_dp = categorical.dp_randomized_response_binary(self.data, column, epsilon)
         assert isinstance(data_dp, pd.DataFrame)
 
+    def test_distribution_rr_binary(self):
+        epsilon = 1
+        column = "sex"
+        np.random.seed(0)
+        data_dp = categorical.dp_randomized_response_binary(self.data, column, epsilon)
+        p = np.exp(epsilon) / (np.exp(epsilon) + 1)
+        assert abs(np.mean(data_dp[column] == self.data[column]) - p) < 0.01
+
+    def test_output_rr_binary_array_packed(self):
+        epsilon = 1
+        data = self.data["sex"].values
+        data_dp = categorical.dp_randomized_response_binary_array(
+            data, epsilon, positive_label="Female", packed=True
+        )
+        assert data_dp.dtype == np.uint8
+        assert len(data_dp) == (len(data) + 7) // 8
+        dp_bits = np.unpackbits(data_dp, count=len(data)).astype(bool)
+        p = np.exp(epsilon) / (np.exp(epsilon) + 1)
+        assert abs(np.mean(dp_bits == (data == "Female")) - p) < 0.02
+
+    def test_binary_rr_binary_array(self):
+        epsilon = 1
+        with self.assertRaises(ValueError):
+            categorical.dp_randomized_response_binary_array(
+                self.data["workclass"].values, epsilon
+            )
+
     def test_binary_rr_binary(self):
         epsilon = 1
         column = "workclass"
@@ -237,6 +386,127 @@ class TestInvalidValues(unittest.TestCase):
         data_dp = categorical.dp_randomized_response_kary(self.data, column, epsilon)
         assert isinstance(data_dp, pd.DataFrame)
 
+    def test_distribution_kary(self):
+        epsilon = 1
+        column = "workclass"
+        k = len(np.unique(self.data[column]))
+        np.random.seed(0)
+        data_dp = categorical.dp_randomized_response_kary(self.data, column, epsilon)
+        p_b = k / (np.exp(epsilon) + k - 1)
+        p_same = 1 - p_b + p_b / k
+        assert abs(np.mean(data_dp[column] == self.data[column]) - p_same) < 0.01
+
+    def test_output_kary_categorical(self):
+        epsilon = 1
+        column = "workclass"
+        data_dp = categorical.dp_randomized_response_kary(
+            self.data, column, epsilon, as_categorical=True
+        )
+        assert isinstance(data_dp[column].dtype, pd.CategoricalDtype)
+        assert set(data_dp[column].cat.categories) == set(self.data[column])
+
+    def test_categorical_input(self):
+        data = self.data.astype({"workclass": "category", "sex": "category"})
+        for function, column in [
+            (categorical.dp_exponential, "workclass"),
+            (categorical.dp_randomized_response_kary, "workclass"),
+            (categorical.dp_randomized_response_binary, "sex"),
+        ]:
+            data_dp = function(data, column, 1, rng=0)
+            assert isinstance(data_dp[column].dtype, pd.CategoricalDtype)
+            assert data_dp[column].cat.codes.dtype == np.int8
+            expected = function(self.data, column, 1, rng=0)
+            np.testing.assert_array_equal(
+                data_dp[column].astype(object).values, expected[column].values
+            )
+
+    def test_categorical_input_array(self):
+        data = pd.Categorical(self.data["sex"])
+        data_dp = categorical.dp_randomized_response_binary_array(data, 1, rng=0)
+        assert isinstance(data_dp, pd.Categorical)
+        expected = categorical.dp_randomized_response_binary_array(
+            self.data["sex"].values, 1, rng=0
+        )
+        np.testing.assert_array_equal(np.asarray(data_dp, dtype=object), expected)
+        data = pd.Categorical(self.data["workclass"])
+        data_dp = categorical.dp_exponential_array(data, 1, rng=0)
+        assert isinstance(data_dp, pd.Categorical)
+
+    def test_categorical_missing(self):
+        df = pd.DataFrame({"x": pd.Categorical(["a", None, "b", "c", "a"])})
+        data_dp = categorical.dp_randomized_response_kary(df, "x", 100)
+        assert data_dp["x"].isna().tolist() == df["x"].isna().tolist()
+        with self.assertRaises(ValueError):
+            categorical.dp_exponential(df, "x", 1, categories=["c", "b", "a"])
+
+    def test_integer_codes(self):
+        codes = np.random.randint(0, 5, 1000).astype(np.int8)
+        df = pd.DataFrame({"x": codes})
+        for function in [
+            categorical.dp_exponential,
+            categorical.dp_randomized_response_kary,
+        ]:
+            data_dp = function(df, "x", 100, categories=range(5), as_categorical=True)
+            np.testing.assert_array_equal(data_dp["x"].cat.codes.values, codes)
+        with self.assertRaises(ValueError):
+            categorical.dp_randomized_response_kary(df, "x", 1, categories=range(4))
+        with self.assertRaises(ValueError):
+            categorical.dp_exponential(df, "x", 1)
+
+    def test_category_encoder(self):
+        encoder = categorical.CategoryEncoder.from_data(self.data["workclass"])
+        assert list(encoder) == sorted(set(self.data["workclass"]))
+        codes = encoder.encode(self.data["workclass"])
+        assert codes.dtype == np.int8
+        np.testing.assert_array_equal(
+            encoder.decode(codes), self.data["workclass"].values
+        )
+        for function in [
+            categorical.dp_exponential,
+            categorical.dp_randomized_response_kary,
+        ]:
+            pd.testing.assert_frame_equal(
+                function(self.data, "workclass", 1, categories=encoder, rng=0),
+                function(self.data, "workclass", 1, rng=0),
+            )
+        with self.assertRaises(ValueError):
+            categorical.CategoryEncoder(["a", "b", "a"])
+
+    def test_categories_array(self):
+        data = self.data["workclass"].values
+        categories = list(set(data)) + ["Unused"]
+        data_dp = categorical.dp_exponential_array(
+            data, 1, rng=0, categories=categories
+        )
+        assert set(data_dp) <= set(categories)
+        with self.assertRaises(ValueError):
+            categorical.dp_exponential_array(data, 1, categories=["Private"])
+        data = self.data["sex"].values
+        data_dp = categorical.dp_randomized_response_binary_array(
+            data, 1, rng=0, categories=["Male", "Female"]
+        )
+        expected = categorical.dp_randomized_response_binary_array(
+            data, 1, positive_label="Male", rng=0
+        )
+        np.testing.assert_array_equal(data_dp, expected)
+
+    def test_categories_kary(self):
+        epsilon = 1
+        column = "workclass"
+        categories = sorted(set(self.data[column])) + ["Unknown"]
+        data_dp = categorical.dp_randomized_response_kary(
+            self.data, column, epsilon, categories=categories
+        )
+        assert set(data_dp[column]) <= set(categories)
+
+    def test_error_categories_kary(self):
+        epsilon = 1
+        column = "workclass"
+        with self.assertRaises(ValueError):
+            categorical.dp_randomized_response_kary(
+                self.data, column, epsilon, categories=["Private", "State-gov", "?"]
+            )
+
     def test_binary_kary(self):
         epsilon = 1
         column = "sex"
@@ -389,5 +659,1062 @@ class TestInvalidValues(unittest.TestCase):
         )
 
 
+class TestCopyFree(unittest.TestCase):
+    n = 200_000
+    data = pd.DataFrame(np.random.random((n, 20)), columns=[f"x{i}" for i in range(20)])
+    data["age"] = np.random.randint(17, 90, n)
+    data["sex"] = np.random.choice(["Female", "Male"], n).astype(object)
+    data["workclass"] = np.random.choice(["a", "b", "c", "d"], n).astype(object)
+
+    def _peak_memory(self, mechanism, *args, **kwargs):
+        tracemalloc.start()
+        mechanism(*args, **kwargs)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return peak
+
+    def test_inplace_same_frame(self):
+        df = self.data.copy()
+        mechanisms = [
+            (numerical.dp_clip_laplace, "x0"),
+            (numerical.dp_clip_gaussian, "age"),
+            (categorical.dp_exponential, "workclass"),
+            (categorical.dp_randomized_response_binary, "sex"),
+            (categorical.dp_randomized_response_kary, "workclass"),
+        ]
+        for mechanism, column in mechanisms:
+            data_dp = mechanism(df, column, 1, inplace=True)
+            assert data_dp is df
+
+    def test_no_inplace_input_unchanged(self):
+        df = self.data.copy()
+        numerical.dp_clip_laplace(df, "age", 1)
+        pd.testing.assert_frame_equal(df, self.data)
+
+    def test_copy_on_write_shares_columns(self):
+        with pd.option_context("mode.copy_on_write", True):
+            df = self.data.copy()
+            data_dp = numerical.dp_clip_laplace(df, "age", 1)
+            assert np.shares_memory(data_dp["x1"].values, df["x1"].values)
+            pd.testing.assert_frame_equal(df, self.data)
+
+    def test_memory_inplace_laplace(self):
+        df = self.data.copy()
+        column_size = df["x0"].values.nbytes
+        peak = self._peak_memory(numerical.dp_clip_laplace, df, "x0", 1, inplace=True)
+        assert peak < 3 * column_size
+
+    def test_memory_inplace_gaussian(self):
+        df = self.data.copy()
+        column_size = df["age"].values.nbytes
+        peak = self._peak_memory(
+            numerical.dp_clip_gaussian, df, "age", 1, new_column=True, inplace=True
+        )
+        assert peak < 3 * column_size
+
+
+class TestPipeline(unittest.TestCase):
+    data = TestInvalidValues.data
+    columns = {
+        "age": {"mechanism": "laplace", "epsilon": 1, "lower_bound": 17},
+        "hours-per-week": {"mechanism": "gaussian", "epsilon": 1, "delta": 1e-5},
+        "education": {"mechanism": "exponential", "epsilon": 1},
+        "sex": {
+            "mechanism": "randomized_response_binary",
+            "epsilon": 1,
+            "positive_label": "Female",
+        },
+        "workclass": {"mechanism": "randomized_response_kary", "epsilon": 1},
+    }
+
+    def test_error_mechanism_plan(self):
+        with self.assertRaises(ValueError):
+            pipeline.PrivatizationPlan({"age": {"mechanism": "lap", "epsilon": 1}})
+
+    def test_error_argument_plan(self):
+        with self.assertRaises(ValueError):
+            pipeline.PrivatizationPlan().add("age", "laplace", 1, delta=1e-5)
+
+    def test_error_epsilon_plan(self):
+        with self.assertRaises(ValueError):
+            pipeline.PrivatizationPlan().add("age", "laplace", -1)
+
+    def test_error_column_plan(self):
+        plan = pipeline.PrivatizationPlan().add("agee", "laplace", 1)
+        with self.assertRaises(ValueError):
+            plan.apply(self.data)
+
+    def test_error_type_plan(self):
+        plan = pipeline.PrivatizationPlan().add("education", "gaussian", 1)
+        with self.assertRaises(ValueError):
+            plan.apply(self.data)
+
+    def test_output_plan(self):
+        plan = pipeline.PrivatizationPlan(self.columns)
+        data_dp = plan.apply(self.data)
+        assert isinstance(data_dp, pd.DataFrame)
+        assert list(data_dp.columns) == list(self.data.columns)
+        assert set(plan.timings) == set(self.columns)
+
+    def test_output_plan_newcolumn_len(self):
+        plan = pipeline.PrivatizationPlan(self.columns)
+        data_dp = plan.apply(self.data, new_column=True)
+        assert len(data_dp.columns) == len(self.data.columns) + len(self.columns)
+
+    def test_plan_inplace(self):
+        df = self.data.copy()
+        plan = pipeline.PrivatizationPlan(self.columns)
+        assert plan.apply(df, inplace=True) is df
+
+    def _write_csv(self, tmpdir):
+        path = os.path.join(tmpdir, "input.csv")
+        self.data.to_csv(path, index=False)
+        return path
+
+    def test_fix_domains(self):
+        plan = pipeline.PrivatizationPlan(self.columns)
+        chunks = [self.data.iloc[i : i + 5000] for i in range(0, len(self.data), 5000)]
+        fixed = pipeline.fix_domains(plan, chunks)
+        assert fixed.columns["age"]["lower_bound"] == 17
+        assert fixed.columns["age"]["upper_bound"] == self.data["age"].max()
+        assert list(fixed.columns["workclass"]["categories"]) == sorted(
+            set(self.data["workclass"])
+        )
+
+    def test_fix_domains_chunks(self):
+        plan = pipeline.PrivatizationPlan(self.columns)
+        data = self.data.copy()
+        data.loc[data.index[::7], "workclass"] = np.nan
+        chunks = [data.iloc[:0], data.iloc[:5000], data.iloc[:0], data.iloc[5000:]]
+        fixed = pipeline.fix_domains(plan, chunks)
+        _, categories = pd.factorize(
+            data["workclass"].values, sort=True, use_na_sentinel=False
+        )
+        assert fixed.columns["age"]["lower_bound"] == data["age"].min()
+        assert fixed.columns["workclass"]["categories"].index.equals(pd.Index(categories))
+        assert fixed.apply(data)["workclass"].isna().any()
+
+    def test_privatize_csv(self):
+        plan = pipeline.PrivatizationPlan(self.columns)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            output_path = os.path.join(tmpdir, "output.csv")
+            stats = pipeline.privatize_csv(
+                plan, self._write_csv(tmpdir), output_path, chunksize=5000
+            )
+            data_dp = pd.read_csv(output_path)
+        assert stats["rows"] == len(self.data)
+        assert stats["rows_per_second"] > 0
+        assert list(data_dp.columns) == list(self.data.columns)
+        assert set(data_dp["workclass"]) <= set(self.data["workclass"])
+        assert data_dp["age"].min() >= 17
+        assert data_dp["age"].max() <= self.data["age"].max()
+
+    def test_parallel_reproducible(self):
+        plan = pipeline.PrivatizationPlan(self.columns)
+        data_dp_process = pipeline.parallel_apply(
+            plan, self.data, n_workers=2, n_shards=4, seed=0
+        )
+        data_dp_thread = pipeline.parallel_apply(
+            plan, self.data, n_workers=3, n_shards=4, seed=0, executor="thread"
+        )
+        pd.testing.assert_frame_equal(data_dp_process, data_dp_thread)
+        assert list(data_dp_process.columns) == list(self.data.columns)
+
+    def test_parallel_shards_independent(self):
+        plan = pipeline.PrivatizationPlan().add("age", "laplace", 1)
+        df = pd.DataFrame({"age": np.zeros(10_000)})
+        df.loc[0, "age"] = 1
+        data_dp = pipeline.parallel_apply(
+            plan, df, n_workers=1, n_shards=2, seed=0, executor="thread"
+        )
+        first, second = np.split(data_dp["age"].values, 2)
+        assert not np.array_equal(first, second)
+
+    def test_parallel_rng_plan(self):
+        plan = pipeline.PrivatizationPlan(self.columns)
+        data_dp_1 = plan.apply(self.data, rng=1)
+        data_dp_2 = plan.apply(self.data, rng=np.random.default_rng(1))
+        pd.testing.assert_frame_equal(data_dp_1, data_dp_2)
+
+    def test_error_executor_parallel(self):
+        plan = pipeline.PrivatizationPlan(self.columns)
+        with self.assertRaises(ValueError):
+            pipeline.parallel_apply(plan, self.data, executor="gpu")
+
+    @unittest.skipUnless(importlib.util.find_spec("pyarrow"), "pyarrow not installed")
+    def test_privatize_parquet(self):
+        plan = pipeline.PrivatizationPlan(self.columns)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            input_path = os.path.join(tmpdir, "input.parquet")
+            output_path = os.path.join(tmpdir, "output.parquet")
+            self.data.to_parquet(input_path)
+            stats = pipeline.privatize_parquet(
+                plan, input_path, output_path, batch_size=5000
+            )
+            data_dp = pd.read_parquet(output_path)
+        assert stats["rows"] == len(self.data)
+        assert data_dp.shape == self.data.shape
+
+    @unittest.skipUnless(importlib.util.find_spec("pyarrow"), "pyarrow not installed")
+    def test_apply_arrow(self):
+        import pyarrow as pa
+
+        plan = pipeline.fix_domains(
+            pipeline.PrivatizationPlan(self.columns), [self.data]
+        )
+        table = pa.Table.from_pandas(self.data, preserve_index=False)
+        for data in [table, table.to_batches(max_chunksize=10000)[0]]:
+            data_dp = pipeline.apply_arrow(plan, data, new_column=True, rng=0)
+            assert data_dp.num_rows == data.num_rows
+            assert data_dp.num_columns == data.num_columns + len(self.columns)
+            assert pa.types.is_dictionary(data_dp.schema.field("dp_workclass").type)
+            assert data_dp.schema.field("dp_age").type == pa.int64()
+            assert set(plan.timings) == set(self.columns)
+        expected = plan.apply(self.data.iloc[: data.num_rows], new_column=True, rng=0)
+        for column in self.columns:
+            np.testing.assert_array_equal(
+                data_dp.column(f"dp_{column}").to_pandas().astype(object),
+                expected[f"dp_{column}"].astype(object),
+            )
+        pd.testing.assert_frame_equal(data.to_pandas(), self.data.iloc[: data.num_rows])
+
+    @unittest.skipUnless(importlib.util.find_spec("pyarrow"), "pyarrow not installed")
+    def test_apply_arrow_batches(self):
+        import pyarrow as pa
+
+        df = pd.DataFrame(
+            {
+                "x": ["a", "b", "c"] * 3 + ["a"] * 300,
+                "k": ["a", "b", "c"] * 3 + ["a"] * 300,
+                "n": np.r_[0:9, 100:400],
+            }
+        )
+        table = pa.Table.from_batches(
+            pa.Table.from_pandas(df, preserve_index=False).to_batches(max_chunksize=9)
+        )
+        self.assertGreater(table.num_rows, len(table.to_batches()[0]))
+
+        plan = pipeline.PrivatizationPlan().add("n", "laplace", 0.1)
+        data_dp = pipeline.apply_arrow(plan, table, rng=0)
+        expected = plan.apply(table.to_pandas(), rng=0)
+        np.testing.assert_array_equal(data_dp.column("n").to_numpy(), expected["n"])
+
+        plan = pipeline.PrivatizationPlan(
+            {
+                "x": {"mechanism": "exponential", "epsilon": 0.1},
+                "k": {"mechanism": "randomized_response_kary", "epsilon": 0.1},
+            }
+        )
+        data_dp = pipeline.apply_arrow(plan, table, rng=0)
+        for column in ["x", "k"]:
+            values = data_dp.column(column).to_pandas().astype(object)
+            self.assertEqual(set(values), {"a", "b", "c"})
+            self.assertLess((values[9:] == "a").mean(), 0.9)
+
+    @unittest.skipUnless(importlib.util.find_spec("pyarrow"), "pyarrow not installed")
+    def test_error_apply_arrow(self):
+        import pyarrow as pa
+
+        plan = pipeline.PrivatizationPlan(self.columns)
+        with self.assertRaises(ValueError):
+            pipeline.apply_arrow(plan, self.data)
+        table = pa.table({"age": ["a", "b"]})
+        with self.assertRaises(ValueError):
+            pipeline.apply_arrow(plan, table)
+
+    def test_sweep_output(self):
+        epsilons = [0.1, 1, 10]
+        curve = pipeline.sweep(
+            self.data, "workclass", "exponential", epsilons, repetitions=3, rng=0
+        )
+        assert len(curve) == 4 * len(epsilons)
+        assert set(curve.metric) == {"correlation_loss", "tvd", "js", "kl"}
+        assert (curve.ci_lower <= curve["mean"]).all()
+        assert (curve["mean"] <= curve.ci_upper).all()
+        tvd = curve[curve.metric == "tvd"]["mean"]
+        assert tvd.is_monotonic_decreasing
+
+    def test_sweep_reproducible(self):
+        for mechanism, column in [
+            ("laplace", "age"),
+            ("gaussian", "age"),
+            ("randomized_response_binary", "sex"),
+            ("randomized_response_kary", "workclass"),
+        ]:
+            first = pipeline.sweep(
+                self.data, column, mechanism, [0.5, 5], repetitions=2, rng=3
+            )
+            second = pipeline.sweep(
+                self.data, column, mechanism, [0.5, 5], 2, rng=3, n_workers=1
+            )
+            pd.testing.assert_frame_equal(first, second)
+
+    def test_sweep_matches_evaluator(self):
+        curve = pipeline.sweep(
+            self.data, "age", "laplace", [1], repetitions=1, features=["age"], rng=0
+        )
+        assert curve.ci_lower.isna().all()
+        evaluator = metrics.UtilityEvaluator(self.data, ["age"])
+        rng = np.random.default_rng(0)
+        df_dp = numerical.dp_clip_laplace(self.data, "age", 1, rng=rng)
+        result = evaluator.evaluate(df_dp)
+        tvd = curve.loc[curve.metric == "tvd", "mean"].iloc[0]
+        assert np.isclose(tvd, result["divergence"]["age"]["tvd"])
+
+    def test_sweep_matches_mechanisms(self):
+        evaluator = metrics.UtilityEvaluator(self.data, ["age"])
+        for mechanism, function in [
+            ("exponential", categorical.dp_exponential),
+            ("randomized_response_kary", categorical.dp_randomized_response_kary),
+        ]:
+            curve = pipeline.sweep(
+                self.data, "education", mechanism, [2], 1, features=["age"], rng=0
+            )
+            df_dp = function(self.data, "education", 2, rng=np.random.default_rng(0))
+            result = evaluator.evaluate(df_dp, columns=["education"])
+            tvd = curve.loc[curve.metric == "tvd", "mean"].iloc[0]
+            assert np.isclose(tvd, result["divergence"]["education"]["tvd"])
+
+    def test_error_sweep(self):
+        with self.assertRaises(ValueError):
+            pipeline.sweep(self.data, "age", "laplace", [0, 1])
+        with self.assertRaises(ValueError):
+            pipeline.sweep(self.data, "age", "laplace", [1], repetitions=0)
+        with self.assertRaises(ValueError):
+            pipeline.sweep(self.data, "age", "laplace", [1], delta=0.1)
+        with self.assertRaises(ValueError):
+            pipeline.sweep(self.data, "workclass", "randomized_response_binary", [1])
+
+
+class TestRandom(unittest.TestCase):
+    data = TestInvalidValues.data
+
+    def test_error_bit_generator(self):
+        with self.assertRaises(ValueError):
+            trasgodp.make_rng(0, "RANDU")
+
+    def test_bit_generators_reproducible(self):
+        for bit_generator in trasgodp.BIT_GENERATORS:
+            data_dp_1 = numerical.dp_clip_laplace(
+                self.data, "age", 1, rng=trasgodp.make_rng(0, bit_generator)
+            )
+            data_dp_2 = numerical.dp_clip_laplace(
+                self.data, "age", 1, rng=trasgodp.make_rng(0, bit_generator)
+            )
+            pd.testing.assert_frame_equal(data_dp_1, data_dp_2)
+
+    def test_seed_mechanisms(self):
+        mechanisms = [
+            (numerical.dp_clip_laplace, "age"),
+            (numerical.dp_clip_gaussian, "age"),
+            (categorical.dp_exponential, "education"),
+            (categorical.dp_randomized_response_binary, "sex"),
+            (categorical.dp_randomized_response_kary, "workclass"),
+        ]
+        for mechanism, column in mechanisms:
+            data_dp_1 = mechanism(self.data, column, 1, rng=3)
+            data_dp_2 = mechanism(self.data, column, 1, rng=3)
+            pd.testing.assert_frame_equal(data_dp_1, data_dp_2)
+
+    def test_global_seed(self):
+        np.random.seed(5)
+        data_dp_1 = categorical.dp_exponential_array(self.data["education"].values, 1)
+        np.random.seed(5)
+        data_dp_2 = categorical.dp_exponential_array(self.data["education"].values, 1)
+        assert np.array_equal(data_dp_1, data_dp_2)
+
+    def test_laplace_noise_out(self):
+        rng = trasgodp.make_rng(0)
+        out = np.empty(200_000)
+        noise = trasgodp._random.laplace_noise(rng, 2.0, out=out)
+        assert noise is out
+        assert abs(np.mean(noise)) < 0.05
+        assert abs(np.var(noise) - 2 * 2.0**2) < 0.2
+
+    def test_laplace_noise_buffer(self):
+        rng = trasgodp.make_rng(0)
+        out, buffer = np.empty(200_000), np.empty(200_000)
+        trasgodp._random.laplace_noise(rng, 2.0, out=out, buffer=buffer)
+        tracemalloc.start()
+        trasgodp._random.laplace_noise(rng, 2.0, out=out, buffer=buffer)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        assert peak < out.nbytes / 10
+        assert np.all(np.isfinite(out))
+        assert abs(np.var(out) - 2 * 2.0**2) < 0.2
+
+    def test_gaussian_noise_out(self):
+        rng = trasgodp.make_rng(0)
+        out = np.empty(200_000)
+        noise = trasgodp._random.gaussian_noise(rng, 3.0, out=out)
+        assert noise is out
+        assert abs(np.std(noise) - 3.0) < 0.05
+
+
+class TestUtilityEvaluator(unittest.TestCase):
+    data = TestInvalidValues.data
+    features = ["workclass", "sex", "education", "age"]
+    data_dp = categorical.dp_randomized_response_kary(
+        data, "workclass", 1, new_column=True, rng=0
+    )
+    data_dp = numerical.dp_clip_laplace(data_dp, "age", 1, new_column=True, rng=1)
+
+    def test_evaluator_matches_metrics(self):
+        evaluator = metrics.UtilityEvaluator(self.data, self.features)
+        result = evaluator.evaluate(self.data_dp, new_column=True)
+        loss = metrics.correlation_loss(
+            self.data, self.data_dp, self.features, new_column=True
+        )
+        assert np.isclose(result["correlation_loss"], loss)
+        for column in ["workclass", "age"]:
+            divergence = metrics.divergence_distributions(
+                self.data, self.data_dp, column, new_column=True
+            )
+            for key, value in divergence.items():
+                assert np.isclose(result["divergence"][column][key], value)
+
+    def test_evaluator_reused(self):
+        evaluator = metrics.UtilityEvaluator(self.data, self.features, "spearman")
+        first = evaluator.evaluate(self.data_dp, new_column=True)
+        second = evaluator.evaluate(self.data_dp, new_column=True)
+        assert first == second
+        assert first["divergence"]["sex"]["tvd"] == 0
+
+    def test_evaluator_no_copy(self):
+        df = self.data_dp.copy()
+        metrics.UtilityEvaluator(self.data, self.features).evaluate(df)
+        pd.testing.assert_frame_equal(df, self.data_dp)
+
+    def test_error_method_evaluator(self):
+        with self.assertRaises(ValueError):
+            metrics.UtilityEvaluator(self.data, self.features, method="corr")
+
+    def test_error_column_evaluator(self):
+        evaluator = metrics.UtilityEvaluator(self.data, self.features)
+        with self.assertRaises(ValueError):
+            evaluator.evaluate(self.data_dp.drop("sex", axis=1))
+
+
+class TestDatasetProfile(unittest.TestCase):
+    data = TestUtilityEvaluator.data
+    data_dp = TestUtilityEvaluator.data_dp
+    features = TestUtilityEvaluator.features
+
+    def test_profile_matches_dataframe(self):
+        profile = metrics.DatasetProfile(self.data)
+        for method in ["pearson", "spearman"]:
+            assert metrics.correlation_loss(
+                profile, self.data_dp, self.features, method, new_column=True
+            ) == metrics.correlation_loss(
+                self.data, self.data_dp, self.features, method, new_column=True
+            )
+        for column in ["workclass", "age"]:
+            assert metrics.divergence_distributions(
+                profile, self.data_dp, column, new_column=True
+            ) == metrics.divergence_distributions(
+                self.data, self.data_dp, column, new_column=True
+            )
+        evaluator = metrics.UtilityEvaluator(profile, self.features)
+        assert evaluator.profile is profile
+        assert evaluator.evaluate(self.data_dp, new_column=True) == (
+            metrics.UtilityEvaluator(self.data, self.features)
+        ).evaluate(self.data_dp, new_column=True)
+
+    def test_profile_cache(self):
+        profile = metrics.DatasetProfile(self.data, maxsize=1)
+        freq = profile.frequencies("workclass")
+        assert profile.frequencies("workclass") is freq
+        profile.frequencies("sex")
+        assert profile.frequencies("workclass") is not freq
+        assert len(profile._cache) == 1
+
+    def test_error_maxsize_profile(self):
+        with self.assertRaises(ValueError):
+            metrics.DatasetProfile(self.data, maxsize=0)
+
+
+class TestExpectedDivergence(unittest.TestCase):
+    data = TestInvalidValues.data
+    profile = metrics.DatasetProfile(data)
+
+    def check_simulation(self, mechanism, function, column, epsilon):
+        prediction = metrics.expected_divergence(
+            self.data[column].value_counts(), mechanism, epsilon
+        )
+        simulation = [
+            metrics.divergence_distributions(
+                self.profile, function(self.data, column, epsilon, rng=seed), column
+            )
+            for seed in range(50)
+        ]
+        for key in ["tvd", "js", "kl"]:
+            values = np.array([result[key] for result in simulation])
+            assert np.isclose(prediction["expected"][key], values.mean(), rtol=0.02)
+            sd = np.sqrt(prediction["variance"][key])
+            assert 0.7 < sd / values.std() < 1.4
+
+    def test_expected_kary(self):
+        self.check_simulation(
+            "randomized_response_kary",
+            categorical.dp_randomized_response_kary,
+            "workclass",
+            1,
+        )
+
+    def test_expected_exponential(self):
+        self.check_simulation("exponential", categorical.dp_exponential, "workclass", 4)
+
+    def test_expected_binary(self):
+        self.check_simulation(
+            "randomized_response_binary",
+            categorical.dp_randomized_response_binary,
+            "sex",
+            1,
+        )
+
+    def test_expected_no_noise(self):
+        result = metrics.expected_divergence([10, 0, 5], "exponential", 100)
+        for key in ["tvd", "js", "kl"]:
+            assert np.isclose(result["expected"][key], 0)
+            assert np.isclose(result["variance"][key], 0)
+
+    def test_error_expected(self):
+        with self.assertRaises(ValueError):
+            metrics.expected_divergence([10, 5, 1], "laplace", 1)
+        with self.assertRaises(ValueError):
+            metrics.expected_divergence([10, 5, 1], "exponential", 0)
+        with self.assertRaises(ValueError):
+            metrics.expected_divergence([10, 5], "randomized_response_kary", 1)
+        with self.assertRaises(ValueError):
+            metrics.expected_divergence([10, 5, 1], "randomized_response_binary", 1)
+        with self.assertRaises(ValueError):
+            metrics.expected_divergence([0, 0, 0], "exponential", 1)
+
+
+class TestFrequencyEstimator(unittest.TestCase):
+    data = TestInvalidValues.data
+    categories = np.sort(data["workclass"].unique())
+
+    def test_estimate_unbiased(self):
+        estimator = categorical.FrequencyEstimator(self.categories, 1)
+        for seed in range(20):
+            df_dp = categorical.dp_randomized_response_kary(
+                self.data, "workclass", 1, rng=seed
+            )
+            estimator.update(df_dp["workclass"])
+        true = self.data["workclass"].value_counts(normalize=True)
+        error = estimator.estimate(normalize=True) - true[self.categories]
+        assert estimator.n == 20 * len(self.data)
+        assert np.all(np.abs(error) < 4 * np.sqrt(estimator.variance(True)))
+
+    def test_estimate_binary(self):
+        estimator = categorical.FrequencyEstimator(
+            ["Female", "Male"], 2, "randomized_response_binary"
+        )
+        df_dp = categorical.dp_randomized_response_binary(self.data, "sex", 2, rng=0)
+        estimator.update_counts(df_dp["sex"].value_counts())
+        true = (self.data["sex"] == "Male").sum()
+        sd = np.sqrt(estimator.variance()["Male"])
+        assert abs(estimator.estimate()["Male"] - true) < 4 * sd
+
+    def test_merge_estimators(self):
+        df_dp = categorical.dp_randomized_response_kary(
+            self.data, "workclass", 1, rng=0
+        )
+        whole = categorical.FrequencyEstimator(self.categories, 1)
+        whole.update(df_dp["workclass"])
+        first = categorical.FrequencyEstimator(self.categories, 1)
+        first.update(df_dp["workclass"].values[:10000])
+        second = categorical.FrequencyEstimator(self.categories, 1)
+        second.update_counts(df_dp["workclass"].iloc[10000:].value_counts())
+        merged = first + second
+        np.testing.assert_array_equal(merged.counts, whole.counts)
+        pd.testing.assert_series_equal(merged.estimate(), whole.estimate())
+
+    def test_error_estimator(self):
+        with self.assertRaises(ValueError):
+            categorical.FrequencyEstimator(self.categories, 1, "laplace")
+        with self.assertRaises(ValueError):
+            categorical.FrequencyEstimator(["a", "b"], 1)
+        estimator = categorical.FrequencyEstimator(self.categories, 1)
+        with self.assertRaises(ValueError):
+            estimator.update(["unknown"])
+        with self.assertRaises(ValueError):
+            estimator.merge(categorical.FrequencyEstimator(self.categories, 2))
+
+
+class TestInstrumentation(unittest.TestCase):
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(
+        {
+            "workclass": rng.choice(["a", "b", "c"], 1000),
+            "age": rng.integers(18, 90, 1000),
+        }
+    )
+
+    def test_stages(self):
+        with trasgodp.instrument() as records:
+            categorical.dp_exponential(self.df, "workclass", 1)
+            numerical.dp_clip_laplace(self.df, "age", 1)
+        stages = {r["stage"]: r for r in records}
+        self.assertIn("dp_exponential.encode", stages)
+        self.assertIn("dp_exponential.sample", stages)
+        self.assertIn("dp_clip_laplace.dp_clip_laplace_array.clip_noise", stages)
+        self.assertEqual(stages["dp_exponential"]["rows"], 1000)
+        self.assertIsNone(stages["dp_exponential"]["peak_bytes"])
+        self.assertTrue(all(r["seconds"] >= 0 for r in records))
+
+    def test_memory(self):
+        with trasgodp.instrument(memory=True) as records:
+            numerical.dp_clip_gaussian(self.df, "age", 1, 1e-5)
+        self.assertTrue(all(r["peak_bytes"] >= 0 for r in records))
+        self.assertFalse(tracemalloc.is_tracing())
+
+    def test_callback_and_logs(self):
+        received = []
+        try:
+            trasgodp.enable_instrumentation(received.append)
+            with self.assertLogs("trasgodp", "DEBUG") as logs:
+                categorical.dp_randomized_response_kary(self.df, "workclass", 1)
+        finally:
+            trasgodp.disable_instrumentation()
+        self.assertEqual(len(received), len(logs.records))
+        self.assertEqual(logs.records[-1].trasgodp["stage"], received[-1]["stage"])
+
+    def test_disabled(self):
+        received = []
+        trasgodp.enable_instrumentation(received.append)
+        trasgodp.disable_instrumentation()
+        categorical.dp_exponential(self.df, "workclass", 1)
+        self.assertEqual(received, [])
+
+    def test_metrics(self):
+        df_dp = categorical.dp_exponential(self.df, "workclass", 1)
+        with trasgodp.instrument() as records:
+            metrics.divergence_distributions(self.df, df_dp, "workclass")
+        stages = [r["stage"] for r in records]
+        self.assertIn("divergence_distributions.divergence", stages)
+
+
+class TestBudgetAccountant(unittest.TestCase):
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(
+        {
+            "workclass": rng.choice(["a", "b", "c"], 1000),
+            "age": rng.integers(18, 90, 1000),
+        }
+    )
+
+    def test_context_manager(self):
+        accountant = trasgodp.BudgetAccountant()
+        with accountant:
+            df_dp = numerical.dp_clip_laplace(self.df, "age", 1)
+            df_dp = categorical.dp_exponential(df_dp, "workclass", 0.5)
+            numerical.dp_clip_gaussian(df_dp, "age", 1, delta=1e-5)
+        numerical.dp_clip_laplace(self.df, "age", 1)
+        self.assertEqual(accountant.spent(), (2.5, 1e-5))
+        self.assertEqual(accountant.spent("age"), (2.0, 1e-5))
+        self.assertEqual(len(accountant.ledger), 3)
+        self.assertEqual(accountant.ledger[1]["mechanism"], "exponential")
+
+    def test_argument(self):
+        accountant = trasgodp.BudgetAccountant(epsilon=1.5)
+        categorical.dp_randomized_response_kary(
+            self.df, "workclass", 1, accountant=accountant
+        )
+        with self.assertRaises(trasgodp.BudgetExceededError):
+            numerical.dp_clip_laplace(self.df, "age", 1, accountant=accountant)
+        self.assertEqual(accountant.spent(), (1.0, 0.0))
+        self.assertEqual(accountant.remaining(), (0.5, 1.0))
+
+    def test_advanced_composition(self):
+        accountant = trasgodp.BudgetAccountant(epsilon=3, delta=1e-5, slack=1e-6)
+        for _ in range(100):
+            accountant.spend(0.01, column="age")
+        epsilon, delta = accountant.spent()
+        expected = np.sqrt(2 * np.log(1e6) * 100 * 0.01**2) + 100 * 0.01 * np.expm1(
+            0.01
+        )
+        self.assertAlmostEqual(epsilon, expected)
+        self.assertLess(epsilon, 1.0)
+        self.assertEqual(delta, 1e-6)
+        self.assertEqual(accountant.spent_basic()[0], accountant.spent_basic("age")[0])
+        for _ in range(300):
+            accountant.spend(0.01, column="age")
+        self.assertLess(accountant.spent()[0], 3)
+
+    def test_plan_and_chunks(self):
+        plan = pipeline.PrivatizationPlan(
+            {
+                "age": {"mechanism": "laplace", "epsilon": 1},
+                "workclass": {"mechanism": "exponential", "epsilon": 2},
+            }
+        )
+        accountant = trasgodp.BudgetAccountant(epsilon=6)
+        plan.apply(self.df, accountant=accountant)
+        with accountant:
+            pipeline.parallel_apply(
+                plan, self.df, n_workers=2, seed=0, executor="thread"
+            )
+        self.assertEqual(accountant.spent(), (6.0, 0.0))
+        with self.assertRaises(trasgodp.BudgetExceededError):
+            plan.apply(self.df, accountant=accountant)
+        self.assertEqual(accountant.spent(), (6.0, 0.0))
+        with self.assertRaises(ValueError):
+            plan.add("age", "laplace", 1, accountant=accountant)
+
+    def test_refused_before_writing(self):
+        plan = pipeline.PrivatizationPlan(
+            {
+                "age": {"mechanism": "laplace", "epsilon": 5},
+                "workclass": {"mechanism": "exponential", "epsilon": 5},
+            }
+        )
+        df = self.df.copy()
+        accountant = trasgodp.BudgetAccountant(epsilon=1)
+        with self.assertRaises(trasgodp.BudgetExceededError):
+            plan.apply(df, inplace=True, accountant=accountant)
+        pd.testing.assert_frame_equal(df, self.df)
+        with self.assertRaises(trasgodp.BudgetExceededError):
+            pipeline.parallel_apply(
+                plan, df, n_workers=2, executor="thread", accountant=accountant
+            )
+        self.assertEqual(accountant.ledger, [])
+
+    def test_threads(self):
+        accountant = trasgodp.BudgetAccountant(epsilon=100)
+
+        def spend(_):
+            try:
+                accountant.spend(0.5)
+            except trasgodp.BudgetExceededError:
+                pass
+
+        with concurrent.futures.ThreadPoolExecutor(4) as pool:
+            list(pool.map(spend, range(400)))
+        self.assertEqual(len(accountant.ledger), 200)
+        self.assertEqual(accountant.spent(), (100.0, 0.0))
+
+    def test_threads_with_block(self):
+        accountant = trasgodp.BudgetAccountant()
+        entered = [threading.Event(), threading.Event()]
+        exited = threading.Event()
+
+        def work(i):
+            # The first thread to enter leaves the block while the second is in it.
+            if i == 1:
+                entered[0].wait(5)
+            with accountant:
+                entered[i].set()
+                if i == 0:
+                    entered[1].wait(5)
+                else:
+                    exited.wait(5)
+                categorical.dp_exponential(self.df, "workclass", 1)
+            if i == 0:
+                exited.set()
+
+        with concurrent.futures.ThreadPoolExecutor(2) as pool:
+            list(pool.map(work, range(2)))
+        self.assertEqual(accountant.spent(), (2.0, 0.0))
+
+
+class TestNumericMechanism(unittest.TestCase):
+    data = np.random.default_rng(0).integers(18, 90, 10_000)
+
+    def test_same_as_array(self):
+        mechanism = numerical.NumericMechanism("laplace", 1, 17, 90, rng=3)
+        expected = numerical.dp_clip_laplace_array(self.data, 1, 17, 90, rng=3)
+        np.testing.assert_array_equal(mechanism(self.data), expected)
+        mechanism = numerical.NumericMechanism.from_data(
+            self.data, "gaussian", 1, delta=1e-5, rng=3
+        )
+        expected = numerical.dp_clip_gaussian_array(self.data, 1, 1e-5, rng=3)
+        np.testing.assert_array_equal(mechanism(self.data), expected)
+
+    def test_batches(self):
+        mechanism = numerical.NumericMechanism("gaussian", 1, 0, 100, rng=0)
+        first = mechanism(self.data[:100])
+        second = mechanism(self.data[:100])
+        self.assertFalse(np.array_equal(first, second))
+        self.assertEqual(first.dtype, self.data.dtype)
+        self.assertTrue(np.all((first >= 0) & (first <= 100)))
+
+    def test_dtype(self):
+        mechanism = numerical.NumericMechanism("laplace", 1, 0, 100, dtype=np.int32)
+        result = mechanism(self.data.astype(float))
+        self.assertEqual(result.dtype, np.int32)
+        mechanism = numerical.NumericMechanism("laplace", 1, 0, 100, dtype="float32")
+        self.assertEqual(mechanism(self.data).dtype, np.float32)
+
+    def test_pickle_and_spawn(self):
+        mechanism = numerical.NumericMechanism("laplace", [1, 2], [0, 0], [10, 20])
+        copy = pickle.loads(pickle.dumps(mechanism))
+        np.testing.assert_array_equal(copy.scale, [10, 10])
+        data = np.zeros((100, 2))
+        np.testing.assert_array_equal(copy(data), mechanism(data))
+        first, second = mechanism.spawn(2)
+        self.assertFalse(np.array_equal(first(data), second(data)))
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            numerical.NumericMechanism("laplace", 0, 0, 1)
+        with self.assertRaises(ValueError):
+            numerical.NumericMechanism("laplace", 1, 2, 1)
+        with self.assertRaises(ValueError):
+            numerical.NumericMechanism("gaussian", 1, 0, 1, delta=1)
+        with self.assertRaises(ValueError):
+            numerical.NumericMechanism("uniform", 1, 0, 1)
+
+
+class TestAnalyticGaussian(unittest.TestCase):
+    def test_sigma(self):
+        from trasgodp._parameters import gaussian_sigma
+
+        # Value reported by Balle and Wang (2018) for epsilon 1 and delta 1e-5.
+        self.assertAlmostEqual(
+            gaussian_sigma(1, 1, 1e-5, "analytic"), 3.7306, places=3
+        )
+        for epsilon in [0.1, 0.5, 0.9]:
+            self.assertLess(
+                gaussian_sigma(1, epsilon, 1e-5, "analytic"),
+                gaussian_sigma(1, epsilon, 1e-5),
+            )
+        np.testing.assert_allclose(
+            gaussian_sigma(np.array([1.0, 2.0]), 1, 1e-5, "analytic"),
+            [3.7306, 7.4613],
+            rtol=1e-4,
+        )
+        self.assertAlmostEqual(
+            gaussian_sigma(2, 1000, 1e-5, "analytic"),
+            2 * gaussian_sigma(1, 1000, 1e-5, "analytic"),
+        )
+
+    def test_privacy_profile(self):
+        from scipy import stats
+        from trasgodp._parameters import gaussian_sigma
+
+        for epsilon, delta in [(0.5, 1e-3), (3, 1e-6), (20, 1e-9)]:
+            sigma = gaussian_sigma(1, epsilon, delta, "analytic")
+            a, b = 1 / (2 * sigma), epsilon * sigma
+            profile = stats.norm.cdf(a - b) - np.exp(epsilon) * stats.norm.cdf(-a - b)
+            self.assertAlmostEqual(profile, delta, delta=delta * 1e-6)
+
+    def test_mechanisms(self):
+        data = np.random.default_rng(0).integers(18, 90, 1000)
+        df = pd.DataFrame({"age": data})
+        df_dp = numerical.dp_clip_gaussian(
+            df, "age", 2, 1e-5, 17, 90, rng=0, calibration="analytic"
+        )
+        mechanism = numerical.NumericMechanism(
+            "gaussian", 2, 17, 90, 1e-5, rng=0, calibration="analytic"
+        )
+        np.testing.assert_array_equal(df_dp["age"], mechanism(data))
+        with self.assertRaises(ValueError):
+            numerical.dp_clip_gaussian_array(data, 1, calibration="exact")
+        result = pipeline.sweep(
+            df, "age", "gaussian", [1, 2], repetitions=2, calibration="analytic"
+        )
+        self.assertEqual(len(result), 8)
+
+
+class TestPrivatizationService(unittest.TestCase):
+    plan = pipeline.PrivatizationPlan(
+        {
+            "age": {
+                "mechanism": "laplace",
+                "epsilon": 1,
+                "lower_bound": 17,
+                "upper_bound": 90,
+            },
+            "workclass": {
+                "mechanism": "randomized_response_kary",
+                "epsilon": 1,
+                "categories": ["a", "b", "c"],
+            },
+        }
+    )
+
+    def test_batching(self):
+        async def client():
+            async with pipeline.PrivatizationService(
+                self.plan, max_delay=0.01, rng=0
+            ) as service:
+                results = await asyncio.gather(
+                    *(service.privatize("age", [20 + i, 30, 40]) for i in range(50)),
+                    *(service.privatize("workclass", ["a", "b"]) for _ in range(20)),
+                )
+            return results, service.metrics()
+
+        results, metrics = asyncio.run(client())
+        self.assertEqual([len(r) for r in results], [3] * 50 + [2] * 20)
+        ages = np.concatenate(results[:50])
+        self.assertTrue(np.all((ages >= 17) & (ages <= 90)))
+        self.assertTrue(np.issubdtype(ages.dtype, np.integer))
+        self.assertTrue(set(np.concatenate(results[50:])) <= {"a", "b", "c"})
+        self.assertEqual(metrics["requests"], 70)
+        self.assertEqual(metrics["rows"], 190)
+        self.assertEqual(metrics["batches"], 2)
+        self.assertGreaterEqual(metrics["latency_p99"], metrics["latency_p50"])
+
+    def test_max_rows_and_frame(self):
+        df = pd.DataFrame({"age": [20, 30, 40, 50], "workclass": ["a", "b", "c", "a"]})
+
+        async def client():
+            service = pipeline.PrivatizationService(self.plan, max_delay=10, max_rows=4)
+            first, second = await asyncio.gather(
+                service.privatize("age", [1, 2]), service.privatize("age", [3, 4])
+            )
+            df_dp = await service.privatize_frame(df)
+            return service.metrics(), df_dp
+
+        metrics, df_dp = asyncio.run(client())
+        self.assertEqual(metrics["batches"], 3)
+        self.assertEqual(list(df_dp.columns), ["age", "workclass"])
+        self.assertEqual(df["age"].tolist(), [20, 30, 40, 50])
+
+    def test_errors(self):
+        plan = pipeline.PrivatizationPlan({"age": {"mechanism": "laplace", "epsilon": 1}})
+        with self.assertRaises(ValueError):
+            pipeline.PrivatizationService(plan)
+
+        async def client():
+            service = pipeline.PrivatizationService(self.plan)
+            with self.assertRaises(ValueError):
+                await service.privatize("education", [1])
+            with self.assertRaises(ValueError):
+                await service.privatize("workclass", ["a", "z"])
+
+        asyncio.run(client())
+
+    def test_requests_isolated(self):
+        async def client():
+            service = pipeline.PrivatizationService(self.plan, max_delay=0.01, rng=0)
+            return await asyncio.gather(
+                service.privatize("workclass", ["a"]),
+                service.privatize("workclass", ["zzz"]),
+                service.privatize("age", [20, 30]),
+                service.privatize("age", [20.5, 30.5]),
+                return_exceptions=True,
+            ), service.metrics()
+
+        (valid, invalid, integers, floats), metrics = asyncio.run(client())
+        self.assertIn(valid[0], ["a", "b", "c"])
+        self.assertIsInstance(invalid, ValueError)
+        self.assertTrue(np.issubdtype(integers.dtype, np.integer))
+        self.assertEqual(floats.dtype, np.float64)
+        self.assertEqual(metrics["batches"], 2)
+        self.assertEqual(metrics["rows"], 5)
+
+    def test_budget(self):
+        accountant = trasgodp.BudgetAccountant()
+        pipeline.PrivatizationService(self.plan, accountant=accountant)
+        self.assertEqual(accountant.spent(), (2.0, 0.0))
+
+
+class TestCommandLine(unittest.TestCase):
+    spec = "./examples/adult_plan.json"
+    data = "./examples/adult.csv"
+
+    def run_cli(self, *args):
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            self.assertEqual(cli.main([*args, "--json"]), 0)
+        return json.loads(output.getvalue())
+
+    def test_csv(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            first = os.path.join(tmp, "first.csv")
+            second = os.path.join(tmp, "second.csv")
+            report = self.run_cli(
+                self.spec, self.data, first, "--seed", "1", "--chunksize", "10000"
+            )
+            self.run_cli(
+                self.spec,
+                self.data,
+                second,
+                "--seed",
+                "1",
+                "--chunksize",
+                "10000",
+                "--workers",
+                "2",
+            )
+            df_first = pd.read_csv(first)
+            pd.testing.assert_frame_equal(df_first, pd.read_csv(second))
+
+        self.assertEqual(report["rows"], 32561)
+        self.assertEqual(len(df_first), 32561)
+        self.assertTrue(df_first["age"].between(17, 90).all())
+        self.assertEqual(report["budget"]["epsilon"], 5)
+        self.assertEqual(report["budget"]["columns"]["workclass"]["epsilon"], 2)
+        self.assertEqual(report["budget"]["columns"]["hours-per-week"]["delta"], 1e-5)
+
+    def test_budget_exceeded(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            spec = os.path.join(tmp, "spec.json")
+            output = os.path.join(tmp, "output.csv")
+            with open(self.spec) as f:
+                content = json.load(f)
+            content["budget"] = {"epsilon": 2}
+            with open(spec, "w") as f:
+                json.dump(content, f)
+            with contextlib.redirect_stderr(io.StringIO()) as errors:
+                with self.assertRaises(SystemExit) as e:
+                    cli.main([spec, self.data, output])
+            self.assertEqual(e.exception.code, 1)
+            self.assertIn("budget", errors.getvalue())
+            self.assertFalse(os.path.exists(output))
+
+    def test_invalid_spec(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            spec = os.path.join(tmp, "spec.json")
+            with open(spec, "w") as f:
+                json.dump({"age": {"mechanism": "laplace", "epsilon": 1}}, f)
+            with self.assertRaises(ValueError):
+                cli.load_spec(spec)
+
+    def test_malformed_spec(self):
+        age = {"mechanism": "laplace", "epsilon": 1}
+        for content, message in [
+            ({"columns": {"age": {**age, "bounds": 5}}}, "age"),
+            ({"columns": {"age": {**age, "bounds": [1, 2, 3]}}}, "age"),
+            ({"columns": {"age": {**age, "domain": "a"}}}, "age"),
+            ({"columns": {"age": {"epsilon": 1}}}, "mechanism"),
+            ({"columns": {"age": [age]}}, "age"),
+            ({"columns": {"age": age}, "budget": {"epsilons": 1}}, "epsilons"),
+            ({"columns": {"age": age}, "budget": 5}, "budget"),
+            ({"columns": {"age": age}, "read_csv": []}, "read_csv"),
+        ]:
+            with tempfile.TemporaryDirectory() as tmp:
+                spec = os.path.join(tmp, "spec.json")
+                with open(spec, "w") as f:
+                    json.dump(content, f)
+                with self.assertRaisesRegex(ValueError, message):
+                    cli.load_spec(spec)
+
+    def test_error_column_named(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            spec = os.path.join(tmp, "spec.json")
+            output = os.path.join(tmp, "output.csv")
+            with open(spec, "w") as f:
+                age = {"mechanism": "laplace", "epsilon": -1}
+                json.dump({"columns": {"age": age}}, f)
+            with contextlib.redirect_stderr(io.StringIO()) as errors:
+                with self.assertRaises(SystemExit):
+                    cli.main([spec, self.data, output])
+            self.assertIn("age", errors.getvalue())
+
+    @unittest.skipUnless(importlib.util.find_spec("yaml"), "pyyaml not installed")
+    def test_yaml(self):
+        import yaml
+
+        with tempfile.TemporaryDirectory() as tmp:
+            spec = os.path.join(tmp, "spec.yaml")
+            with open(self.spec) as f, open(spec, "w") as g:
+                yaml.safe_dump(json.load(f), g)
+            self.assertEqual(cli.load_spec(spec), cli.load_spec(self.spec))
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -16,4 +16,18 @@
 
 """Local differential privacy applied to the columns of a dataset."""
 
+from ._accountant import BudgetAccountant, BudgetExceededError
+from ._instrument import disable_instrumentation, enable_instrumentation, instrument
+from ._random import BIT_GENERATORS, make_rng
+
 __version__ = "0.2.0"
+
+__all__ = [
+    "BIT_GENERATORS",
+    "BudgetAccountant",
+    "BudgetExceededError",
+    "disable_instrumentation",
+    "enable_instrumentation",
+    "instrument",
+    "make_rng",
+]
@@ -0,0 +1,339 @@
+# Copyright 2026 Spanish National Research Council (CSIC)
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Accounting of the privacy budget spent by the mechanisms."""
+
+import contextlib
+import contextvars
+import math
+import threading
+import typing
+
+# Accountant used by the mechanisms called without one in the current context.
+_current = contextvars.ContextVar("trasgodp_accountant", default=None)
+
+# Tokens of the with blocks entered in the current context, so that an accountant
+# can be activated at the same time by several threads or tasks.
+_tokens = contextvars.ContextVar("trasgodp_accountant_tokens", default=())
+
+
+class BudgetExceededError(ValueError):
+    """Error raised when a mechanism would exceed the privacy budget."""
+
+
+class BudgetAccountant:
+    """Ledger of the privacy budget spent on the columns of a dataset.
+
+    Every mechanism applied to a dataframe reports its epsilon (and delta) to the
+    accountant passed in its argument ``accountant`` or, if None, to the one
+    active in a with block. The budget spent is composed over the whole dataset
+    and over each column, with the basic composition (the sum of the budgets)
+    and, if a slack is given, the advanced composition, which is tighter for
+    many mechanisms with small epsilons::
+
+        epsilon = sqrt(2 ln(1 / slack) sum(epsilon_i ** 2))
+            + sum(epsilon_i (exp(epsilon_i) - 1))
+        delta = sum(delta_i) + slack
+
+    A call is refused, raising BudgetExceededError, if the budget would be
+    exceeded with both compositions.
+
+    Example::
+
+        accountant = BudgetAccountant(epsilon=5)
+        with accountant:
+            df_dp = dp_clip_laplace(df, "age", 1)
+            df_dp = dp_exponential(df_dp, "workclass", 2)
+        accountant.spent()  # (3.0, 0.0)
+    """
+
+    def __init__(
+        self,
+        epsilon: float = math.inf,
+        delta: float = 1.0,
+        slack: float = 0.0,
+    ):
+        """Create an accountant with no budget spent.
+
+        :param epsilon: total privacy budget of the dataset. If infinite, the
+            budget spent is only tracked.
+        :type epsilon: float
+
+        :param delta: total probability of exceeding the privacy budget.
+        :type delta: float
+
+        :param slack: probability added to delta by the advanced composition. If
+            0, only the basic composition is used.
+        :type slack: float
+        """
+        if epsilon <= 0:
+            raise ValueError("The privacy budget must be greater than 0.")
+        if delta < 0 or delta > 1:
+            raise ValueError("The value of delta must be between 0 and 1.")
+        if slack < 0 or slack >= 1:
+            raise ValueError("The value of the slack must be between 0 and 1.")
+        self.epsilon = epsilon
+        self.delta = delta
+        self.slack = slack
+        self.ledger = []
+        # Running sums of the dataset and of each column, so that composing the
+        # budget spent does not depend on the length of the ledger.
+        self._total = _Sums()
+        self._columns = {}
+        self._lock = threading.Lock()
+
+    def spend(
+        self,
+        epsilon: float,
+        delta: float = 0.0,
+        column: typing.Optional[str] = None,
+        mechanism: typing.Optional[str] = None,
+    ):
+        """Record the budget spent by a mechanism, unless it exceeds the budget.
+
+        :param epsilon: privacy budget spent.
+        :type epsilon: float
+
+        :param delta: probability of exceeding the privacy budget spent.
+        :type delta: float
+
+        :param column: column to which the mechanism was applied.
+        :type column: string
+
+        :param mechanism: name of the mechanism.
+        :type mechanism: string
+        """
+        self.spend_all(
+            [
+                {
+                    "mechanism": mechanism,
+                    "column": column,
+                    "epsilon": epsilon,
+                    "delta": delta,
+                }
+            ]
+        )
+
+    def spend_all(self, entries: typing.List[dict]):
+        """Record the budget spent by several mechanisms, all of them or none.
+
+        :param entries: dictionaries with the keys of :meth:`spend` ('epsilon',
+            'delta', 'column' and 'mechanism').
+        :type entries: list
+
+        :raises BudgetExceededError: if the budget would be exceeded.
+        """
+        entries = [
+            {
+                "mechanism": entry.get("mechanism"),
+                "column": entry.get("column"),
+                "epsilon": float(entry["epsilon"]),
+                "delta": float(entry.get("delta", 0.0)),
+            }
+            for entry in entries
+        ]
+        with self._lock:
+            total = self._total.copy()
+            for entry in entries:
+                total.add(entry["epsilon"], entry["delta"])
+            if not total.fits(self.slack, self.epsilon, self.delta):
+                epsilon, delta = total.compose(self.slack)
+                raise BudgetExceededError(
+                    f"The privacy budget (epsilon={self.epsilon}, delta={self.delta}) "
+                    f"would be exceeded: epsilon={epsilon}, delta={delta}."
+                )
+            self._total = total
+            for entry in entries:
+                if entry["column"] is not None:
+                    column = self._columns.setdefault(entry["column"], _Sums())
+                    column.add(entry["epsilon"], entry["delta"])
+                self.ledger.append(entry)
+
+    def spent(self, column: typing.Optional[str] = None) -> typing.Tuple[float, float]:
+        """Get the budget spent, with the tightest composition.
+
+        :param column: column whose budget is returned. If None, the dataset.
+        :type column: string
+
+        :return: epsilon and delta spent.
+        :rtype: tuple
+        """
+        sums = self._sums(column)
+        return sums.compose(self.slack)
+
+    def spent_basic(
+        self, column: typing.Optional[str] = None
+    ) -> typing.Tuple[float, float]:
+        """Get the budget spent with the basic composition.
+
+        :param column: column whose budget is returned. If None, the dataset.
+        :type column: string
+
+        :return: epsilon and delta spent.
+        :rtype: tuple
+        """
+        sums = self._sums(column)
+        return sums.epsilon, sums.delta
+
+    def spent_advanced(
+        self, column: typing.Optional[str] = None
+    ) -> typing.Tuple[float, float]:
+        """Get the budget spent with the advanced composition.
+
+        :param column: column whose budget is returned. If None, the dataset.
+        :type column: string
+
+        :return: epsilon and delta spent.
+        :rtype: tuple
+        """
+        if self.slack <= 0:
+            raise ValueError("The advanced composition requires a slack.")
+        sums = self._sums(column)
+        return sums.advanced(self.slack)
+
+    def remaining(self) -> typing.Tuple[float, float]:
+        """Get the budget of the dataset not spent yet.
+
+        With the advanced composition, the epsilon that can still be spent by a
+        single mechanism can be larger than the difference returned.
+
+        :return: epsilon and delta not spent.
+        :rtype: tuple
+        """
+        epsilon, delta = self.spent()
+        return max(self.epsilon - epsilon, 0.0), max(self.delta - delta, 0.0)
+
+    @property
+    def columns(self) -> typing.List[str]:
+        """Columns to which some mechanism has been applied."""
+        with self._lock:
+            return list(self._columns)
+
+    def _sums(self, column):
+        """Copy the running sums of a column, or of the dataset if None."""
+        with self._lock:
+            if column is None:
+                return self._total.copy()
+            return self._columns.get(column, _Sums()).copy()
+
+    def __enter__(self) -> "BudgetAccountant":
+        """Make the accountant the default one of the current context."""
+        _tokens.set(_tokens.get() + (_current.set(self),))
+        return self
+
+    def __exit__(self, *exc_info):
+        """Restore the previous default accountant."""
+        tokens = _tokens.get()
+        _tokens.set(tokens[:-1])
+        _current.reset(tokens[-1])
+        return False
+
+
+def get_accountant(
+    accountant: typing.Optional[BudgetAccountant] = None,
+) -> typing.Optional[BudgetAccountant]:
+    """Get the accountant given or, if None, the default one of the context.
+
+    :param accountant: accountant passed to a mechanism.
+    :type accountant: BudgetAccountant
+
+    :return: accountant to which the budget is reported, or None.
+    :rtype: BudgetAccountant
+    """
+    if accountant is None:
+        return _current.get()
+    return accountant
+
+
+def spend(accountant, epsilon, delta=0.0, column=None, mechanism=None):
+    """Report the budget spent by a mechanism, if there is an accountant.
+
+    :param accountant: accountant passed to the mechanism, or None.
+    :type accountant: BudgetAccountant
+
+    :param epsilon: privacy budget spent.
+    :type epsilon: float
+
+    :param delta: probability of exceeding the privacy budget spent.
+    :type delta: float
+
+    :param column: column to which the mechanism was applied.
+    :type column: string
+
+    :param mechanism: name of the mechanism.
+    :type mechanism: string
+    """
+    accountant = get_accountant(accountant)
+    if accountant is not None:
+        accountant.spend(epsilon, delta, column, mechanism)
+
+
+@contextlib.contextmanager
+def suspended():
+    """Stop reporting the budget in a with block (e.g. for disjoint chunks)."""
+    token = _current.set(None)
+    try:
+        yield
+    finally:
+        _current.reset(token)
+
+
+class _Sums:
+    """Running sums needed by the basic and the advanced compositions."""
+
+    __slots__ = ("epsilon", "delta", "squares", "expected")
+
+    def __init__(self):
+        """Start with no budget spent."""
+        self.epsilon = 0.0
+        self.delta = 0.0
+        self.squares = 0.0
+        self.expected = 0.0
+
+    def copy(self):
+        """Copy the sums."""
+        sums = _Sums()
+        sums.epsilon, sums.delta = self.epsilon, self.delta
+        sums.squares, sums.expected = self.squares, self.expected
+        return sums
+
+    def add(self, epsilon, delta):
+        """Add the budget of a mechanism."""
+        self.epsilon += epsilon
+        self.delta += delta
+        self.squares += epsilon**2
+        # exp overflows for budgets with which the term is meaningless anyway.
+        self.expected += epsilon * math.expm1(min(epsilon, 700.0))
+
+    def advanced(self, slack):
+        """Compose the budget with the advanced composition."""
+        epsilon = math.sqrt(2 * math.log(1 / slack) * self.squares) + self.expected
+        return epsilon, self.delta + slack
+
+    def compose(self, slack):
+        """Compose the budget with the tightest composition."""
+        if slack > 0 and self.epsilon > 0:
+            epsilon, delta = self.advanced(slack)
+            if epsilon < self.epsilon:
+                return epsilon, delta
+        return self.epsilon, self.delta
+
+    def fits(self, slack, epsilon, delta):
+        """Check if the budget spent fits in a budget with some composition."""
+        if self.epsilon <= epsilon and self.delta <= delta:
+            return True
+        if slack > 0:
+            advanced_epsilon, advanced_delta = self.advanced(slack)
+            return advanced_epsilon <= epsilon and advanced_delta <= delta
+        return False
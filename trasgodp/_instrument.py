@@ -0,0 +1,239 @@
+# Copyright 2026 Spanish National Research Council (CSIC)
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Opt-in instrumentation of the stages of the mechanisms and metrics."""
+
+import contextlib
+import contextvars
+import functools
+import logging
+import threading
+import time
+import tracemalloc
+import typing
+
+logger = logging.getLogger("trasgodp")
+
+_lock = threading.Lock()
+_callbacks = []
+_enabled = False
+_memory = False
+_started_tracing = False
+
+# Stages being measured in the current thread or task, from the outermost.
+_stack = contextvars.ContextVar("trasgodp_stages", default=())
+
+_DISABLED = contextlib.nullcontext()
+
+
+def enable_instrumentation(
+    callback: typing.Optional[typing.Callable[[dict], None]] = None,
+    memory: bool = False,
+):
+    """Start recording the stages of the mechanisms and metrics.
+
+    Each stage produces a record, a dictionary with its name ('stage', e.g.
+    'dp_exponential.sample'), the wall time in seconds ('seconds'), the number of
+    rows processed ('rows', or None) and the peak of memory allocated during the
+    stage in bytes ('peak_bytes', None unless memory is traced). The records are
+    passed to the callbacks and logged with level DEBUG to the 'trasgodp' logger.
+
+    :param callback: function called with each record.
+    :type callback: callable
+
+    :param memory: boolean, default to False. If True, the allocations are
+        traced with tracemalloc, which slows down the stages.
+    :type memory: boolean
+    """
+    global _enabled, _memory, _started_tracing
+    with _lock:
+        if callback is not None:
+            _callbacks.append(callback)
+        if memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _started_tracing = True
+        _memory = _memory or memory
+        _enabled = True
+
+
+def disable_instrumentation():
+    """Stop recording the stages and remove every callback."""
+    global _enabled, _memory, _started_tracing
+    with _lock:
+        _callbacks.clear()
+        if _started_tracing:
+            tracemalloc.stop()
+            _started_tracing = False
+        _memory = False
+        _enabled = False
+
+
+@contextlib.contextmanager
+def instrument(
+    callback: typing.Optional[typing.Callable[[dict], None]] = None,
+    memory: bool = False,
+):
+    """Record the stages run inside a with block.
+
+    Example::
+
+        with instrument() as records:
+            dp_exponential(df, "workclass", 1)
+        pd.DataFrame(records).groupby("stage")["seconds"].sum()
+
+    :param callback: function also called with each record.
+    :type callback: callable
+
+    :param memory: boolean, default to False. If True, the allocations are
+        traced with tracemalloc.
+    :type memory: boolean
+
+    :return: list where the records are appended.
+    :rtype: list
+    """
+    global _enabled, _memory, _started_tracing
+    records = []
+    with _lock:
+        previous = (_enabled, _memory, _started_tracing)
+    enable_instrumentation(records.append, memory)
+    if callback is not None:
+        enable_instrumentation(callback)
+    try:
+        yield records
+    finally:
+        with _lock:
+            _callbacks.remove(records.append)
+            if callback is not None:
+                _callbacks.remove(callback)
+            if _started_tracing and not previous[2]:
+                tracemalloc.stop()
+            _enabled, _memory, _started_tracing = previous
+
+
+def stage(name: str, rows: typing.Optional[int] = None):
+    """Measure a stage of the current function, if the instrumentation is enabled.
+
+    :param name: name of the stage, prefixed by the names of the enclosing ones.
+    :type name: string
+
+    :param rows: number of rows processed.
+    :type rows: int
+
+    :return: context manager measuring the stage.
+    :rtype: context manager
+    """
+    if not _enabled:
+        return _DISABLED
+    return _Stage(name, rows)
+
+
+def instrumented(function=None, *, name=None):
+    """Measure a whole function as a stage containing the stages run inside it.
+
+    The number of rows is the length of the first argument that is an array or a
+    dataframe.
+
+    :param function: function to be measured.
+    :type function: callable
+
+    :param name: name of the stage. If None, the qualified name of the function.
+    :type name: string
+
+    :return: the function wrapped.
+    :rtype: callable
+    """
+    if function is None:
+        return functools.partial(instrumented, name=name)
+    stage_name = name or function.__qualname__
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        if not _enabled:
+            return function(*args, **kwargs)
+        data = next((a for a in args if _is_data(a)), None)
+        with _Stage(stage_name, None if data is None else len(data)):
+            return function(*args, **kwargs)
+
+    return wrapper
+
+
+class _Stage:
+    """Context manager measuring the time and allocations of a stage."""
+
+    def __init__(self, name, rows):
+        """Prepare the measure of a stage."""
+        self.name = name
+        self.rows = rows
+        self.child_peak = 0
+
+    def __enter__(self):
+        """Start measuring."""
+        stack = _stack.get()
+        self.token = _stack.set(stack + (self,))
+        self.memory = _memory and tracemalloc.is_tracing()
+        if self.memory:
+            # The peak reached so far belongs to the enclosing stage.
+            current, peak = tracemalloc.get_traced_memory()
+            if stack:
+                stack[-1].child_peak = max(stack[-1].child_peak, peak)
+            tracemalloc.reset_peak()
+            self.start_memory = current
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        """Stop measuring and emit the record."""
+        seconds = time.perf_counter() - self.start
+        peak_bytes = None
+        _stack.reset(self.token)
+        stack = _stack.get()
+        if self.memory and tracemalloc.is_tracing():
+            _, peak = tracemalloc.get_traced_memory()
+            peak = max(peak, self.child_peak)
+            peak_bytes = peak - self.start_memory
+            if stack:
+                stack[-1].child_peak = max(stack[-1].child_peak, peak)
+        name = ".".join([s.name for s in stack] + [self.name])
+        _emit(
+            {
+                "stage": name,
+                "seconds": seconds,
+                "rows": self.rows,
+                "peak_bytes": peak_bytes,
+            }
+        )
+        return False
+
+
+def _emit(record):
+    """Pass a record to the callbacks and to the logger."""
+    for callback in list(_callbacks):
+        callback(record)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(
+            "%s: %.6f s, %s rows, %s bytes",
+            record["stage"],
+            record["seconds"],
+            record["rows"],
+            record["peak_bytes"],
+            extra={"trasgodp": record},
+        )
+
+
+def _is_data(value):
+    """Check if an argument is an array, a dataframe or a list of values."""
+    # Checked by duck typing, so pandas is not imported until a mechanism is.
+    return isinstance(value, list) or (
+        hasattr(value, "shape") and hasattr(value, "__len__")
+    )
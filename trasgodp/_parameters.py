@@ -0,0 +1,161 @@
+# Copyright 2026 Spanish National Research Council (CSIC)
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Parameters of the DP mechanisms obtained from the privacy budget.
+
+They are shared by the mechanisms, the estimators that correct their bias and the
+privacy-utility sweeps.
+"""
+
+import numpy as np
+import functools
+
+CALIBRATIONS = ("classic", "analytic")
+
+
+def gaussian_sigma(sensitivity, epsilon, delta, calibration="classic"):
+    """
+    Get the standard deviation of the noise of the Gaussian mechanism.
+
+    :param sensitivity: sensitivity of the data (or one per column).
+    :type sensitivity: float or array
+
+    :param epsilon: privacy budget (or one per column).
+    :type epsilon: float or array
+
+    :param delta: probability of exceeding the privacy budget (or one per column).
+    :type delta: float or array
+
+    :param calibration: 'classic' or 'analytic'.
+    :type calibration: string
+
+    :return: standard deviation of the Gaussian noise.
+    :rtype: float or array.
+    """
+    if calibration == "classic":
+        return (sensitivity * np.sqrt(2 * np.log(1.25 / delta))) / epsilon
+    if calibration not in CALIBRATIONS:
+        raise ValueError(f"Calibration not allowed: {calibration}.")
+    # The standard deviation is proportional to the sensitivity, so only the one
+    # of sensitivity 1 is searched (and cached) for each budget.
+    unit = np.vectorize(_analytic_sigma, otypes=[float])(epsilon, delta)
+    return sensitivity * (unit if unit.ndim else float(unit))
+
+
+@functools.lru_cache(maxsize=1024)
+def _analytic_sigma(epsilon, delta):
+    """
+    Get the smallest standard deviation of the analytic Gaussian mechanism.
+
+    It is the root of the exact privacy profile of the Gaussian mechanism with
+    sensitivity 1 (Balle and Wang, 2018),
+    Phi(1 / (2 sigma) - epsilon sigma)
+    - exp(epsilon) Phi(-1 / (2 sigma) - epsilon sigma) = delta,
+    whose left side decreases with sigma.
+
+    :param epsilon: privacy budget.
+    :type epsilon: float
+
+    :param delta: probability of exceeding the privacy budget.
+    :type delta: float
+
+    :return: standard deviation of the Gaussian noise for sensitivity 1.
+    :rtype: float.
+    """
+    try:
+        from scipy import optimize, special
+    except ImportError as e:
+        raise ImportError("scipy is required for the analytic calibration.") from e
+
+    def excess(sigma):
+        a = 1 / (2 * sigma)
+        b = epsilon * sigma
+        # The second term is computed in logarithms to avoid overflows.
+        second = np.exp(epsilon + special.log_ndtr(-a - b))
+        return special.ndtr(a - b) - second - delta
+
+    low = high = np.sqrt(2 * np.log(1.25 / delta)) / epsilon
+    while excess(high) > 0:
+        high *= 2
+    while excess(low) <= 0:
+        low /= 2
+    return float(optimize.brentq(excess, low, high, xtol=1e-12, rtol=1e-12))
+
+
+def p_same(k, epsilon):
+    """
+    Get the probability of keeping the original category in the Exponential mechanism.
+
+    :param k: number of categories.
+    :type k: int
+
+    :param epsilon: privacy budget.
+    :type epsilon: float
+
+    :return: probability of sampling the original category.
+    :rtype: float.
+    """
+    sensitivity = 1
+    exp_score = np.exp(epsilon / 2 * sensitivity)
+    return exp_score / (exp_score + k - 1)
+
+
+def p_random(k, epsilon):
+    """
+    Get the probability of answering at random in the k-ary Randomized Response.
+
+    :param k: number of categories.
+    :type k: int
+
+    :param epsilon: privacy budget.
+    :type epsilon: float
+
+    :return: probability of replacing the value by one drawn uniformly.
+    :rtype: float.
+    """
+    return k / (np.exp(epsilon) + k - 1)
+
+
+def p_keep(epsilon):
+    """
+    Get the probability of keeping the value in the binary Randomized Response.
+
+    :param epsilon: privacy budget.
+    :type epsilon: float
+
+    :return: probability of reporting the true value.
+    :rtype: float.
+    """
+    return np.exp(epsilon) / (np.exp(epsilon) + 1)
+
+
+def binary_labels(categories, positive_label):
+    """
+    Get the positive and negative labels of a binary attribute.
+
+    :param categories: the two values of the attribute.
+    :type categories: numpy array
+
+    :param positive_label: value to be assigned as 1. If None, it is assigned to
+        first value.
+    :type positive_label: string
+
+    :return: positive and negative labels.
+    :rtype: tuple.
+    """
+    if positive_label is None:
+        return categories[0], categories[1]
+    if positive_label not in categories:
+        raise ValueError("Positive label is not a value in the column.")
+    return positive_label, categories[categories != positive_label][0]
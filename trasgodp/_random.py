@@ -0,0 +1,150 @@
+# Copyright 2026 Spanish National Research Council (CSIC)
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Random number generation for the mechanisms."""
+
+import numpy as np
+import typing
+
+BIT_GENERATORS = {
+    "PCG64": np.random.PCG64,
+    "PCG64DXSM": np.random.PCG64DXSM,
+    "Philox": np.random.Philox,
+    "SFC64": np.random.SFC64,
+    "MT19937": np.random.MT19937,
+}
+
+
+# Smallest positive value drawn by the uniform generator.
+_SMALLEST_UNIFORM = 2.0**-53
+
+
+def make_rng(
+    seed: typing.Optional[typing.Union[int, np.random.SeedSequence]] = None,
+    bit_generator: str = "PCG64",
+) -> np.random.Generator:
+    """Create a random number generator for the mechanisms.
+
+    :param seed: seed of the generator. If None, fresh entropy is used.
+    :type seed: int, numpy SeedSequence or None
+
+    :param bit_generator: bit generator, one of 'PCG64' (default of numpy),
+        'PCG64DXSM', 'Philox', 'SFC64' or 'MT19937'. SFC64 is usually the fastest,
+        and Philox allows to jump ahead or spawn independent streams.
+    :type bit_generator: string
+
+    :return: random number generator.
+    :rtype: numpy Generator.
+    """
+    if bit_generator not in BIT_GENERATORS:
+        raise ValueError(f"Bit generator not allowed: {bit_generator}.")
+    return np.random.Generator(BIT_GENERATORS[bit_generator](seed))
+
+
+def get_rng(
+    rng: typing.Optional[typing.Union[np.random.Generator, int]] = None,
+) -> np.random.Generator:
+    """Get the random number generator used by a mechanism.
+
+    :param rng: numpy Generator, which is returned as it is, or seed (int or numpy
+        SeedSequence) for creating one. If None, the generator is seeded from the
+        global numpy random state, so ``np.random.seed`` keeps the results
+        reproducible.
+    :type rng: numpy Generator, int, numpy SeedSequence or None
+
+    :return: random number generator.
+    :rtype: numpy Generator.
+    """
+    if isinstance(rng, np.random.Generator):
+        return rng
+    if rng is None:
+        rng = np.random.randint(0, 2**63 - 1, dtype=np.int64)
+    return np.random.default_rng(rng)
+
+
+def laplace_noise(
+    rng: np.random.Generator,
+    scale: float,
+    size: typing.Optional[int] = None,
+    out: typing.Optional[np.ndarray] = None,
+    buffer: typing.Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """Draw Laplace noise centered at 0.
+
+    The noise is obtained from uniform values with the inverse of the distribution
+    function, computed in place, so no array is allocated if out and buffer are
+    given (e.g. when the noise is drawn by blocks).
+
+    :param rng: random number generator.
+    :type rng: numpy Generator
+
+    :param scale: scale of the distribution.
+    :type scale: float
+
+    :param size: number of values. Not needed if out is given.
+    :type size: int
+
+    :param out: float64 buffer where the noise is written.
+    :type out: numpy array
+
+    :param buffer: float64 buffer, at least as long as the noise, reused for the
+        uniform values. If None, one is allocated.
+    :type buffer: numpy array
+
+    :return: array with the noise (out, if given).
+    :rtype: numpy array.
+    """
+    if out is None:
+        out = np.empty(size)
+    uniform = np.empty(len(out)) if buffer is None else buffer[: len(out)]
+    rng.random(out=uniform)
+    # A value of 0 would give an infinite noise.
+    np.maximum(uniform, _SMALLEST_UNIFORM, out=uniform)
+    uniform -= 0.5
+    np.abs(uniform, out=out)
+    out *= -2
+    np.log1p(out, out=out)
+    out *= -scale
+    np.copysign(out, uniform, out=out)
+    return out
+
+
+def gaussian_noise(
+    rng: np.random.Generator,
+    sigma: float,
+    size: typing.Optional[int] = None,
+    out: typing.Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """Draw Gaussian noise centered at 0.
+
+    :param rng: random number generator.
+    :type rng: numpy Generator
+
+    :param sigma: standard deviation of the distribution.
+    :type sigma: float
+
+    :param size: number of values. Not needed if out is given.
+    :type size: int
+
+    :param out: float64 buffer where the noise is written.
+    :type out: numpy array
+
+    :return: array with the noise (out, if given).
+    :rtype: numpy array.
+    """
+    if out is None:
+        out = np.empty(size)
+    rng.standard_normal(out=out)
+    out *= sigma
+    return out
@@ -0,0 +1,42 @@
+# Copyright 2026 Spanish National Research Council (CSIC)
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Helpers shared by the mechanisms of the different subpackages."""
+
+import pandas as pd
+import copy
+from ._instrument import instrumented
+
+
+@instrumented(name="copy")
+def output_frame(df: pd.DataFrame, inplace: bool = False) -> pd.DataFrame:
+    """Get the dataframe where a mechanism will store its output column.
+
+    :param df: dataframe with the data under study.
+    :type df: pandas dataframe
+
+    :param inplace: boolean, default to False. If True, the input dataframe is
+        returned and modified directly. If False, a copy is returned. When the
+        pandas copy-on-write mode is enabled the copy is shallow, so the columns
+        not rewritten by the mechanism share their memory with the input.
+    :type inplace: boolean
+
+    :return: dataframe to be modified by the mechanism.
+    :rtype: pandas dataframe.
+    """
+    if inplace:
+        return df
+    if pd.options.mode.copy_on_write is True:
+        return df.copy(deep=False)
+    return copy.deepcopy(df)
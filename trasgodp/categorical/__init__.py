@@ -14,15 +14,23 @@
 
 """DP Exponential mechanism for categorical columns."""
 
+from ._encoding import CategoryEncoder
+from ._estimation import FrequencyEstimator
 from ._exponential import dp_exponential, dp_exponential_array
 from ._randomized_response import (
     dp_randomized_response_binary,
+    dp_randomized_response_binary_array,
     dp_randomized_response_kary,
+    dp_randomized_response_kary_array,
 )
 
 __all__ = [
+    "CategoryEncoder",
+    "FrequencyEstimator",
     "dp_exponential",
     "dp_exponential_array",
     "dp_randomized_response_binary",
+    "dp_randomized_response_binary_array",
     "dp_randomized_response_kary",
+    "dp_randomized_response_kary_array",
 ]
@@ -0,0 +1,273 @@
+# Copyright 2026 Spanish National Research Council (CSIC)
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Integer encoding of categorical values."""
+
+import numpy as np
+import pandas as pd
+import typing
+from .._instrument import instrumented
+
+
+class CategoryEncoder:
+    """Fixed domain of a categorical column, with its hash table built once.
+
+    It can be passed as the categories of any categorical mechanism, so repeated
+    runs over the same schema neither scan the data to find the categories nor
+    rebuild the lookup table of the domain.
+
+    Example::
+
+        workclass = CategoryEncoder(["Private", "Self-emp", "State-gov"])
+        df_dp = dp_exponential(df, "workclass", epsilon, categories=workclass)
+    """
+
+    def __init__(self, categories: typing.Union[typing.List, np.ndarray, pd.Index]):
+        """Build the lookup table of the categories.
+
+        :param categories: possible values of the column.
+        :type categories: list, numpy array or pandas index
+        """
+        index = pd.Index(categories)
+        if not index.is_unique:
+            raise ValueError("The categories must not be repeated.")
+        self.index = shared_index(index)
+        self.categories = np.asarray(self.index)
+        self.is_range = _is_range(self.index)
+
+    @classmethod
+    def from_data(
+        cls, data: typing.Union[typing.List, np.ndarray, pd.Series]
+    ) -> "CategoryEncoder":
+        """Create an encoder with the sorted categories found in some data.
+
+        :param data: values under study.
+        :type data: list, numpy array or pandas series
+
+        :return: encoder of the categories of the data.
+        :rtype: CategoryEncoder
+        """
+        if isinstance(data, (pd.Series, pd.Categorical)) and isinstance(
+            data.dtype, pd.CategoricalDtype
+        ):
+            return cls(data.dtype.categories)
+        return cls(unique(data))
+
+    def __len__(self) -> int:
+        """Get the number of categories."""
+        return len(self.categories)
+
+    def __iter__(self) -> typing.Iterator:
+        """Iterate over the categories."""
+        return iter(self.categories)
+
+    def encode(
+        self, data: typing.Union[typing.List, np.ndarray, pd.Series, pd.Categorical]
+    ) -> np.ndarray:
+        """Encode values as integer codes (see :func:`encode`).
+
+        :param data: values to be encoded.
+        :type data: list, numpy array, pandas series or pandas Categorical
+
+        :return: the code of each value.
+        :rtype: numpy array.
+        """
+        return encode(data, self)[1]
+
+    def decode(
+        self, codes: np.ndarray, as_categorical: bool = False
+    ) -> typing.Union[np.ndarray, pd.Categorical]:
+        """Get the values of some integer codes (see :func:`decode`).
+
+        :param codes: position of each value in the list of categories.
+        :type codes: numpy array of integers
+
+        :param as_categorical: boolean, default to False. If True, a pandas
+            Categorical is returned.
+        :type  as_categorical: boolean
+
+        :return: values of the codes.
+        :rtype: numpy array or pandas Categorical.
+        """
+        return decode(codes, self.categories, as_categorical)
+
+
+@instrumented(name="encode")
+def encode(
+    data: typing.Union[typing.List, np.ndarray, pd.Series, pd.Categorical],
+    categories: typing.Optional[
+        typing.Union[typing.List, np.ndarray, CategoryEncoder]
+    ] = None,
+) -> typing.Tuple[np.ndarray, np.ndarray]:
+    """Encode categorical values as integer codes.
+
+    The encoding is hash based, so no sorting of the values is needed, and the
+    categories are returned sorted as with numpy unique. A pandas Categorical
+    is not hashed: its codes are used directly, with its categories as the
+    domain (and missing values as an extra category). Integer data with a range
+    of integers as categories is encoded with a subtraction. The codes use the
+    smallest integer type able to hold them.
+
+    :param data: values to be encoded.
+    :type data: list, numpy array, pandas series or pandas Categorical
+
+    :param categories: possible values of the data (or their encoder). If None,
+        they are obtained from the data.
+    :type categories: list, numpy array or CategoryEncoder
+
+    :return: categories and the code of each value in them.
+    :rtype: tuple of numpy arrays.
+    """
+    if isinstance(data, pd.Series):
+        data = data.array
+    if isinstance(data, pd.Categorical):
+        return _encode_categorical(data, categories)
+
+    data = np.asarray(data)
+    if categories is None:
+        codes, categories = pd.factorize(data, sort=True, use_na_sentinel=False)
+        return np.asarray(categories), compact(codes, len(categories))
+
+    encoder = _encoder(categories)
+    categories = encoder.index
+    if encoder.is_range and np.issubdtype(data.dtype, np.integer):
+        first, last = categories[0], categories[-1]
+        if len(data) and (data.min() < first or data.max() > last):
+            raise ValueError("Some values of the data are not in the categories.")
+        if first != 0:
+            data = data.astype(np.int64) - first
+        return np.asarray(categories), compact(data, len(categories))
+
+    codes = categories.get_indexer(data)
+    if np.any(codes < 0):
+        raise ValueError("Some values of the data are not in the categories.")
+    return np.asarray(categories), compact(codes, len(categories))
+
+
+@instrumented(name="decode")
+def decode(
+    codes: np.ndarray, categories: np.ndarray, as_categorical: bool = False
+) -> typing.Union[np.ndarray, pd.Categorical]:
+    """Get the values of some integer codes.
+
+    :param codes: position of each value in the list of categories.
+    :type codes: numpy array of integers
+
+    :param categories: list of categories.
+    :type categories: numpy array
+
+    :param as_categorical: boolean, default to False. If True, a pandas
+        Categorical is returned (the missing categories become missing values)
+        without materializing the values.
+    :type  as_categorical: boolean
+
+    :return: values of the codes.
+    :rtype: numpy array or pandas Categorical.
+    """
+    if not as_categorical:
+        return categories[codes]
+
+    missing = pd.isna(categories)
+    if missing.any():
+        positions = np.cumsum(~missing) - 1
+        positions[missing] = -1
+        codes = positions.astype(codes.dtype)[codes]
+        categories = categories[~missing]
+    return pd.Categorical.from_codes(codes, categories)
+
+
+def compact(codes: np.ndarray, k: int) -> np.ndarray:
+    """Store integer codes in the smallest signed type able to hold them.
+
+    :param codes: position of each value in the list of categories.
+    :type codes: numpy array of integers
+
+    :param k: number of categories.
+    :type k: int
+
+    :return: the codes as int8, int16, int32 or int64.
+    :rtype: numpy array.
+    """
+    for dtype in (np.int8, np.int16, np.int32):
+        if k < np.iinfo(dtype).max:
+            return codes.astype(dtype, copy=False)
+    return codes.astype(np.int64, copy=False)
+
+
+def _encode_categorical(data, categories):
+    """Encode a pandas Categorical with its own codes (see :func:`encode`)."""
+    own = np.asarray(data.categories)
+    codes = data.codes
+    missing = codes < 0
+    has_missing = missing.any()
+
+    if categories is None:
+        if not has_missing:
+            return own, compact(codes, len(own))
+        categories = np.append(own, np.array([np.nan], dtype=object))
+        codes = np.where(missing, len(own), codes)
+        return categories, compact(codes, len(categories))
+
+    categories = _encoder(categories).index
+
+    # The codes of the data are mapped to the categories given (the position -1,
+    # i.e. the last one, is the missing value).
+    mapping = categories.get_indexer(np.append(own, np.array([np.nan], dtype=object)))
+    codes = compact(mapping, len(categories))[codes]
+    if np.any(codes < 0):
+        raise ValueError("Some values of the data are not in the categories.")
+    return np.asarray(categories), codes
+
+
+def _encoder(categories):
+    """Get the encoder of some categories (a new one unless already given)."""
+    if isinstance(categories, CategoryEncoder):
+        return categories
+    return CategoryEncoder(categories)
+
+
+def _is_range(categories):
+    """Check if some categories are consecutive integers."""
+    if len(categories) == 0 or not pd.api.types.is_integer_dtype(categories):
+        return False
+    return bool(np.all(np.diff(np.asarray(categories)) == 1))
+
+
+def shared_index(values: typing.Union[typing.List, np.ndarray, pd.Index]) -> pd.Index:
+    """Get an index of some values that can be looked up from several threads.
+
+    The hash table of an index is built lazily on the first lookup, which is not
+    thread safe, so it is built here before the index is shared.
+
+    :param values: values of the index.
+    :type values: list, numpy array or pandas index
+
+    :return: index with its hash table built.
+    :rtype: pandas index.
+    """
+    index = pd.Index(values)
+    index.get_indexer(index[:1])
+    return index
+
+
+def unique(data: typing.Union[typing.List, np.ndarray, pd.Series]) -> np.ndarray:
+    """Get the sorted categories of some values without encoding them.
+
+    :param data: values under study.
+    :type data: list, numpy array or pandas series
+
+    :return: sorted categories.
+    :rtype: numpy array.
+    """
+    return np.sort(np.asarray(pd.unique(np.asarray(data))))
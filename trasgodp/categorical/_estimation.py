@@ -0,0 +1,214 @@
+# Copyright 2026 Spanish National Research Council (CSIC)
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Estimation of the true frequencies from the output of the mechanisms."""
+
+import numpy as np
+import pandas as pd
+import typing
+from .._instrument import instrumented
+from .._parameters import p_keep, p_random, p_same
+from ._encoding import _encoder
+
+ESTIMATED_MECHANISMS = (
+    "exponential",
+    "randomized_response_binary",
+    "randomized_response_kary",
+)
+
+
+class FrequencyEstimator:
+    """Unbiased estimate of the frequencies of the categories before the mechanism.
+
+    Each report keeps its category with some probability and otherwise moves to
+    the categories uniformly, so the expected counts of the reports are
+    a * n + b * N for the true counts n of N reports. The estimator only keeps
+    the counts of the reports, which are updated by chunks and can be merged
+    between shards, and inverts that perturbation when the estimate is asked.
+
+    Example::
+
+        estimator = FrequencyEstimator(categories, epsilon)
+        for chunk in chunks:
+            estimator.update(chunk["dp_workclass"])
+        estimator.estimate()
+    """
+
+    def __init__(
+        self,
+        categories: typing.Union[typing.List, np.ndarray],
+        epsilon: float,
+        mechanism: str = "randomized_response_kary",
+    ):
+        """Create an estimator with no reports.
+
+        :param categories: possible values of the column, as used by the mechanism
+            (or their encoder).
+        :type categories: list, numpy array or CategoryEncoder
+
+        :param epsilon: privacy budget with which the mechanism was applied.
+        :type epsilon: float
+
+        :param mechanism: 'randomized_response_kary', 'randomized_response_binary'
+            or 'exponential'.
+        :type mechanism: string
+        """
+        if mechanism not in ESTIMATED_MECHANISMS:
+            raise ValueError(f"Mechanism not allowed: {mechanism}.")
+        if epsilon <= 0:
+            raise ValueError("The privacy budget must be greater than 0.")
+        self.encoder = _encoder(categories)
+        self.categories = self.encoder.categories
+        self.epsilon = epsilon
+        self.mechanism = mechanism
+        self.a, self.b = mixture_weights(mechanism, len(self.categories), epsilon)
+        self.counts = np.zeros(len(self.categories), dtype=np.int64)
+
+    @property
+    def n(self) -> int:
+        """Number of reports aggregated."""
+        return int(self.counts.sum())
+
+    @instrumented
+    def update(
+        self, values: typing.Union[typing.List, np.ndarray, pd.Series]
+    ) -> "FrequencyEstimator":
+        """Add a chunk of reports obtained with the mechanism.
+
+        :param values: values of the column with DP.
+        :type values: list, numpy array or pandas series
+
+        :return: the estimator itself.
+        :rtype: FrequencyEstimator
+        """
+        codes = self.encoder.encode(values)
+        self.counts += np.bincount(codes, minlength=len(self.categories))
+        return self
+
+    def update_counts(
+        self, counts: typing.Union[pd.Series, np.ndarray]
+    ) -> "FrequencyEstimator":
+        """Add the counts of reports already aggregated.
+
+        :param counts: number of reports of each category. A pandas series (e.g.
+            from value_counts) is aligned by its index, and an array must follow
+            the order of the categories.
+        :type counts: pandas series or numpy array
+
+        :return: the estimator itself.
+        :rtype: FrequencyEstimator
+        """
+        if isinstance(counts, pd.Series):
+            self.encoder.encode(counts.index)
+            counts = counts.reindex(self.categories, fill_value=0).values
+        counts = np.asarray(counts)
+        if counts.shape != self.counts.shape or np.any(counts < 0):
+            raise ValueError("A non-negative count per category is required.")
+        self.counts += counts.astype(np.int64)
+        return self
+
+    def merge(self, other: "FrequencyEstimator") -> "FrequencyEstimator":
+        """Merge the reports of another estimator of the same mechanism.
+
+        :param other: estimator with the reports of another shard.
+        :type other: FrequencyEstimator
+
+        :return: new estimator with the reports of both.
+        :rtype: FrequencyEstimator
+        """
+        same = (other.mechanism, other.epsilon) == (self.mechanism, self.epsilon)
+        if not same or not np.array_equal(other.categories, self.categories):
+            raise ValueError("Only estimators of the same mechanism can be merged.")
+        merged = FrequencyEstimator(self.encoder, self.epsilon, self.mechanism)
+        merged.counts = self.counts + other.counts
+        return merged
+
+    def __add__(self, other: "FrequencyEstimator") -> "FrequencyEstimator":
+        """Merge two estimators (see :meth:`merge`)."""
+        return self.merge(other)
+
+    def estimate(self, normalize: bool = False) -> pd.Series:
+        """Estimate the number of reports of each category before the mechanism.
+
+        The estimate is unbiased, so it can be negative for rare categories.
+
+        :param normalize: boolean, default to False. If True, the frequencies are
+            returned as proportions of the reports.
+        :type normalize: boolean
+
+        :return: estimated frequency of each category.
+        :rtype: pandas series
+        """
+        n = self.n
+        estimate = (self.counts - self.b * n) / self.a
+        if normalize:
+            estimate = estimate / max(n, 1)
+        return pd.Series(estimate, index=self.categories)
+
+    def variance(self, normalize: bool = False) -> pd.Series:
+        """Estimate the variance of the estimated frequencies.
+
+        :param normalize: boolean, default to False. If True, the variance of the
+            proportions is returned.
+        :type normalize: boolean
+
+        :return: estimated variance of the frequency of each category.
+        :rtype: pandas series
+        """
+        n = max(self.n, 1)
+        observed = self.counts / n
+        variance = n * observed * (1 - observed) / self.a**2
+        if normalize:
+            variance = variance / n**2
+        return pd.Series(variance, index=self.categories)
+
+
+def mixture_weights(
+    mechanism: str, k: int, epsilon: float
+) -> typing.Tuple[float, float]:
+    """Get the weights of the distribution with DP of a categorical mechanism.
+
+    The distribution of the output is q = a * p + b for a distribution p of the
+    original values.
+
+    :param mechanism: 'randomized_response_kary', 'randomized_response_binary'
+        or 'exponential'.
+    :type mechanism: string
+
+    :param k: number of categories.
+    :type k: int
+
+    :param epsilon: privacy budget.
+    :type epsilon: float
+
+    :return: weight of the original distribution and of the uniform term.
+    :rtype: tuple.
+    """
+    if mechanism == "randomized_response_kary":
+        if k < 3:
+            raise ValueError("Three or more categories are required.")
+        random = p_random(k, epsilon)
+        return 1 - random, random / k
+
+    if mechanism == "randomized_response_binary":
+        if k != 2:
+            raise ValueError("The column must have exactly two categories.")
+        keep = p_keep(epsilon)
+        return 2 * keep - 1, 1 - keep
+
+    if k == 1:
+        return 1.0, 0.0
+    same = p_same(k, epsilon)
+    b = (1 - same) / (k - 1)
+    return same - b, b
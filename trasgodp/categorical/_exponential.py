@@ -19,17 +19,31 @@
 import numpy as np
 import pandas as pd
 import typing
-import copy
+from .._accountant import spend
+from .._instrument import instrumented, stage
+from .._parameters import p_same
+from .._random import get_rng
+from .._utils import output_frame
+from ._encoding import decode, encode
 
 
+@instrumented
 def dp_exponential(
     df: pd.DataFrame,
     column: str,
     epsilon: float,
     new_column=False,
+    inplace=False,
+    categories=None,
+    rng=None,
+    as_categorical=False,
+    accountant=None,
 ) -> pd.DataFrame:
     """Apply the Exponential mechanism to a categorical column of a dataframe.
 
+    The column can contain strings, be a pandas Categorical (whose codes are
+    used directly) or contain integers if their categories are given.
+
     :param df: dataframe with the data under study.
     :type df: pandas dataframe
 
@@ -44,56 +58,90 @@ def dp_exponential(
         column 'dp_{column}' is created with the new values.
     :type  new_column: boolean
 
+    :param inplace: boolean, default to False. If True, the dataframe passed is
+        modified directly and no copy of it is made. If False, a copy is returned
+        (shallow if the pandas copy-on-write mode is enabled).
+    :type  inplace: boolean
+
+    :param categories: possible values of the column (or their
+        :class:`CategoryEncoder`). If None, they are obtained from the data.
+        Fixing them avoids a scan of the data and a domain that depends on it,
+        and keeps it the same when the mechanism is applied to parts of a dataset.
+    :type categories: list, numpy array or CategoryEncoder
+
+    :param rng: random number generator (numpy Generator, see
+        :func:`trasgodp.make_rng`) or seed used to create it. If None, it is
+        created from the global numpy random state.
+    :type rng: numpy Generator, int or None
+
+    :param as_categorical: boolean, default to False. If True, the column with the
+        new values is stored as a pandas Categorical instead of an object column.
+        It always is if the column was a Categorical.
+    :type  as_categorical: boolean
+
+    :param accountant: accountant to which the privacy budget spent is reported.
+        If None, the one active in a with block, if any.
+    :type accountant: trasgodp.BudgetAccountant
+
     :return: dataframe with the column transformed applying the mechanism.
     :rtype: pandas dataframe.
     """
-    df = copy.deepcopy(df)
+    df = output_frame(df, inplace)
     if column not in df.keys():
         raise ValueError("Column: {column} not in the dataframe.")
 
-    if isinstance(df[column].values[0], str) is False:
-        raise ValueError(
-            "Type of the column not allowed for the Exponential mechanism."
-        )
+    values = df[column].values
+    _check_type(values, categories)
 
     if epsilon <= 0:
         raise ValueError("The privacy budget must be greater than 0.")
 
-    categories = np.unique(df[column].values)
+    categories, codes = encode(values, categories)
+    dp_codes = _exponential_codes(codes, len(categories), epsilon, get_rng(rng))
+    as_categorical = as_categorical or isinstance(values, pd.Categorical)
+    dp_column = decode(dp_codes, categories, as_categorical)
 
-    dp_column = []
-    for i in range(len(df)):
-        original_value = df[column].iloc[i]
-        dp_value = _probability_exp(original_value, categories, epsilon)
-        dp_column.append(dp_value)
+    spend(accountant, epsilon, column=column, mechanism="exponential")
 
-    if new_column:
-        df[f"dp_{column}"] = dp_column
-    else:
-        df[column] = dp_column
+    with stage("assign", len(df)):
+        if new_column:
+            df[f"dp_{column}"] = dp_column
+        else:
+            df[column] = dp_column
 
     return df
 
 
+@instrumented
 def dp_exponential_array(
-    data: typing.Union[typing.List, np.ndarray],
+    data: typing.Union[typing.List, np.ndarray, pd.Categorical],
     epsilon: float,
-) -> np.ndarray:
+    rng=None,
+    categories=None,
+) -> typing.Union[np.ndarray, pd.Categorical]:
     """Apply the Exponential mechanism to an array with categorical values.
 
-    :param data: dataset with the data under study.
-    :type data: list or numpy array
+    :param data: dataset with the data under study. A pandas Categorical is
+        processed on its codes and a Categorical is returned.
+    :type data: list, numpy array or pandas Categorical
 
     :param epsilon: privacy budget.
     :type epsilon: float
 
+    :param rng: random number generator (numpy Generator, see
+        :func:`trasgodp.make_rng`) or seed used to create it. If None, it is
+        created from the global numpy random state.
+    :type rng: numpy Generator, int or None
+
+    :param categories: possible values of the data (or their
+        :class:`CategoryEncoder`). If None, they are obtained from the data.
+        Fixing them avoids a scan of the data and a domain that depends on it.
+    :type categories: list, numpy array or CategoryEncoder
+
     :return: array with data transformed applying the mechanism.
     :rtype: numpy array.
     """
-    if isinstance(data[0], str) is False:
-        raise ValueError(
-            "Type of the column not allowed for the Exponential mechanism."
-        )
+    _check_type(data, categories)
 
     if isinstance(data, list):
         data = np.array(data)
@@ -101,31 +149,75 @@ def dp_exponential_array(
     if epsilon <= 0:
         raise ValueError("The privacy budget must be greater than 0.")
 
-    categories = np.unique(data)
+    categories, codes = encode(data, categories)
+    dp_codes = _exponential_codes(codes, len(categories), epsilon, get_rng(rng))
+    return decode(dp_codes, categories, isinstance(data, pd.Categorical))
 
-    dp_array = []
-    for original_value in data:
-        dp_value = _probability_exp(original_value, categories, epsilon)
-        dp_array.append(dp_value)
 
-    return np.array(dp_array)
+def _check_type(data, categories):
+    """
+    Check that the data can be used by the Exponential mechanism.
+
+    Strings and pandas Categoricals are allowed, and integers if their
+    categories are given.
 
+    :param data: values of the column.
+    :type data: list, numpy array or pandas Categorical
 
-def _probability_exp(value, categories, epsilon):
+    :param categories: possible values of the column.
+    :type categories: list, numpy array or None
     """
-    Probability of the output of the Exponential mechanism.
+    if isinstance(data, pd.Categorical):
+        return
+    if categories is not None and np.issubdtype(np.asarray(data).dtype, np.integer):
+        return
+    if isinstance(data[0], str) is False:
+        raise ValueError(
+            "Type of the column not allowed for the Exponential mechanism."
+        )
 
-    :param value: current value
-    :type value: str
 
-    :param categories: possible values of the data
-    :type categories: list of strings
+@instrumented(name="sample")
+def _exponential_codes(codes, k, epsilon, rng, uniform=None, other=None):
+    """
+    Apply the Exponential mechanism to values encoded as integer codes.
+
+    The score is 1 for the original category and 0 for the rest, so every row
+    keeps its value with the same probability and otherwise moves to one of the
+    other k - 1 categories uniformly at random.
+
+    :param codes: position of each value in the list of categories.
+    :type codes: numpy array of integers
+
+    :param k: number of categories.
+    :type k: int
 
     :param epsilon: privacy budget.
     :type epsilon: float
+
+    :param rng: random number generator.
+    :type rng: numpy Generator
+
+    :param uniform: values in [0, 1) drawn beforehand, one per row. If given with
+        other, the random number generator is not used.
+    :type uniform: numpy array
+
+    :param other: integers in [0, k - 1) drawn beforehand, one per row.
+    :type other: numpy array of integers
+
+    :return: codes of the values sampled by the mechanism.
+    :rtype: numpy array of integers.
     """
-    sensitivity = 1
-    scores = np.array([1 if value == c else 0 for c in categories])
-    exp_scores = np.exp((epsilon * scores) / 2 * sensitivity)
-    probs = exp_scores / sum(exp_scores)
-    return np.random.choice(categories, p=probs)
+    if k == 1:
+        return codes.copy()
+
+    n = len(codes)
+    if uniform is None:
+        uniform = rng.random(n)
+    keep = uniform < p_same(k, epsilon)
+    if other is None:
+        other = rng.integers(0, k - 1, size=n, dtype=codes.dtype)
+        other += other >= codes
+    else:
+        other = other + (other >= codes)
+    return np.where(keep, codes, other)
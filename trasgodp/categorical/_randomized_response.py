@@ -18,19 +18,37 @@
 
 import numpy as np
 import pandas as pd
-import scipy
-import copy
+from .._accountant import spend
+from .._instrument import instrumented, stage
+from .._parameters import binary_labels, p_keep, p_random
+from .._random import get_rng
+from .._utils import output_frame
+from ._encoding import decode, encode, unique
+import typing
 
+# Number of values processed at a time when packing the output in bits (multiple
+# of 8, so every block fills whole bytes).
+_PACK_BLOCK = 1 << 20
 
+
+@instrumented
 def dp_randomized_response_binary(
     df: pd.DataFrame,
     column: str,
     epsilon: float,
     new_column=False,
     positive_label=None,
+    inplace=False,
+    categories=None,
+    rng=None,
+    as_categorical=False,
+    accountant=None,
 ) -> pd.DataFrame:
     """Apply the Randomized Response mechanism to a binary column of a dataframe.
 
+    A pandas Categorical column is processed on its codes, without hashing the
+    values.
+
     :param df: dataframe with the data under study.
     :type df: pandas dataframe
 
@@ -49,54 +67,154 @@ def dp_randomized_response_binary(
         first value.
     :type positive_label: string
 
+    :param inplace: boolean, default to False. If True, the dataframe passed is
+        modified directly and no copy of it is made. If False, a copy is returned
+        (shallow if the pandas copy-on-write mode is enabled).
+    :type  inplace: boolean
+
+    :param categories: possible values of the column (or their
+        :class:`CategoryEncoder`). If None, they are obtained from the data.
+        Fixing them avoids a scan of the data and a domain that depends on it,
+        and keeps it the same when the mechanism is applied to parts of a dataset.
+    :type categories: list, numpy array or CategoryEncoder
+
+    :param rng: random number generator (numpy Generator, see
+        :func:`trasgodp.make_rng`) or seed used to create it. If None, it is
+        created from the global numpy random state.
+    :type rng: numpy Generator, int or None
+
+    :param as_categorical: boolean, default to False. If True, the column with the
+        new values is stored as a pandas Categorical instead of an object column.
+        It always is if the column was a Categorical.
+    :type  as_categorical: boolean
+
+    :param accountant: accountant to which the privacy budget spent is reported.
+        If None, the one active in a with block, if any.
+    :type accountant: trasgodp.BudgetAccountant
+
     :return: dataframe with the column transformed applying the mechanism.
     :rtype: pandas dataframe.
     """
-    df = copy.deepcopy(df)
+    df = output_frame(df, inplace)
     if column not in df.keys():
         raise ValueError("Column: {column} not in the dataframe.")
 
-    categories = np.unique(df[column].values)
+    values = df[column].values
+    categories, codes = encode(values, categories)
     if len(categories) != 2:
         raise ValueError("Only binary attributes are supported.")
 
     if epsilon <= 0:
         raise ValueError("The privacy budget must be greater than 0.")
 
-    if positive_label is None:
-        positive_label = categories[0]
-        negative_label = categories[1]
-    else:
-        if positive_label not in categories:
-            raise ValueError("Positive label is not a value in the column.")
-        negative_label = categories[categories != positive_label][0]
-
-    data = df[column].values
-    data_binary = [1 if v == positive_label else 0 for v in data]
-
-    p = np.exp(epsilon) / (np.exp(epsilon) + 1)
-    _dp_column = []
-    for value in data_binary:
-        if np.random.rand() < p:
-            _dp_column.append(value)
-        else:
-            _dp_column.append(int(np.abs(value - 1)))
+    positive_label, _ = binary_labels(categories, positive_label)
+    positive_code = list(categories).index(positive_label)
 
-    dp_column = [positive_label if v == 1 else negative_label for v in _dp_column]
+    dp_bits = _binary_bits(codes == positive_code, epsilon, get_rng(rng))
+    dp_codes = (dp_bits ^ (positive_code == 0)).view(np.int8)
+    as_categorical = as_categorical or isinstance(values, pd.Categorical)
+    dp_column = decode(dp_codes, categories, as_categorical)
 
-    if new_column:
-        df[f"dp_{column}"] = dp_column
-    else:
-        df[column] = dp_column
+    spend(accountant, epsilon, column=column, mechanism="randomized_response_binary")
+
+    with stage("assign", len(df)):
+        if new_column:
+            df[f"dp_{column}"] = dp_column
+        else:
+            df[column] = dp_column
 
     return df
 
 
+@instrumented
+def dp_randomized_response_binary_array(
+    data: typing.Union[typing.List, np.ndarray, pd.Categorical],
+    epsilon: float,
+    positive_label=None,
+    packed=False,
+    rng=None,
+    categories=None,
+) -> np.ndarray:
+    """Apply the Randomized Response mechanism to an array with binary values.
+
+    :param data: dataset with the data under study. Binary data. A pandas
+        Categorical is processed on its codes and a Categorical is returned
+        (unless packed).
+    :type data: list, numpy array or pandas Categorical
+
+    :param epsilon: privacy budget.
+    :type epsilon: float
+
+    :param positive_label: value to be assigned as 1. If None, it is assigned to
+        first value.
+    :type positive_label: string
+
+    :param packed: boolean, default to False. If True, the output is returned as
+        bits packed with numpy packbits (1 for the positive label), using one bit
+        per value. The values can be recovered with
+        ``np.unpackbits(dp_array, count=len(data))``.
+    :type  packed: boolean
+
+    :param rng: random number generator (numpy Generator, see
+        :func:`trasgodp.make_rng`) or seed used to create it. If None, it is
+        created from the global numpy random state.
+    :type rng: numpy Generator, int or None
+
+    :param categories: the two possible values of the data (or their
+        :class:`CategoryEncoder`). If None, they are obtained from the data.
+    :type categories: list, numpy array or CategoryEncoder
+
+    :return: array with data transformed applying the mechanism.
+    :rtype: numpy array.
+    """
+    categorical = isinstance(data, pd.Categorical)
+    coded = categorical or categories is not None
+    if coded:
+        categories, data = encode(data, categories)
+    else:
+        data = np.asarray(data)
+        categories = unique(data)
+    if len(categories) != 2:
+        raise ValueError("Only binary attributes are supported.")
+
+    if epsilon <= 0:
+        raise ValueError("The privacy budget must be greater than 0.")
+
+    positive_label, negative_label = binary_labels(categories, positive_label)
+    if coded:
+        positive_code = list(categories).index(positive_label)
+        positive_label, negative_label = positive_code, 1 - positive_code
+
+    rng = get_rng(rng)
+    if not packed:
+        dp_bits = _binary_bits(data == positive_label, epsilon, rng)
+        if coded:
+            dp_codes = (dp_bits ^ (positive_label == 0)).view(np.int8)
+            return decode(dp_codes, categories, categorical)
+        return np.where(dp_bits, positive_label, negative_label)
+
+    dp_array = np.empty((len(data) + 7) // 8, dtype=np.uint8)
+    for start in range(0, len(data), _PACK_BLOCK):
+        stop = min(start + _PACK_BLOCK, len(data))
+        dp_bits = _binary_bits(data[start:stop] == positive_label, epsilon, rng)
+        packed_bits = np.packbits(dp_bits)
+        first = start // 8
+        last = first + len(packed_bits)
+        dp_array[first:last] = packed_bits
+    return dp_array
+
+
+@instrumented
 def dp_randomized_response_kary(
     df: pd.DataFrame,
     column: str,
     epsilon: float,
     new_column=False,
+    inplace=False,
+    as_categorical=False,
+    categories=None,
+    rng=None,
+    accountant=None,
 ) -> pd.DataFrame:
     """Apply the Randomized Response mechanism to column of a dataframe (no binary).
 
@@ -114,14 +232,40 @@ def dp_randomized_response_kary(
         column 'dp_{column}' is created with the new values.
     :type  new_column: boolean
 
+    :param inplace: boolean, default to False. If True, the dataframe passed is
+        modified directly and no copy of it is made. If False, a copy is returned
+        (shallow if the pandas copy-on-write mode is enabled).
+    :type  inplace: boolean
+
+    :param as_categorical: boolean, default to False. If True, the column with the
+        new values is stored as a pandas Categorical instead of an object column.
+        It always is if the column was a Categorical.
+    :type  as_categorical: boolean
+
+    :param categories: possible values of the column (or their
+        :class:`CategoryEncoder`). If None, they are obtained from the data.
+        Fixing them avoids a scan of the data and a domain that depends on it,
+        and keeps it the same when the mechanism is applied to parts of a dataset.
+    :type categories: list, numpy array or CategoryEncoder
+
+    :param rng: random number generator (numpy Generator, see
+        :func:`trasgodp.make_rng`) or seed used to create it. If None, it is
+        created from the global numpy random state.
+    :type rng: numpy Generator, int or None
+
+    :param accountant: accountant to which the privacy budget spent is reported.
+        If None, the one active in a with block, if any.
+    :type accountant: trasgodp.BudgetAccountant
+
     :return: dataframe with the column transformed applying the mechanism.
     :rtype: pandas dataframe.
     """
-    df = copy.deepcopy(df)
+    df = output_frame(df, inplace)
     if column not in df.keys():
         raise ValueError("Column: {column} not in the dataframe.")
 
-    categories = np.unique(df[column].values)
+    values = df[column].values
+    categories, codes = encode(values, categories)
     k = len(categories)
     if k < 3:
         raise ValueError("Three or more categories are required.")
@@ -129,21 +273,119 @@ def dp_randomized_response_kary(
     if epsilon <= 0:
         raise ValueError("The privacy budget must be greater than 0.")
 
-    data = df[column].values
+    dp_codes = _kary_codes(codes, k, epsilon, get_rng(rng))
+    as_categorical = as_categorical or isinstance(values, pd.Categorical)
+    dp_column = decode(dp_codes, categories, as_categorical)
 
-    p_b = k / (np.exp(epsilon) + k - 1)
-    dp_column = []
-    for value in data:
-        b = scipy.stats.bernoulli.rvs(p_b)
-        if b == 0:
-            dp_column.append(value)
-        else:
-            id_k = scipy.stats.uniform.rvs(loc=0, scale=k)
-            dp_column.append(categories[int(id_k)])
+    spend(accountant, epsilon, column=column, mechanism="randomized_response_kary")
 
-    if new_column:
-        df[f"dp_{column}"] = dp_column
-    else:
-        df[column] = dp_column
+    with stage("assign", len(df)):
+        if new_column:
+            df[f"dp_{column}"] = dp_column
+        else:
+            df[column] = dp_column
 
     return df
+
+
+@instrumented
+def dp_randomized_response_kary_array(
+    data: typing.Union[typing.List, np.ndarray, pd.Categorical],
+    epsilon: float,
+    rng=None,
+    categories=None,
+) -> typing.Union[np.ndarray, pd.Categorical]:
+    """Apply the Randomized Response mechanism to an array (no binary).
+
+    :param data: dataset with the data under study. A pandas Categorical is
+        processed on its codes and a Categorical is returned.
+    :type data: list, numpy array or pandas Categorical
+
+    :param epsilon: privacy budget.
+    :type epsilon: float
+
+    :param rng: random number generator (numpy Generator, see
+        :func:`trasgodp.make_rng`) or seed used to create it. If None, it is
+        created from the global numpy random state.
+    :type rng: numpy Generator, int or None
+
+    :param categories: possible values of the data (or their
+        :class:`CategoryEncoder`). If None, they are obtained from the data.
+        Fixing them avoids a scan of the data and a domain that depends on it.
+    :type categories: list, numpy array or CategoryEncoder
+
+    :return: array with data transformed applying the mechanism.
+    :rtype: numpy array or pandas Categorical.
+    """
+    categories, codes = encode(data, categories)
+    k = len(categories)
+    if k < 3:
+        raise ValueError("Three or more categories are required.")
+
+    if epsilon <= 0:
+        raise ValueError("The privacy budget must be greater than 0.")
+
+    dp_codes = _kary_codes(codes, k, epsilon, get_rng(rng))
+    return decode(dp_codes, categories, isinstance(data, pd.Categorical))
+
+
+@instrumented(name="sample")
+def _kary_codes(codes, k, epsilon, rng, uniform=None, id_k=None):
+    """
+    Apply the k-ary Randomized Response to values encoded as integer codes.
+
+    :param codes: position of each value in the list of categories.
+    :type codes: numpy array of integers
+
+    :param k: number of categories.
+    :type k: int
+
+    :param epsilon: privacy budget.
+    :type epsilon: float
+
+    :param rng: random number generator.
+    :type rng: numpy Generator
+
+    :param uniform: values in [0, 1) drawn beforehand, one per row. If given with
+        id_k, the random number generator is not used.
+    :type uniform: numpy array
+
+    :param id_k: codes in [0, k) drawn beforehand, one per row.
+    :type id_k: numpy array of integers
+
+    :return: codes of the values obtained with the mechanism.
+    :rtype: numpy array of integers.
+    """
+    n = len(codes)
+    if uniform is None:
+        uniform = rng.random(n)
+    b = uniform < p_random(k, epsilon)
+    if id_k is None:
+        id_k = rng.integers(0, k, size=n, dtype=codes.dtype)
+    return np.where(b, id_k, codes)
+
+
+@instrumented(name="sample")
+def _binary_bits(data_binary, epsilon, rng, uniform=None):
+    """
+    Apply the binary Randomized Response to a boolean mask.
+
+    :param data_binary: True where the value is the positive label.
+    :type data_binary: numpy array of booleans
+
+    :param epsilon: privacy budget.
+    :type epsilon: float
+
+    :param rng: random number generator.
+    :type rng: numpy Generator
+
+    :param uniform: values in [0, 1) drawn beforehand, one per row. If given, the
+        random number generator is not used.
+    :type uniform: numpy array
+
+    :return: mask of the positive labels obtained with the mechanism.
+    :rtype: numpy array of booleans.
+    """
+    if uniform is None:
+        uniform = rng.random(len(data_binary))
+    return data_binary ^ (uniform >= p_keep(epsilon))
@@ -0,0 +1,272 @@
+# Copyright 2026 Spanish National Research Council (CSIC)
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Command line privatization of CSV and Parquet files described by a spec file.
+
+Example of spec (JSON, or YAML if pyyaml is installed)::
+
+    {
+        "columns": {
+            "age": {"mechanism": "laplace", "epsilon": 1, "bounds": [17, 90]},
+            "workclass": {
+                "mechanism": "exponential",
+                "epsilon": 1,
+                "domain": ["Private", "Self-emp-inc", "State-gov"]
+            }
+        },
+        "budget": {"epsilon": 5, "delta": 1e-5},
+        "read_csv": {"skipinitialspace": true}
+    }
+
+Each column takes the arguments of its mechanism (e.g. delta, lower_bound,
+upper_bound, categories, calibration), with 'bounds' and 'domain' as shortcuts
+for the bounds and the categories. The optional budget (epsilon, delta and slack
+of a :class:`trasgodp.BudgetAccountant`) makes the run fail before writing
+anything if the plan would exceed it.
+"""
+
+import argparse
+import json
+import os
+import sys
+
+# The modules with the mechanisms (and pandas) are imported once the arguments
+# and the spec are read, so the errors and the help are shown without delay.
+
+_SPEC_KEYS = {"columns", "budget", "read_csv"}
+_BUDGET_KEYS = {"epsilon", "delta", "slack"}
+
+
+def main(argv=None) -> int:
+    """Run the command line interface.
+
+    :param argv: arguments of the command. If None, the ones of the process.
+    :type argv: list
+
+    :return: exit status.
+    :rtype: int
+    """
+    parser = _parser()
+    args = parser.parse_args(argv)
+    try:
+        spec = load_spec(args.spec)
+        report = run(spec, args)
+    except (ValueError, ImportError, OSError) as e:
+        parser.exit(1, f"{parser.prog}: error: {e}\n")
+
+    if args.json:
+        json.dump(report, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+    elif not args.quiet:
+        _print_report(report, sys.stderr)
+    return 0
+
+
+def load_spec(path: str) -> dict:
+    """Read and check a spec file.
+
+    :param path: path of the JSON or YAML (.yaml or .yml) file.
+    :type path: string
+
+    :return: spec with the columns of the plan and, optionally, the budget and
+        the arguments for reading CSV files.
+    :rtype: dict
+    """
+    with open(path) as f:
+        if os.path.splitext(path)[1].lower() in (".yaml", ".yml"):
+            try:
+                import yaml
+            except ImportError as e:
+                raise ImportError("pyyaml is required for reading YAML specs.") from e
+            spec = yaml.safe_load(f)
+        else:
+            spec = json.load(f)
+
+    if not isinstance(spec, dict) or not isinstance(spec.get("columns"), dict):
+        raise ValueError("The spec must contain a mapping of columns.")
+    unknown = set(spec) - _SPEC_KEYS
+    if unknown:
+        raise ValueError(f"Keys not allowed in the spec: {sorted(unknown)}.")
+    if not isinstance(spec.get("budget", {}), dict):
+        raise ValueError("The budget of the spec must be a mapping.")
+    unknown = set(spec.get("budget", {})) - _BUDGET_KEYS
+    if unknown:
+        raise ValueError(f"Keys not allowed in the budget: {sorted(unknown)}.")
+    if not isinstance(spec.get("read_csv", {}), dict):
+        raise ValueError("The read_csv arguments of the spec must be a mapping.")
+
+    columns = {}
+    for column, params in spec["columns"].items():
+        columns[column] = _column_spec(column, params)
+    return {**spec, "columns": columns}
+
+
+def _column_spec(column, params):
+    """Check the spec of a column and expand its shortcuts."""
+    if not isinstance(params, dict):
+        raise ValueError(f"The spec of column {column} must be a mapping.")
+    missing = {"mechanism", "epsilon"} - set(params)
+    if missing:
+        raise ValueError(f"Keys missing for column {column}: {sorted(missing)}.")
+
+    params = dict(params)
+    if "bounds" in params:
+        bounds = params.pop("bounds")
+        if not isinstance(bounds, (list, tuple)) or len(bounds) != 2:
+            raise ValueError(
+                f"The bounds of column {column} must be a list [lower, upper]."
+            )
+        if "lower_bound" in params or "upper_bound" in params:
+            raise ValueError(f"Column {column} has both bounds and lower/upper_bound.")
+        params["lower_bound"], params["upper_bound"] = bounds
+    if "domain" in params:
+        domain = params.pop("domain")
+        if not isinstance(domain, (list, tuple)):
+            raise ValueError(f"The domain of column {column} must be a list.")
+        if "categories" in params:
+            raise ValueError(f"Column {column} has both domain and categories.")
+        params["categories"] = domain
+    return params
+
+
+def run(spec: dict, args: argparse.Namespace) -> dict:
+    """Privatize the input file with the plan of a spec.
+
+    :param spec: spec returned by :func:`load_spec`.
+    :type spec: dict
+
+    :param args: arguments of the command.
+    :type args: argparse Namespace
+
+    :return: dictionary with the number of rows, the seconds spent, the rows per
+        second, the seconds spent in each column and the budget spent.
+    :rtype: dict
+    """
+    from ._accountant import BudgetAccountant
+    from .pipeline import PrivatizationPlan, privatize_csv, privatize_parquet
+
+    plan = PrivatizationPlan()
+    for column, params in spec["columns"].items():
+        try:
+            plan.add(column, **params)
+        except ValueError as e:
+            raise ValueError(f"Column {column}: {e}") from e
+    accountant = BudgetAccountant(**spec.get("budget", {}))
+    options = dict(
+        new_column=args.new_column,
+        accountant=accountant,
+        n_workers=args.workers,
+        seed=args.seed,
+    )
+    if _is_parquet(args.input):
+        report = privatize_parquet(
+            plan, args.input, args.output, batch_size=args.chunksize, **options
+        )
+    else:
+        report = privatize_csv(
+            plan,
+            args.input,
+            args.output,
+            chunksize=args.chunksize,
+            **options,
+            **spec.get("read_csv", {}),
+        )
+
+    epsilon, delta = accountant.spent()
+    report["budget"] = {
+        "epsilon": epsilon,
+        "delta": delta,
+        "columns": {
+            column: dict(zip(("epsilon", "delta"), accountant.spent(column)))
+            for column in accountant.columns
+        },
+    }
+    return report
+
+
+def _parser():
+    """Build the parser of the arguments of the command."""
+    parser = argparse.ArgumentParser(
+        prog="trasgodp",
+        description="Apply local differential privacy to the columns of a CSV or "
+        "Parquet file, as described by a JSON or YAML spec.",
+    )
+    parser.add_argument("spec", help="JSON or YAML file with the plan")
+    parser.add_argument("input", help="CSV or Parquet file with the data")
+    parser.add_argument("output", help="file where the data with DP is written")
+    parser.add_argument(
+        "--chunksize",
+        type=int,
+        default=100_000,
+        help="rows read and privatized at a time (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="processes privatizing chunks at the same time (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--seed", type=int, default=None, help="seed of the random generators"
+    )
+    parser.add_argument(
+        "--new-column",
+        action="store_true",
+        help="write the values with DP in new 'dp_{column}' columns",
+    )
+    output = parser.add_mutually_exclusive_group()
+    output.add_argument(
+        "--json", action="store_true", help="print the report as JSON to stdout"
+    )
+    output.add_argument("--quiet", action="store_true", help="do not print a report")
+    parser.add_argument("--version", action="version", version=_version())
+    return parser
+
+
+def _version():
+    """Get the version of the package without importing the mechanisms."""
+    from . import __version__
+
+    return f"%(prog)s {__version__}"
+
+
+def _is_parquet(path):
+    """Check if a file is a Parquet file by its extension."""
+    return os.path.splitext(path)[1].lower() in (".parquet", ".pq")
+
+
+def _print_report(report, stream):
+    """Print the throughput and the budget spent in a human readable way."""
+    print(
+        f"Privatized {report['rows']} rows in {report['seconds']:.2f} s "
+        f"({report['rows_per_second']:.0f} rows/s)",
+        file=stream,
+    )
+    for column, seconds in report["timings"].items():
+        print(f"  {column}: {seconds:.3f} s", file=stream)
+    budget = report["budget"]
+    print(
+        f"Privacy budget spent: epsilon={budget['epsilon']:g}, "
+        f"delta={budget['delta']:g}",
+        file=stream,
+    )
+    for column, spent in budget["columns"].items():
+        print(
+            f"  {column}: epsilon={spent['epsilon']:g}, delta={spent['delta']:g}",
+            file=stream,
+        )
+
+
+if __name__ == "__main__":
+    sys.exit(main())
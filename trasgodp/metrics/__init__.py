@@ -14,6 +14,16 @@
 
 """Privacy-utility metrics."""
 
+from ._analytic import ANALYTIC_MECHANISMS, expected_divergence
+from ._engine import UtilityEvaluator
+from ._profile import DatasetProfile
 from ._utility_loss import correlation_loss, divergence_distributions
 
-__all__ = ["correlation_loss", "divergence_distributions"]
+__all__ = [
+    "ANALYTIC_MECHANISMS",
+    "DatasetProfile",
+    "UtilityEvaluator",
+    "correlation_loss",
+    "divergence_distributions",
+    "expected_divergence",
+]
@@ -0,0 +1,119 @@
+# Copyright 2026 Spanish National Research Council (CSIC)
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Expected divergences of the categorical mechanisms, without sampling."""
+
+import numpy as np
+import pandas as pd
+import typing
+import scipy
+from .._instrument import instrumented
+from ..categorical._estimation import ESTIMATED_MECHANISMS, mixture_weights
+
+ANALYTIC_MECHANISMS = ESTIMATED_MECHANISMS
+
+
+@instrumented
+def expected_divergence(
+    counts: typing.Union[pd.Series, np.ndarray, typing.List[int]],
+    mechanism: str,
+    epsilon: float,
+) -> dict:
+    """Predict the divergences of a categorical mechanism from the frequencies.
+
+    Every category keeps its value with the same probability and otherwise moves
+    to the others uniformly, so the expected distribution with DP is
+    q = a * p + b, with p the original distribution. The mean and the variance
+    of the metrics of :func:`divergence_distributions` are obtained from q and
+    the covariance of the frequencies with DP (delta method, which is accurate
+    when the number of rows is large), in O(k) time for k categories.
+
+    :param counts: number of rows with each category of the domain of the
+        mechanism, e.g. df[column].value_counts() (add the categories with no
+        rows if the domain is fixed).
+    :type counts: pandas series, list or numpy array
+
+    :param mechanism: 'exponential', 'randomized_response_binary' or
+        'randomized_response_kary'.
+    :type mechanism: string
+
+    :param epsilon: privacy budget.
+    :type epsilon: float
+
+    :return: dictionary with the expected value ('expected') and the variance
+        ('variance') of the divergence metrics (TVD, JS, KL).
+    :rtype: dict
+    """
+    if mechanism not in ANALYTIC_MECHANISMS:
+        raise ValueError(f"Mechanism not allowed: {mechanism}.")
+    if epsilon <= 0:
+        raise ValueError("The privacy budget must be greater than 0.")
+
+    counts = np.asarray(counts, dtype=np.float64)
+    if counts.ndim != 1 or np.any(counts < 0) or counts.sum() == 0:
+        raise ValueError("The counts must be non-negative and not all zero.")
+    k = len(counts)
+    n = counts.sum()
+    p = counts / n
+
+    a, b = mixture_weights(mechanism, k, epsilon)
+    q = a * p + b
+
+    # Covariance of the frequencies with DP: each row is an independent draw of
+    # a one-hot vector with mean a * e_i + b, i.e. diag(q) minus a rank-2 term.
+    cov_diag = (q - a * a * p - 2 * a * b * p - b * b) / n
+    cov_diag = np.maximum(cov_diag, 0)
+
+    def quadratic(g):
+        """Compute g' C g for the covariance C of the frequencies with DP."""
+        value = np.sum(q * g * g) - a * a * np.sum(p * g * g)
+        value -= 2 * a * b * np.sum(p * g) * np.sum(g) + b * b * np.sum(g) ** 2
+        return max(value / n, 0.0)
+
+    expected, variance = {}, {}
+
+    # TVD: each |q_j - p_j| is a folded normal, smoothed by its expected sign.
+    mu = q - p
+    sd = np.sqrt(cov_diag)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        z = np.where(sd > 0, mu / sd, np.sign(mu) * np.inf)
+    sign = np.where(sd > 0, 1 - 2 * scipy.stats.norm.cdf(-z), np.sign(mu))
+    density = sd * np.sqrt(2 / np.pi) * np.exp(-0.5 * np.square(np.nan_to_num(z)))
+    abs_mean = np.where(sd > 0, density + mu * sign, np.abs(mu))
+    abs_var = np.maximum(mu * mu + cov_diag - abs_mean * abs_mean, 0)
+    expected["tvd"] = 0.5 * np.sum(abs_mean)
+    variance["tvd"] = quadratic(0.5 * sign) + 0.25 * np.sum(
+        abs_var - sign * sign * cov_diag
+    )
+
+    support = p > 0
+    m = (p + q) / 2
+
+    # JS (base e): gradient 0.5 log(q / m) and diagonal hessian.
+    with np.errstate(divide="ignore", invalid="ignore"):
+        grad = np.where(q > 0, 0.5 * np.log(q / m), 0)
+        hess = np.where(support, 0.5 * p / (q * (p + q)), 0)
+    js = scipy.spatial.distance.jensenshannon(p, q, base=np.e) ** 2
+    expected["js"] = js + 0.5 * np.sum(hess * cov_diag)
+    variance["js"] = quadratic(grad) + 0.5 * np.sum(np.square(hess * cov_diag))
+
+    # KL(p || q): gradient -p / q and diagonal hessian p / q^2.
+    with np.errstate(divide="ignore", invalid="ignore"):
+        grad = np.where(support, -p / q, 0)
+        hess = np.where(support, p / (q * q), 0)
+    kl = scipy.stats.entropy(p, q)
+    expected["kl"] = kl + 0.5 * np.sum(hess * cov_diag)
+    variance["kl"] = quadratic(grad) + 0.5 * np.sum(np.square(hess * cov_diag))
+
+    return {"expected": expected, "variance": variance}
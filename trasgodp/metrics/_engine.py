@@ -0,0 +1,137 @@
+# Copyright 2026 Spanish National Research Council (CSIC)
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Evaluation of the utility of several columns with DP in a single pass."""
+
+import pandas as pd
+import typing
+from .._instrument import instrumented, stage
+from ._profile import DatasetProfile, encode_like
+from ._utility_loss import (
+    divergences,
+    dp_column_name,
+    get_profile,
+    loss_from_correlations,
+)
+
+
+class UtilityEvaluator:
+    """Evaluate the utility loss of datasets with DP against the same original one.
+
+    The original dataset is encoded and profiled (frequencies of each column and
+    correlation matrix of the features, see :class:`DatasetProfile`) only once,
+    and the results are reused for every dataset with DP evaluated. Each column
+    with DP is encoded once and used both for the correlation and for the
+    divergences, without copying any of the dataframes.
+
+    Example::
+
+        evaluator = UtilityEvaluator(df, features=["age", "workclass", "sex"])
+        for epsilon in [0.1, 1, 10]:
+            df_dp = dp_exponential(df, "workclass", epsilon)
+            evaluator.evaluate(df_dp)
+    """
+
+    def __init__(
+        self,
+        df_original: typing.Union[pd.DataFrame, DatasetProfile],
+        features: typing.Optional[typing.List[str]] = None,
+        method: str = "pearson",
+    ):
+        """Encode and profile the original dataset.
+
+        :param df_original: dataframe with the original data, or its profile.
+        :type df_original: pandas dataframe or DatasetProfile
+
+        :param features: list of featured for calculating the correlation (and
+            whose divergence is evaluated by default). If None, all the columns.
+        :type features: list
+
+        :param method: method for calculating the correlation.
+        :type method: string
+        """
+        self.profile = get_profile(df_original)
+        if features is None:
+            features = list(self.profile.columns)
+        if not all(col in self.profile.columns for col in features):
+            raise ValueError("Not all features are in the dataframe.")
+
+        if method not in ["pearson", "kendall", "spearman"]:
+            raise ValueError("Method not allowed for calculating the correlation.")
+
+        self.features = list(features)
+        self.method = method
+        self.profile.correlation(self.features, method)
+
+    @instrumented
+    def evaluate(
+        self,
+        df_dp: pd.DataFrame,
+        columns: typing.Optional[typing.List[str]] = None,
+        new_column: bool = False,
+    ) -> dict:
+        """Evaluate the correlation loss and the divergences of a dataset with DP.
+
+        :param df_dp: dataframe with the data privatized using DP.
+        :type df_dp: pandas dataframe
+
+        :param columns: columns whose divergence is computed. If None, the features.
+        :type columns: list
+
+        :param new_column: boolean, default to False. If True, the columns with dp
+            start with dp. Otherwise, the names of the columns with DP are the same
+            as in the original dataset.
+        :type  new_column: boolean
+
+        :return: dictionary with the correlation loss ('correlation_loss') and the
+            divergence metrics (TVD, JS, KL) of each column ('divergence').
+        :rtype: dict
+        """
+        if columns is None:
+            columns = self.features
+        for col in set(self.features).union(columns):
+            if col not in self.profile.columns:
+                raise ValueError(f"Column: {col} not in the original dataframe.")
+            if dp_column_name(df_dp, col, new_column) not in df_dp.columns:
+                raise ValueError(f"Column: {col} not in the dataframe with DP.")
+
+        categorical = self.profile.categorical
+        dp_codes = {}
+        for col in set(columns).union(categorical.intersection(self.features)):
+            labels, _ = self.profile.encoding(col)
+            dp_values = df_dp[dp_column_name(df_dp, col, new_column)]
+            dp_codes[col] = encode_like(labels, dp_values)
+
+        x_dp = {
+            col: (
+                dp_codes[col]
+                if col in categorical
+                else df_dp[dp_column_name(df_dp, col, new_column)].values
+            )
+            for col in self.features
+        }
+        with stage("correlation_dp", len(df_dp)):
+            corr_dp = pd.DataFrame(x_dp).corr(method=self.method).values
+
+        divergence = {}
+        for col in columns:
+            labels, _ = self.profile.encoding(col)
+            freq_orig = self.profile.frequencies(col)
+            divergence[col] = divergences(labels, freq_orig, dp_codes[col])
+
+        corr_original = self.profile.correlation(self.features, self.method)
+        return {
+            "correlation_loss": loss_from_correlations(corr_original, corr_dp),
+            "divergence": divergence,
+        }
@@ -0,0 +1,193 @@
+# Copyright 2026 Spanish National Research Council (CSIC)
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Profile of an original dataset reused by the utility metrics."""
+
+import numpy as np
+import pandas as pd
+import collections
+import threading
+import typing
+from .._instrument import instrumented, stage
+from ..categorical._encoding import shared_index
+
+
+class DatasetProfile:
+    """Profile of the original dataset, computed lazily and cached.
+
+    It stores the encoding and the frequencies of each column and the correlation
+    matrices of sets of features, in a bounded LRU cache keyed by the column (and
+    the correlation method). It can be given to the metrics in place of the
+    original dataframe, so evaluating many datasets with DP (e.g. for different
+    values of epsilon) only pays for the DP side.
+
+    Example::
+
+        profile = DatasetProfile(df)
+        for epsilon in [0.1, 1, 10]:
+            df_dp = dp_exponential(df, "workclass", epsilon)
+            divergence_distributions(profile, df_dp, "workclass")
+    """
+
+    def __init__(self, df: pd.DataFrame, maxsize: int = 128):
+        """Create the profile of a dataframe.
+
+        :param df: dataframe with the original data.
+        :type df: pandas dataframe
+
+        :param maxsize: maximum number of entries (encodings, frequencies and
+            correlation matrices) kept in the cache.
+        :type maxsize: int
+        """
+        if maxsize < 1:
+            raise ValueError("The size of the cache must be at least 1.")
+        self.df = df
+        self.maxsize = maxsize
+        self.categorical = set(df.select_dtypes(include=["object", "category"]).columns)
+        self._cache = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def columns(self) -> pd.Index:
+        """Columns of the original dataframe."""
+        return self.df.columns
+
+    def _cached(self, key, compute):
+        """Get an entry of the LRU cache, computing it if it is not stored."""
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return self._cache[key]
+        value = compute()
+        with self._lock:
+            self._cache[key] = value
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.maxsize:
+                self._cache.popitem(last=False)
+        return value
+
+    def encoding(self, column: str) -> typing.Tuple[pd.Index, np.ndarray]:
+        """Get the encoding of a column as integers (see :func:`encode`).
+
+        :param column: column of the original dataframe.
+        :type column: string
+
+        :return: distinct values (missing ones included) and the code of each value.
+        :rtype: tuple
+        """
+        return self._cached(("encoding", column), lambda: encode(self.df[column]))
+
+    def frequencies(self, column: str) -> np.ndarray:
+        """Get the frequencies of the codes of a column.
+
+        :param column: column of the original dataframe.
+        :type column: string
+
+        :return: number of values with each code (missing values left out).
+        :rtype: numpy array
+        """
+
+        def compute():
+            labels, codes = self.encoding(column)
+            return frequencies(labels, codes, len(labels))
+
+        return self._cached(("frequencies", column), compute)
+
+    def correlation(self, features: typing.List[str], method: str) -> np.ndarray:
+        """Get the correlation matrix of some features.
+
+        The categorical features are encoded as integers before computing it.
+
+        :param features: list of featured for calculating the correlation.
+        :type features: list
+
+        :param method: method for calculating the correlation.
+        :type method: string
+
+        :return: correlation matrix.
+        :rtype: numpy array
+        """
+
+        def compute():
+            x_original = {
+                col: (
+                    self.encoding(col)[1]
+                    if col in self.categorical
+                    else self.df[col].values
+                )
+                for col in features
+            }
+            with stage("correlation", len(self.df)):
+                return pd.DataFrame(x_original).corr(method=method).values
+
+        return self._cached(("correlation", tuple(features), method), compute)
+
+
+@instrumented(name="encode")
+def encode(values: pd.Series) -> typing.Tuple[pd.Index, np.ndarray]:
+    """Encode the values of a column as integers, in order of appearance.
+
+    :param values: values of the column.
+    :type values: pandas series
+
+    :return: distinct values (missing ones included) and the code of each value.
+    :rtype: tuple
+    """
+    codes, labels = pd.factorize(values, use_na_sentinel=False)
+    return shared_index(labels), codes
+
+
+@instrumented(name="encode_dp")
+def encode_like(labels: pd.Index, values: pd.Series) -> np.ndarray:
+    """Encode values with the codes of another column.
+
+    The values not found in the labels receive new codes after the existing ones,
+    in order of appearance.
+
+    :param labels: distinct values of the other column, as given by encode.
+    :type labels: pandas index
+
+    :param values: values to be encoded.
+    :type values: pandas series
+
+    :return: the code of each value.
+    :rtype: numpy array
+    """
+    codes = labels.get_indexer(values)
+    unseen = codes < 0
+    if unseen.any():
+        new_codes, _ = pd.factorize(np.asarray(values)[unseen], use_na_sentinel=False)
+        codes[unseen] = len(labels) + new_codes
+    return codes
+
+
+def frequencies(labels: pd.Index, codes: np.ndarray, size: int) -> np.ndarray:
+    """Count the values of an encoded column, leaving out the missing ones.
+
+    :param labels: distinct values of the column, as given by encode.
+    :type labels: pandas index
+
+    :param codes: code of each value.
+    :type codes: numpy array
+
+    :param size: number of codes counted (at least the number of labels).
+    :type size: int
+
+    :return: number of values with each code.
+    :rtype: numpy array
+    """
+    counts = np.bincount(codes, minlength=size)
+    missing = np.flatnonzero(labels.isna())
+    counts[missing] = 0
+    return counts
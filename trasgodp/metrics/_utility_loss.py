@@ -20,11 +20,13 @@ import numpy as np
 import pandas as pd
 import typing
 import scipy
-import copy
+from .._instrument import instrumented, stage
+from ._profile import DatasetProfile, encode_like, frequencies
 
 
+@instrumented
 def correlation_loss(
-    df_original: pd.DataFrame,
+    df_original: typing.Union[pd.DataFrame, DatasetProfile],
     df_dp: pd.DataFrame,
     features: typing.Optional[typing.List[str]] = None,
     method: str = "pearson",
@@ -32,13 +34,15 @@ def correlation_loss(
 ) -> float:
     """Compute utility loss (%) based on the preservation of the correlation.
 
-    :param df_original: dataframe with the original data.
-    :type df_original: pandas dataframe
+    :param df_original: dataframe with the original data, or its profile (the
+        correlation of the original data is then computed only once).
+    :type df_original: pandas dataframe or DatasetProfile
 
     :param df_dp: dataframe with the data privatized using DP.
     :type df_dp: pandas dataframe
 
-    :param features: list of featured for calculating the correlation.
+    :param features: list of featured for calculating the correlation. If None,
+        all the columns of the original dataframe.
     :type features: list
 
     :param method: method for calculating the correlation.
@@ -52,9 +56,10 @@ def correlation_loss(
     :return: utlity loss (%) comparing the difference between correlations.
     :rtype: float
     """
-    df_original = copy.deepcopy(df_original)
-    df_dp = copy.deepcopy(df_dp)
-    if not all(col in df_original.columns for col in features):
+    profile = get_profile(df_original)
+    if features is None:
+        features = list(profile.columns)
+    if not all(col in profile.columns for col in features):
         raise ValueError("Not all features are in the dataframe.")
     if not all(col in df_dp.columns for col in features):
         raise ValueError("Not all features are in the dataframe.")
@@ -62,56 +67,34 @@ def correlation_loss(
     if method not in ["pearson", "kendall", "spearman"]:
         raise ValueError("Method not allowed for calculating the correlation.")
 
-    if new_column:
-        new_features = []
-        for col in features:
-            dp_col = f"dp_{col}"
-            if dp_col in df_dp.columns:
-                new_features.append(dp_col)
-            else:
-                new_features.append(col)
-    else:
-        new_features = features
-
-    categorical_cols = df_original.select_dtypes(include=["object", "category"]).columns
-    for col in categorical_cols:
-        unique_vals = pd.concat([df_original[col], df_dp[col]]).unique()
-        mapping = {val: i for i, val in enumerate(unique_vals)}
-        df_original[col] = df_original[col].map(mapping)
-        if new_column:
-            dp_col = f"dp_{col}"
-            if dp_col in df_dp.columns:
-                df_dp[dp_col] = df_dp[dp_col].map(mapping)
-            else:
-                df_dp[col] = df_dp[col].map(mapping)
+    x_dp = {}
+    for col in features:
+        dp_col = dp_column_name(df_dp, col, new_column)
+        if col in profile.categorical:
+            labels, _ = profile.encoding(col)
+            x_dp[col] = encode_like(labels, df_dp[dp_col])
         else:
-            df_dp[col] = df_dp[col].map(mapping)
+            x_dp[col] = df_dp[dp_col].values
 
-    x_original = df_original[features]
-    x_dp = df_dp[new_features]
+    corr_original = profile.correlation(features, method)
+    with stage("correlation_dp", len(df_dp)):
+        corr_dp = pd.DataFrame(x_dp).corr(method=method).values
 
-    corr_original = x_original.corr(method=method).values
-    mask = ~np.eye(corr_original.shape[0], dtype=bool)
-    corr_original = corr_original[mask]
-    corr_dp = x_dp.corr(method=method).values
-    mask = ~np.eye(corr_dp.shape[0], dtype=bool)
-    corr_dp = corr_dp[mask]
-
-    diff = np.abs(corr_original - corr_dp)
-
-    return 100 * np.mean(diff) / np.mean(np.abs(corr_original))
+    return loss_from_correlations(corr_original, corr_dp)
 
 
+@instrumented
 def divergence_distributions(
-    df_original: pd.DataFrame,
+    df_original: typing.Union[pd.DataFrame, DatasetProfile],
     df_dp: pd.DataFrame,
     column: str,
     new_column: bool = False,
 ) -> dict:
     """Divergence between the distribution of a column in the original and DP datasets.
 
-    :param df_original: dataframe with the original data.
-    :type df_original: pandas dataframe
+    :param df_original: dataframe with the original data, or its profile (the
+        frequencies of the original data are then computed only once).
+    :type df_original: pandas dataframe or DatasetProfile
 
     :param df_dp: dataframe with the data privatized using DP.
     :type df_dp: pandas dataframe
@@ -126,9 +109,8 @@ def divergence_distributions(
     :return: dictionary with the divergence metrics (TVD, JS, KL).
     :rtype: dict
     """
-    df_original = copy.deepcopy(df_original)
-    df_dp = copy.deepcopy(df_dp)
-    if column not in df_original.keys():
+    profile = get_profile(df_original)
+    if column not in profile.columns:
         raise ValueError("Column: {column} not in the original dataframe.")
 
     if new_column:
@@ -139,11 +121,65 @@ def divergence_distributions(
     if dp_column not in df_dp.keys():
         raise ValueError("Column: {dp_column} not in the dataframe with DP.")
 
-    freq_orig = df_original[column].value_counts().sort_index()
-    freq_dp = df_dp[dp_column].value_counts().sort_index()
-    all_categories = sorted(set(freq_orig.index).union(set(freq_dp.index)))
-    freq_orig = freq_orig.reindex(all_categories, fill_value=0)
-    freq_dp = freq_dp.reindex(all_categories, fill_value=0)
+    labels, _ = profile.encoding(column)
+    dp_codes = encode_like(labels, df_dp[dp_column])
+    return divergences(labels, profile.frequencies(column), dp_codes)
+
+
+def get_profile(df_original: typing.Union[pd.DataFrame, DatasetProfile]):
+    """Get the profile of the original data (a new one for a dataframe).
+
+    :param df_original: dataframe with the original data, or its profile.
+    :type df_original: pandas dataframe or DatasetProfile
+
+    :return: profile of the original data.
+    :rtype: DatasetProfile
+    """
+    if isinstance(df_original, DatasetProfile):
+        return df_original
+    return DatasetProfile(df_original)
+
+
+def dp_column_name(df_dp: pd.DataFrame, column: str, new_column: bool) -> str:
+    """Get the name of the column with DP of an attribute.
+
+    :param df_dp: dataframe with the data privatized using DP.
+    :type df_dp: pandas dataframe
+
+    :param column: name of the attribute in the original dataframe.
+    :type column: string
+
+    :param new_column: boolean. If True, the column with dp starts with dp (if it
+        exists in the dataframe).
+    :type  new_column: boolean
+
+    :return: name of the column in the dataframe with DP.
+    :rtype: string
+    """
+    if new_column and f"dp_{column}" in df_dp.columns:
+        return f"dp_{column}"
+    return column
+
+
+@instrumented(name="divergence")
+def divergences(labels: pd.Index, freq_orig: np.ndarray, dp_codes: np.ndarray) -> dict:
+    """Divergence between the distributions of two columns with the same encoding.
+
+    :param labels: distinct values of the original column, as given by encode.
+    :type labels: pandas index
+
+    :param freq_orig: frequencies of the codes of the original column.
+    :type freq_orig: numpy array
+
+    :param dp_codes: code of each value with DP, as given by encode_like.
+    :type dp_codes: numpy array
+
+    :return: dictionary with the divergence metrics (TVD, JS, KL).
+    :rtype: dict
+    """
+    size = max(len(labels), dp_codes.max() + 1 if len(dp_codes) else 0)
+    freq_orig = np.pad(freq_orig, (0, size - len(freq_orig)))
+    freq_dp = frequencies(labels, dp_codes, size)
 
     p_orig = freq_orig / freq_orig.sum()
     q_dp = freq_dp / freq_dp.sum()
@@ -153,3 +189,25 @@ def divergence_distributions(
     kl = scipy.stats.entropy(p_orig, q_dp)
 
     return {"tvd": tvd, "js": js, "kl": kl}
+
+
+def loss_from_correlations(corr_original: np.ndarray, corr_dp: np.ndarray) -> float:
+    """Compute utility loss (%) from the correlation matrices of both datasets.
+
+    :param corr_original: correlation matrix of the original data.
+    :type corr_original: numpy array
+
+    :param corr_dp: correlation matrix of the data with DP.
+    :type corr_dp: numpy array
+
+    :return: utlity loss (%) comparing the difference between correlations.
+    :rtype: float
+    """
+    mask = ~np.eye(corr_original.shape[0], dtype=bool)
+    corr_original = corr_original[mask]
+    mask = ~np.eye(corr_dp.shape[0], dtype=bool)
+    corr_dp = corr_dp[mask]
+
+    diff = np.abs(corr_original - corr_dp)
+
+    return 100 * np.mean(diff) / np.mean(np.abs(corr_original))
@@ -0,0 +1,207 @@
+# Copyright 2026 Spanish National Research Council (CSIC)
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Clipping and noise addition shared by the numerical mechanisms."""
+
+import numpy as np
+import typing
+from .._instrument import instrumented
+from .._random import gaussian_noise, laplace_noise
+
+NOISE = {"Laplace": laplace_noise, "Gaussian": gaussian_noise}
+
+# Number of values of noise drawn at a time, so the noise only needs a small
+# buffer that is reused along the data.
+_NOISE_BLOCK = 1 << 16
+
+
+def check_data(
+    data: typing.Union[typing.List, np.ndarray], mechanism: str
+) -> typing.Tuple[np.ndarray, bool]:
+    """Check that the data can be privatized with a numerical mechanism.
+
+    :param data: data under study, with a column per attribute if 2-D.
+    :type data: list or numpy array
+
+    :param mechanism: name of the mechanism, 'Laplace' or 'Gaussian'.
+    :type mechanism: string
+
+    :return: the data as a numpy array and whether it contains integers.
+    :rtype: tuple.
+    """
+    data = np.asarray(data)
+    integer = np.issubdtype(data.dtype, np.integer)
+    if not integer and not np.issubdtype(data.dtype, np.floating):
+        raise ValueError(
+            f"Type of the column not allowed for the {mechanism} mechanism."
+        )
+    if data.ndim not in (1, 2):
+        raise ValueError("Only 1-D and 2-D arrays are supported.")
+    return data, integer
+
+
+@instrumented(name="bounds")
+def get_bounds(
+    data: np.ndarray, lower_bound=None, upper_bound=None
+) -> typing.Tuple[np.ndarray, np.ndarray]:
+    """Get the bounds of each column, computing the ones not given from the data.
+
+    :param data: data under study, with a column per attribute if 2-D.
+    :type data: numpy array
+
+    :param lower_bound: lower bound (or one per column).
+    :type lower_bound: float or array
+
+    :param upper_bound: upper bound (or one per column).
+    :type upper_bound: float or array
+
+    :return: lower and upper bounds.
+    :rtype: tuple of numpy arrays.
+    """
+    if lower_bound is None:
+        lower_bound = data.min(axis=0)
+    if upper_bound is None:
+        upper_bound = data.max(axis=0)
+    return check_bounds(lower_bound, upper_bound)
+
+
+def check_bounds(lower_bound, upper_bound) -> typing.Tuple[np.ndarray, np.ndarray]:
+    """Check that the lower bounds do not exceed the upper ones.
+
+    :param lower_bound: lower bound (or one per column).
+    :type lower_bound: float or array
+
+    :param upper_bound: upper bound (or one per column).
+    :type upper_bound: float or array
+
+    :return: lower and upper bounds.
+    :rtype: tuple of numpy arrays.
+    """
+    lower_bound, upper_bound = np.asarray(lower_bound), np.asarray(upper_bound)
+    if np.any(lower_bound > upper_bound):
+        raise ValueError("The lower bound must not exceed the upper bound.")
+    return lower_bound, upper_bound
+
+
+def integer_bounds(
+    lower_bound: np.ndarray, upper_bound: np.ndarray
+) -> typing.Tuple[np.ndarray, np.ndarray]:
+    """Get the integer values closest to the bounds that lie between them.
+
+    Rounded integer data is clipped to them, so that it stays within the bounds.
+
+    :param lower_bound: lower bound (or one per column).
+    :type lower_bound: numpy array
+
+    :param upper_bound: upper bound (or one per column).
+    :type upper_bound: numpy array
+
+    :return: lower and upper integer bounds.
+    :rtype: tuple of numpy arrays.
+    """
+    lower_bound, upper_bound = np.ceil(lower_bound), np.floor(upper_bound)
+    if np.any(lower_bound > upper_bound):
+        raise ValueError("There is no integer between the bounds.")
+    return lower_bound, upper_bound
+
+
+@instrumented(name="clip_noise")
+def clip_noise(
+    data: np.ndarray,
+    lower_bound: np.ndarray,
+    upper_bound: np.ndarray,
+    scale: np.ndarray,
+    mechanism: str,
+    integer: bool,
+    copy: bool,
+    rng: np.random.Generator,
+    noise: typing.Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """Clip the data, add noise, round it if integer and clip it again.
+
+    Every step is done in place on a single float buffer (the data itself if it
+    is a writeable float64 array and copy is False). The noise is drawn by blocks
+    of rows in a small reusable buffer, unless it is given already drawn.
+
+    :param data: data under study, with a column per attribute if 2-D.
+    :type data: numpy array
+
+    :param lower_bound: lower bound (or one per column).
+    :type lower_bound: numpy array
+
+    :param upper_bound: upper bound (or one per column).
+    :type upper_bound: numpy array
+
+    :param scale: scale of the noise (or one per column).
+    :type scale: numpy array
+
+    :param mechanism: name of the mechanism, 'Laplace' or 'Gaussian'.
+    :type mechanism: string
+
+    :param integer: whether the data contains integers, which are rounded.
+    :type integer: boolean
+
+    :param copy: if False, the data is modified in place.
+    :type copy: boolean
+
+    :param rng: random number generator.
+    :type rng: numpy Generator
+
+    :param noise: noise of scale 1 drawn beforehand, with the shape of the data.
+        If given, the random number generator is not used.
+    :type noise: numpy array
+
+    :return: data with the mechanism applied (integers keep their type, floats are
+        returned as float64 unless modified in place).
+    :rtype: numpy array.
+    """
+    if copy or data.dtype != np.float64 or not data.flags.writeable:
+        buffer = data.astype(np.float64)
+    else:
+        buffer = data
+
+    np.clip(buffer, lower_bound, upper_bound, out=buffer)
+
+    draw = NOISE[mechanism]
+    scale = np.asarray(scale, dtype=np.float64)
+    columns = buffer.shape[1] if buffer.ndim == 2 else 1
+    block = max(1, _NOISE_BLOCK // max(columns, 1))
+    scratch = np.empty((min(block, len(buffer)),) + buffer.shape[1:])
+    options = {}
+    if mechanism == "Laplace" and noise is None:
+        options["buffer"] = np.empty(scratch.size)
+    for start in range(0, len(buffer), block):
+        stop = start + block
+        rows = buffer[start:stop]
+        unit_noise = scratch[: len(rows)]
+        if noise is None:
+            draw(rng, 1.0, out=unit_noise.reshape(-1), **options)
+            unit_noise *= scale
+        else:
+            np.multiply(noise[start:stop], scale, out=unit_noise)
+        rows += unit_noise
+
+    if integer:
+        np.round(buffer, out=buffer)
+        lower_bound, upper_bound = integer_bounds(lower_bound, upper_bound)
+    np.clip(buffer, lower_bound, upper_bound, out=buffer)
+
+    if buffer is data:
+        return data
+    if not integer and copy:
+        return buffer
+    if copy:
+        return buffer.astype(data.dtype)
+    np.copyto(data, buffer, casting="unsafe")
+    return data
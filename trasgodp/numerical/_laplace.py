@@ -18,9 +18,16 @@
 
 import numpy as np
 import pandas as pd
-import copy
+import typing
+from .._accountant import spend
+from .._instrument import instrumented, stage
+from .._random import get_rng
+from .._utils import output_frame
+from ._clip import check_data, clip_noise, get_bounds
+from ._memmap import BLOCK_ROWS, clip_noise_by_blocks, get_bounds_by_blocks, open_npy
 
 
+@instrumented
 def dp_clip_laplace(
     df: pd.DataFrame,
     column: str,
@@ -28,6 +35,9 @@ def dp_clip_laplace(
     lower_bound=None,
     upper_bound=None,
     new_column=False,
+    inplace=False,
+    rng=None,
+    accountant=None,
 ) -> pd.DataFrame:
     """Apply the Laplace mechanism to a dataframe numeric column and clip the result.
 
@@ -51,43 +61,165 @@ def dp_clip_laplace(
         "dp_{column}" is created with the new values.
     :type  new_column: boolean
 
+    :param inplace: boolean, default to False. If True, the dataframe passed is
+        modified directly and no copy of it is made. If False, a copy is returned
+        (shallow if the pandas copy-on-write mode is enabled).
+    :type  inplace: boolean
+
+    :param rng: random number generator (numpy Generator, see
+        :func:`trasgodp.make_rng`) or seed used to create it. If None, it is
+        created from the global numpy random state.
+    :type rng: numpy Generator, int or None
+
+    :param accountant: accountant to which the privacy budget spent is reported.
+        If None, the one active in a with block, if any.
+    :type accountant: trasgodp.BudgetAccountant
+
     :return: dataframe with the column transformed applying the mechanism.
     :rtype: pandas dataframe.
     """
-    df = copy.deepcopy(df)
+    df = output_frame(df, inplace)
     if column not in df.keys():
         raise ValueError("Column: {column} not in the dataframe.")
 
     if epsilon <= 0:
         raise ValueError("The privacy budget must be greater than 0.")
 
-    if np.issubdtype(df[column].dtype, np.integer):
-        data = df[column].astype(int)
-    elif np.issubdtype(df[column].dtype, np.floating):
-        data = df[column].astype(float)
-    else:
-        raise ValueError("Type of the column not allowed for the Laplace mechanism.")
+    dp_column = dp_clip_laplace_array(
+        df[column].to_numpy(), epsilon, lower_bound, upper_bound, rng=rng
+    )
 
-    if lower_bound is None:
-        lower_bound = min(data.values)
-    if upper_bound is None:
-        upper_bound = max(data.values)
+    spend(accountant, epsilon, column=column, mechanism="laplace")
 
-    clipped = data.clip(lower_bound, upper_bound)
+    with stage("assign", len(df)):
+        if new_column:
+            df[f"dp_{column}"] = dp_column
+        else:
+            df[column] = dp_column
 
-    sensitivity = upper_bound - lower_bound
-    scale = sensitivity / epsilon
-    noise = np.random.laplace(0, scale, size=len(clipped))
+    return df
 
-    dp_column = clipped + noise
 
-    if np.issubdtype(df[column].dtype, np.integer):
-        dp_column = round(dp_column, 0).astype(int)
+@instrumented
+def dp_clip_laplace_array(
+    data: typing.Union[typing.List, np.ndarray],
+    epsilon,
+    lower_bound=None,
+    upper_bound=None,
+    copy=True,
+    rng=None,
+) -> np.ndarray:
+    """Apply the Laplace mechanism to a numeric array and clip the result.
 
-    dp_column = np.clip(dp_column, lower_bound, upper_bound)
-    if new_column:
-        df[f"dp_{column}"] = dp_column
-    else:
-        df[column] = dp_column
+    The data is clipped, the noise is added, the values are rounded (if integer)
+    and clipped again in place on a single buffer.
 
-    return df
+    :param data: data under study. If 2-D, each column is an attribute.
+    :type data: list or numpy array
+
+    :param epsilon: privacy budget (or one per column).
+    :type epsilon: float or array
+
+    :param lower_bound: lower bound for clipping and calculating the sensitivity
+        (or one per column). If None, the minimum of each column.
+    :type lower_bound: float or array
+
+    :param upper_bound: upper bound for clipping and calculating the sensitivity
+        (or one per column). If None, the maximum of each column.
+    :type upper_bound: float or array
+
+    :param copy: boolean, default to True. If False, the data is modified in
+        place: a float64 array is used directly as the buffer of the mechanism,
+        and other types are overwritten with the result.
+    :type copy: boolean
+
+    :param rng: random number generator (numpy Generator, see
+        :func:`trasgodp.make_rng`) or seed used to create it. If None, it is
+        created from the global numpy random state.
+    :type rng: numpy Generator, int or None
+
+    :return: array with data transformed applying the mechanism.
+    :rtype: numpy array.
+    """
+    data, integer = check_data(data, "Laplace")
+
+    epsilon = np.asarray(epsilon, dtype=float)
+    if np.any(epsilon <= 0):
+        raise ValueError("The privacy budget must be greater than 0.")
+
+    lower_bound, upper_bound = get_bounds(data, lower_bound, upper_bound)
+    scale = (upper_bound - lower_bound) / epsilon
+
+    return clip_noise(
+        data, lower_bound, upper_bound, scale, "Laplace", integer, copy, get_rng(rng)
+    )
+
+
+@instrumented
+def dp_clip_laplace_memmap(
+    input_path: str,
+    epsilon,
+    lower_bound=None,
+    upper_bound=None,
+    output_path=None,
+    block_rows=BLOCK_ROWS,
+    rng=None,
+) -> np.memmap:
+    """Apply the Laplace mechanism to a numeric array stored in a .npy file.
+
+    The file is memory-mapped and privatized by blocks of rows, so arrays larger
+    than the memory can be processed with sequential reads and writes.
+
+    :param input_path: path of the .npy file with the data under study. If 2-D,
+        each column is an attribute.
+    :type input_path: string
+
+    :param epsilon: privacy budget (or one per column).
+    :type epsilon: float or array
+
+    :param lower_bound: lower bound for clipping and calculating the sensitivity
+        (or one per column). If None, the minimum of each column, obtained in a
+        first pass over the file.
+    :type lower_bound: float or array
+
+    :param upper_bound: upper bound for clipping and calculating the sensitivity
+        (or one per column). If None, the maximum of each column, obtained in a
+        first pass over the file.
+    :type upper_bound: float or array
+
+    :param output_path: path of the .npy file where the result is written. If
+        None, the input file is modified in place.
+    :type output_path: string
+
+    :param block_rows: number of rows read, privatized and written at a time.
+    :type block_rows: int
+
+    :param rng: random number generator (numpy Generator, see
+        :func:`trasgodp.make_rng`) or seed used to create it. If None, it is
+        created from the global numpy random state.
+    :type rng: numpy Generator, int or None
+
+    :return: memory-mapped array with the data transformed applying the mechanism.
+    :rtype: numpy memmap.
+    """
+    epsilon = np.asarray(epsilon, dtype=float)
+    if np.any(epsilon <= 0):
+        raise ValueError("The privacy budget must be greater than 0.")
+
+    data, out, integer = open_npy(input_path, output_path, "Laplace")
+    lower_bound, upper_bound = get_bounds_by_blocks(
+        data, lower_bound, upper_bound, block_rows
+    )
+    scale = (upper_bound - lower_bound) / epsilon
+
+    return clip_noise_by_blocks(
+        data,
+        out,
+        lower_bound,
+        upper_bound,
+        scale,
+        "Laplace",
+        integer,
+        block_rows,
+        get_rng(rng),
+    )
@@ -0,0 +1,218 @@
+# Copyright 2026 Spanish National Research Council (CSIC)
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Numerical mechanism with its parameters computed once."""
+
+import numpy as np
+import typing
+from .._instrument import instrumented
+from .._parameters import gaussian_sigma
+from .._random import get_rng
+from ._clip import check_bounds, check_data, clip_noise, get_bounds
+
+_NOISE_NAMES = {"laplace": "Laplace", "gaussian": "Gaussian"}
+
+
+class NumericMechanism:
+    """Laplace or Gaussian mechanism with fixed bounds, applied to many batches.
+
+    The bounds, the sensitivity and the scale of the noise are computed once, so
+    each batch is only clipped, noised, rounded and clipped again, without
+    scanning it for its bounds. The object can be pickled (e.g. to send it to
+    other processes); use :meth:`spawn` so that each copy draws independent noise.
+
+    Example::
+
+        age = NumericMechanism("laplace", epsilon, lower_bound=17, upper_bound=90)
+        for chunk in chunks:
+            chunk["age"] = age(chunk["age"].to_numpy())
+    """
+
+    def __init__(
+        self,
+        mechanism: str,
+        epsilon,
+        lower_bound,
+        upper_bound,
+        delta=1e-3,
+        dtype=None,
+        rng=None,
+        calibration="classic",
+    ):
+        """Compute the parameters of the mechanism.
+
+        :param mechanism: 'laplace' or 'gaussian'.
+        :type mechanism: string
+
+        :param epsilon: privacy budget (or one per column).
+        :type epsilon: float or array
+
+        :param lower_bound: lower bound for clipping and calculating the
+            sensitivity (or one per column).
+        :type lower_bound: float or array
+
+        :param upper_bound: upper bound for clipping and calculating the
+            sensitivity (or one per column).
+        :type upper_bound: float or array
+
+        :param delta: probability of exceeding the privacy budget (or one per
+            column), only used by the Gaussian mechanism.
+        :type delta: float or array
+
+        :param dtype: type of the result. Integer types are rounded. If None, the
+            type of each batch if integer, and float64 otherwise.
+        :type dtype: numpy dtype
+
+        :param rng: random number generator (numpy Generator, see
+            :func:`trasgodp.make_rng`) or seed used to create it, bound to the
+            mechanism. If None, it is created from the global numpy random state.
+        :type rng: numpy Generator, int or None
+
+        :param calibration: 'classic' or 'analytic' noise of the Gaussian
+            mechanism (see :func:`dp_clip_gaussian`).
+        :type calibration: string
+        """
+        if mechanism not in _NOISE_NAMES:
+            raise ValueError(f"Mechanism not allowed: {mechanism}.")
+
+        epsilon = np.asarray(epsilon, dtype=float)
+        if np.any(epsilon <= 0):
+            raise ValueError("The privacy budget must be greater than 0.")
+
+        lower_bound, upper_bound = check_bounds(
+            np.asarray(lower_bound, dtype=float), np.asarray(upper_bound, dtype=float)
+        )
+
+        self.mechanism = mechanism
+        self.epsilon = epsilon
+        self.lower_bound = lower_bound
+        self.upper_bound = upper_bound
+        self.sensitivity = upper_bound - lower_bound
+        if mechanism == "laplace":
+            self.delta = None
+            self.scale = self.sensitivity / epsilon
+        else:
+            delta = np.asarray(delta, dtype=float)
+            if np.any(delta <= 0) or np.any(delta >= 1):
+                raise ValueError("The value of delta must be between 0 and 1.")
+            self.delta = delta
+            self.scale = gaussian_sigma(self.sensitivity, epsilon, delta, calibration)
+        self.dtype = None if dtype is None else np.dtype(dtype)
+        self.rng = get_rng(rng)
+
+    @classmethod
+    def from_data(
+        cls,
+        data: typing.Union[typing.List, np.ndarray],
+        mechanism: str,
+        epsilon,
+        lower_bound=None,
+        upper_bound=None,
+        **params,
+    ) -> "NumericMechanism":
+        """Create the mechanism taking the bounds not given from the data.
+
+        :param data: data from which the bounds are obtained, with a column per
+            attribute if 2-D.
+        :type data: list or numpy array
+
+        :param mechanism: 'laplace' or 'gaussian'.
+        :type mechanism: string
+
+        :param epsilon: privacy budget (or one per column).
+        :type epsilon: float or array
+
+        :param lower_bound: lower bound (or one per column). If None, the minimum.
+        :type lower_bound: float or array
+
+        :param upper_bound: upper bound (or one per column). If None, the maximum.
+        :type upper_bound: float or array
+
+        :param params: rest of arguments of the mechanism (e.g. delta, dtype, rng).
+        :type params: dict
+
+        :return: mechanism with the bounds fixed.
+        :rtype: NumericMechanism
+        """
+        data, _ = check_data(data, _NOISE_NAMES.get(mechanism, mechanism))
+        lower_bound, upper_bound = get_bounds(data, lower_bound, upper_bound)
+        return cls(mechanism, epsilon, lower_bound, upper_bound, **params)
+
+    @instrumented
+    def __call__(
+        self, data: typing.Union[typing.List, np.ndarray], copy=True
+    ) -> np.ndarray:
+        """Apply the mechanism to a batch.
+
+        :param data: batch of data, with a column per attribute if 2-D.
+        :type data: list or numpy array
+
+        :param copy: boolean, default to True. If False, the data is modified in
+            place when its type allows it.
+        :type copy: boolean
+
+        :return: batch with the mechanism applied.
+        :rtype: numpy array.
+        """
+        name = _NOISE_NAMES[self.mechanism]
+        data, integer = check_data(data, name)
+        if self.dtype is None:
+            return clip_noise(
+                data,
+                self.lower_bound,
+                self.upper_bound,
+                self.scale,
+                name,
+                integer,
+                copy,
+                self.rng,
+            )
+
+        integer = np.issubdtype(self.dtype, np.integer)
+        result = clip_noise(
+            data,
+            self.lower_bound,
+            self.upper_bound,
+            self.scale,
+            name,
+            integer,
+            copy or data.dtype != self.dtype,
+            self.rng,
+        )
+        return result.astype(self.dtype, copy=False)
+
+    def spawn(self, n: int) -> typing.List["NumericMechanism"]:
+        """Copy the mechanism with independent random generators.
+
+        :param n: number of copies.
+        :type n: int
+
+        :return: copies of the mechanism, e.g. one per worker.
+        :rtype: list
+        """
+        copies = []
+        for rng in self.rng.spawn(n):
+            mechanism = object.__new__(NumericMechanism)
+            mechanism.__dict__.update(self.__dict__)
+            mechanism.rng = rng
+            copies.append(mechanism)
+        return copies
+
+    def __repr__(self) -> str:
+        """Describe the parameters of the mechanism."""
+        return (
+            f"NumericMechanism({self.mechanism!r}, epsilon={self.epsilon}, "
+            f"lower_bound={self.lower_bound}, upper_bound={self.upper_bound}, "
+            f"scale={self.scale})"
+        )
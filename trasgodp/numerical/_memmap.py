@@ -0,0 +1,169 @@
+# Copyright 2026 Spanish National Research Council (CSIC)
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Privatization of numeric arrays stored in .npy files by blocks of rows."""
+
+import numpy as np
+import typing
+from .._instrument import instrumented
+from ._clip import check_bounds, check_data, clip_noise
+
+# Default number of rows read, privatized and written at a time.
+BLOCK_ROWS = 1 << 20
+
+
+def open_npy(
+    input_path: str, output_path: typing.Optional[str], mechanism: str
+) -> typing.Tuple[np.ndarray, np.ndarray, bool]:
+    """Open the input and output .npy files as memory-mapped arrays.
+
+    :param input_path: path of the .npy file with the data under study.
+    :type input_path: string
+
+    :param output_path: path of the .npy file where the result is written. If
+        None, the input file is modified in place.
+    :type output_path: string
+
+    :param mechanism: name of the mechanism, 'Laplace' or 'Gaussian'.
+    :type mechanism: string
+
+    :return: input and output memory-mapped arrays and whether they contain
+        integers.
+    :rtype: tuple.
+    """
+    data = np.load(input_path, mmap_mode="r" if output_path else "r+")
+    if not isinstance(data, np.memmap):
+        raise ValueError("The file must contain a single numpy array (.npy).")
+    check_data(data, mechanism)
+    integer = np.issubdtype(data.dtype, np.integer)
+
+    if output_path is None:
+        return data, data, integer
+    out = np.lib.format.open_memmap(
+        output_path,
+        mode="w+",
+        dtype=data.dtype,
+        shape=data.shape,
+        fortran_order=data.flags.f_contiguous and not data.flags.c_contiguous,
+    )
+    return data, out, integer
+
+
+@instrumented(name="bounds")
+def get_bounds_by_blocks(
+    data: np.ndarray, lower_bound=None, upper_bound=None, block_rows=BLOCK_ROWS
+) -> typing.Tuple[np.ndarray, np.ndarray]:
+    """Get the bounds of each column reading the data by blocks of rows.
+
+    :param data: data under study, with a column per attribute if 2-D.
+    :type data: numpy array
+
+    :param lower_bound: lower bound (or one per column). If None, the minimum.
+    :type lower_bound: float or array
+
+    :param upper_bound: upper bound (or one per column). If None, the maximum.
+    :type upper_bound: float or array
+
+    :param block_rows: number of rows read at a time.
+    :type block_rows: int
+
+    :return: lower and upper bounds.
+    :rtype: tuple of numpy arrays.
+    """
+    minimum = []
+    maximum = []
+    if lower_bound is None or upper_bound is None:
+        for start in range(0, len(data), block_rows):
+            stop = start + block_rows
+            block = data[start:stop]
+            minimum.append(block.min(axis=0))
+            maximum.append(block.max(axis=0))
+    if lower_bound is None:
+        lower_bound = np.min(minimum, axis=0)
+    if upper_bound is None:
+        upper_bound = np.max(maximum, axis=0)
+    return check_bounds(lower_bound, upper_bound)
+
+
+@instrumented(name="blocks")
+def clip_noise_by_blocks(
+    data: np.ndarray,
+    out: np.ndarray,
+    lower_bound: np.ndarray,
+    upper_bound: np.ndarray,
+    scale: np.ndarray,
+    mechanism: str,
+    integer: bool,
+    block_rows: int,
+    rng: np.random.Generator,
+) -> np.ndarray:
+    """Apply a numerical mechanism by blocks of rows, writing them in out.
+
+    :param data: data under study, with a column per attribute if 2-D.
+    :type data: numpy array
+
+    :param out: array where the result is written (it can be data).
+    :type out: numpy array
+
+    :param lower_bound: lower bound (or one per column).
+    :type lower_bound: numpy array
+
+    :param upper_bound: upper bound (or one per column).
+    :type upper_bound: numpy array
+
+    :param scale: scale of the noise (or one per column).
+    :type scale: numpy array
+
+    :param mechanism: name of the mechanism, 'Laplace' or 'Gaussian'.
+    :type mechanism: string
+
+    :param integer: whether the data contains integers, which are rounded.
+    :type integer: boolean
+
+    :param block_rows: number of rows processed at a time.
+    :type block_rows: int
+
+    :param rng: random number generator.
+    :type rng: numpy Generator
+
+    :return: out, with the mechanism applied.
+    :rtype: numpy array.
+    """
+    for start in range(0, len(data), block_rows):
+        stop = start + block_rows
+        if out is data:
+            clip_noise(
+                data[start:stop],
+                lower_bound,
+                upper_bound,
+                scale,
+                mechanism,
+                integer,
+                False,
+                rng,
+            )
+        else:
+            out[start:stop] = clip_noise(
+                data[start:stop],
+                lower_bound,
+                upper_bound,
+                scale,
+                mechanism,
+                integer,
+                True,
+                rng,
+            )
+    if isinstance(out, np.memmap):
+        out.flush()
+    return out
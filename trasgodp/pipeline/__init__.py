@@ -0,0 +1,36 @@
+# Copyright 2026 Spanish National Research Council (CSIC)
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Privatization of several columns of a dataset in one pass."""
+
+from ._arrow import ARRAY_MECHANISMS, apply_arrow
+from ._domains import fix_domains
+from ._parallel import parallel_apply
+from ._plan import MECHANISMS, PrivatizationPlan
+from ._service import PrivatizationService
+from ._stream import privatize_csv, privatize_parquet
+from ._sweep import sweep
+
+__all__ = [
+    "ARRAY_MECHANISMS",
+    "MECHANISMS",
+    "PrivatizationPlan",
+    "PrivatizationService",
+    "apply_arrow",
+    "fix_domains",
+    "parallel_apply",
+    "privatize_csv",
+    "privatize_parquet",
+    "sweep",
+]
@@ -0,0 +1,190 @@
+# Copyright 2026 Spanish National Research Council (CSIC)
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Privatization of Apache Arrow data without converting it to pandas."""
+
+import numpy as np
+import pandas as pd
+import inspect
+import time
+import typing
+from .. import categorical, numerical
+from .._accountant import suspended
+from .._random import get_rng
+from ._domains import _missing_domains, fix_domains
+from ._plan import NUMERICAL_MECHANISMS, PrivatizationPlan
+
+ARRAY_MECHANISMS = {
+    "laplace": numerical.dp_clip_laplace_array,
+    "gaussian": numerical.dp_clip_gaussian_array,
+    "exponential": categorical.dp_exponential_array,
+    "randomized_response_binary": categorical.dp_randomized_response_binary_array,
+    "randomized_response_kary": categorical.dp_randomized_response_kary_array,
+}
+
+
+def apply_arrow(
+    plan: PrivatizationPlan, data, new_column=False, rng=None, accountant=None
+):
+    """Apply a privatization plan to a pyarrow Table or RecordBatch.
+
+    Requires pyarrow. The numerical columns are read through zero-copy numpy
+    views, and the categorical ones are processed on the indices of their
+    dictionary encoding (string columns are dictionary encoded by Arrow), so no
+    pandas object column is built. The categorical columns with DP are returned
+    as dictionary arrays. The bounds and the categories not given in the plan
+    are computed over the whole Table, as by :meth:`PrivatizationPlan.apply`,
+    whatever its batches. The time spent in each column is stored in the
+    attribute ``timings`` of the plan.
+
+    :param plan: plan with the mechanism applied to each column.
+    :type plan: PrivatizationPlan
+
+    :param data: data under study.
+    :type data: pyarrow Table or RecordBatch
+
+    :param new_column: boolean, default to False. If False, the new values
+        obtained with the mechanims applied are stored in the same column. If
+        True, a new column 'dp_{column}' is created for each column.
+    :type  new_column: boolean
+
+    :param rng: random number generator (numpy Generator) or seed used to
+        create it, shared by all the columns. If None, it is created from the
+        global numpy random state.
+    :type rng: numpy Generator, int or None
+
+    :param accountant: accountant to which the privacy budget spent is reported,
+        once for all the batches. If None, the one active in a with block, if any.
+    :type accountant: trasgodp.BudgetAccountant
+
+    :return: data with the columns transformed applying the mechanisms.
+    :rtype: pyarrow Table or RecordBatch
+    """
+    pa = _import_pyarrow()
+    rng = get_rng(rng)
+    if isinstance(data, pa.Table):
+        _validate(plan, data.schema)
+        # The bounds and the categories not given in the plan are computed over
+        # the whole table, as by the plan, and not over each of its batches.
+        fixed = plan
+        missing = _missing_domains(plan)
+        if missing:
+            values = {column: column_values(data.column(column)) for column in missing}
+            fixed = fix_domains(plan, [pd.DataFrame(values)])
+        plan.spend(accountant)
+        batches = []
+        timings = {}
+        with suspended():
+            for batch in data.to_batches():
+                batches.append(apply_arrow(fixed, batch, new_column, rng))
+                for column, seconds in fixed.timings.items():
+                    timings[column] = timings.get(column, 0) + seconds
+        plan.timings = timings
+        if not batches:
+            return data
+        return pa.Table.from_batches(batches)
+
+    if not isinstance(data, pa.RecordBatch):
+        raise ValueError("Only pyarrow Tables and RecordBatches are supported.")
+    _validate(plan, data.schema)
+    plan.spend(accountant)
+
+    names = list(data.schema.names)
+    arrays = list(data.columns)
+    plan.timings = {}
+    for column, spec in plan.columns.items():
+        params = dict(spec)
+        mechanism = ARRAY_MECHANISMS[params.pop("mechanism")]
+        epsilon = params.pop("epsilon")
+        allowed = inspect.signature(mechanism).parameters
+        params = {key: value for key, value in params.items() if key in allowed}
+
+        start = time.perf_counter()
+        values = column_values(data.column(column))
+        dp_array = to_arrow(mechanism(values, epsilon, rng=rng, **params))
+        if new_column:
+            names.append(f"dp_{column}")
+            arrays.append(dp_array)
+        else:
+            arrays[names.index(column)] = dp_array
+        plan.timings[column] = time.perf_counter() - start
+
+    return pa.RecordBatch.from_arrays(arrays, names=names)
+
+
+def column_values(array) -> typing.Union[np.ndarray, pd.Categorical]:
+    """Get the values of an Arrow array for the mechanisms.
+
+    :param array: column of Arrow data.
+    :type array: pyarrow Array
+
+    :return: a numpy view of a numerical column (a copy if it has nulls), or a
+        pandas Categorical with the dictionary encoding of the rest.
+    :rtype: numpy array or pandas Categorical.
+    """
+    pa = _import_pyarrow()
+    if isinstance(array, pa.ChunkedArray):
+        array = array.combine_chunks()
+
+    if pa.types.is_integer(array.type) or pa.types.is_floating(array.type):
+        return array.to_numpy(zero_copy_only=array.null_count == 0)
+
+    if not pa.types.is_dictionary(array.type):
+        array = array.dictionary_encode()
+    codes = array.indices.fill_null(-1).to_numpy(zero_copy_only=False)
+    dictionary = array.dictionary.to_numpy(zero_copy_only=False)
+    return pd.Categorical.from_codes(codes, dtype=pd.CategoricalDtype(dictionary))
+
+
+def to_arrow(values):
+    """Get an Arrow array with the values obtained with a mechanism.
+
+    :param values: values of the column with DP.
+    :type values: numpy array or pandas Categorical
+
+    :return: the values, dictionary encoded if they are a Categorical.
+    :rtype: pyarrow Array
+    """
+    pa = _import_pyarrow()
+    if not isinstance(values, pd.Categorical):
+        return pa.array(values)
+    codes = values.codes
+    mask = codes < 0
+    indices = pa.array(codes, mask=mask if mask.any() else None)
+    dictionary = pa.array(np.asarray(values.categories))
+    return pa.DictionaryArray.from_arrays(indices, dictionary)
+
+
+def _validate(plan, schema):
+    """Check that a plan can be applied to Arrow data with some schema."""
+    pa = _import_pyarrow()
+    for column, spec in plan.columns.items():
+        if column not in schema.names:
+            raise ValueError(f"Column: {column} not in the data.")
+        dtype = schema.field(column).type
+        numeric = pa.types.is_integer(dtype) or pa.types.is_floating(dtype)
+        if spec["mechanism"] in NUMERICAL_MECHANISMS and not numeric:
+            raise ValueError(
+                f"Type of the column {column} not allowed for the "
+                f"{spec['mechanism']} mechanism."
+            )
+
+
+def _import_pyarrow():
+    """Import pyarrow, which is an optional dependency."""
+    try:
+        import pyarrow as pa
+    except ImportError as e:
+        raise ImportError("pyarrow is required for processing Arrow data.") from e
+    return pa
@@ -0,0 +1,95 @@
+# Copyright 2026 Spanish National Research Council (CSIC)
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Domains of the columns of a plan: the bounds and the categories."""
+
+import numpy as np
+import pandas as pd
+import typing
+from ..categorical import CategoryEncoder
+from ._plan import NUMERICAL_MECHANISMS, PrivatizationPlan
+
+
+def fix_domains(
+    plan: PrivatizationPlan, chunks: typing.Iterable[pd.DataFrame]
+) -> PrivatizationPlan:
+    """Get a plan with every bound and set of categories fixed.
+
+    The bounds of the numerical columns and the categories of the categorical
+    ones that are not given in the plan are computed over all the chunks, the same
+    values obtained by the mechanisms applied to the whole dataset at once.
+
+    :param plan: plan with the mechanism applied to each column.
+    :type plan: PrivatizationPlan
+
+    :param chunks: parts of the dataset.
+    :type chunks: iterable of pandas dataframes
+
+    :return: new plan with the bounds and the categories of every column.
+    :rtype: PrivatizationPlan
+    """
+    missing = _missing_domains(plan)
+    lower = {}
+    upper = {}
+    categories = {}
+    for chunk in chunks:
+        if len(chunk) == 0:
+            continue
+        for column in missing:
+            values = chunk[column].values
+            if plan.columns[column]["mechanism"] in NUMERICAL_MECHANISMS:
+                lower[column] = min(lower.get(column, values.min()), values.min())
+                upper[column] = max(upper.get(column, values.max()), values.max())
+            else:
+                # The categories are merged chunk by chunk, so only the distinct
+                # values seen so far are kept.
+                seen = categories.get(column, values[:0])
+                categories[column] = pd.unique(
+                    np.concatenate([seen, pd.unique(values)])
+                )
+
+    fixed = PrivatizationPlan()
+    for column, spec in plan.columns.items():
+        spec = dict(spec)
+        if spec["mechanism"] in NUMERICAL_MECHANISMS:
+            if spec.get("lower_bound") is None and column in lower:
+                spec["lower_bound"] = lower[column]
+            if spec.get("upper_bound") is None and column in upper:
+                spec["upper_bound"] = upper[column]
+        elif spec.get("categories") is None and column in categories:
+            spec["categories"] = CategoryEncoder(_categories(categories[column]))
+        fixed.add(column, **spec)
+    return fixed
+
+
+def _categories(values):
+    """Sort the distinct values of a column as for the whole dataset.
+
+    As when the whole column is encoded at once, missing values are one more
+    category, placed after the rest.
+    """
+    _, categories = pd.factorize(values, sort=True, use_na_sentinel=False)
+    return np.asarray(categories)
+
+
+def _missing_domains(plan):
+    """Get the columns of a plan without bounds or categories."""
+    missing = []
+    for column, spec in plan.columns.items():
+        if spec["mechanism"] in NUMERICAL_MECHANISMS:
+            if spec.get("lower_bound") is None or spec.get("upper_bound") is None:
+                missing.append(column)
+        elif spec.get("categories") is None:
+            missing.append(column)
+    return missing
@@ -0,0 +1,137 @@
+# Copyright 2026 Spanish National Research Council (CSIC)
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Parallel privatization of a dataframe by shards of rows."""
+
+import numpy as np
+import pandas as pd
+import concurrent.futures
+import os
+from .._accountant import suspended
+from .._random import BIT_GENERATORS, make_rng
+from .._utils import output_frame
+from ._domains import fix_domains
+from ._plan import PrivatizationPlan
+
+EXECUTORS = {
+    "process": concurrent.futures.ProcessPoolExecutor,
+    "thread": concurrent.futures.ThreadPoolExecutor,
+}
+
+
+def parallel_apply(
+    plan: PrivatizationPlan,
+    df: pd.DataFrame,
+    n_workers=None,
+    n_shards=None,
+    seed=None,
+    executor="process",
+    bit_generator="PCG64",
+    new_column=False,
+    inplace=False,
+    accountant=None,
+) -> pd.DataFrame:
+    """Apply a privatization plan in parallel to shards of rows of a dataframe.
+
+    Each record receives independent noise, so the rows are split in shards that
+    are privatized by different workers. The bounds and categories not given in
+    the plan are computed once over the whole dataframe, and each shard uses its
+    own generator spawned from a numpy SeedSequence, so the result only depends
+    on the seed and the number of shards (not on the workers or the executor)
+    and the random streams of the shards are independent.
+
+    :param plan: plan with the mechanism applied to each column.
+    :type plan: PrivatizationPlan
+
+    :param df: dataframe with the data under study.
+    :type df: pandas dataframe
+
+    :param n_workers: number of workers. If None, the number of CPUs.
+    :type n_workers: int
+
+    :param n_shards: number of shards of rows. If None, the number of workers.
+    :type n_shards: int
+
+    :param seed: seed of the SeedSequence from which the generators of the
+        shards are spawned. If None, fresh entropy is used.
+    :type seed: int, numpy SeedSequence or None
+
+    :param executor: 'process' for a pool of processes, or 'thread' for a pool of
+        threads (the sampling and the arithmetic of numpy release the GIL).
+    :type executor: string
+
+    :param bit_generator: bit generator of the generators of the shards (see
+        :func:`trasgodp.make_rng`).
+    :type bit_generator: string
+
+    :param new_column: boolean, default to False. If False, the new values
+        obtained with the mechanims applied are stored in the same column. If
+        True, a new column 'dp_{column}' is created for each column.
+    :type  new_column: boolean
+
+    :param inplace: boolean, default to False. If True, the dataframe passed is
+        modified directly and no copy of it is made. If False, a copy is
+        returned (shallow if the pandas copy-on-write mode is enabled).
+    :type  inplace: boolean
+
+    :param accountant: accountant to which the privacy budget spent is reported,
+        once for all the shards. If None, the one active in a with block, if any.
+    :type accountant: trasgodp.BudgetAccountant
+
+    :return: dataframe with the columns transformed applying the mechanisms.
+    :rtype: pandas dataframe.
+    """
+    if executor not in EXECUTORS:
+        raise ValueError(f"Executor not allowed: {executor}.")
+    if bit_generator not in BIT_GENERATORS:
+        raise ValueError(f"Bit generator not allowed: {bit_generator}.")
+
+    plan.validate(df)
+    if n_workers is None:
+        n_workers = os.cpu_count() or 1
+    if n_shards is None:
+        n_shards = n_workers
+    n_shards = max(1, min(n_shards, len(df)))
+
+    columns = list(plan.columns)
+    plan = fix_domains(plan, [df[columns]])
+    limits = np.linspace(0, len(df), n_shards + 1).astype(int)
+    shards = [df[columns].iloc[a:b] for a, b in zip(limits[:-1], limits[1:])]
+    seeds = np.random.SeedSequence(seed).spawn(n_shards)
+    plan.spend(accountant)
+
+    with EXECUTORS[executor](max_workers=n_workers) as pool:
+        results = list(
+            pool.map(
+                _apply_shard,
+                [plan] * n_shards,
+                shards,
+                seeds,
+                [bit_generator] * n_shards,
+                [new_column] * n_shards,
+            )
+        )
+
+    df = output_frame(df, inplace)
+    dp_columns = [f"dp_{c}" for c in columns] if new_column else columns
+    for column in dp_columns:
+        df[column] = pd.concat([shard[column] for shard in results]).values
+    return df
+
+
+def _apply_shard(plan, shard, seed, bit_generator, new_column):
+    """Apply a plan to a shard of rows with its own random generator."""
+    rng = make_rng(seed, bit_generator)
+    with suspended():
+        return plan.apply(shard, new_column=new_column, rng=rng)
@@ -0,0 +1,249 @@
+# Copyright 2026 Spanish National Research Council (CSIC)
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Declarative plan with the mechanism applied to each column of a dataframe."""
+
+import numpy as np
+import pandas as pd
+import inspect
+import time
+from .. import categorical, numerical
+from .._accountant import get_accountant, suspended
+from .._random import get_rng
+from .._utils import output_frame
+
+MECHANISMS = {
+    "laplace": numerical.dp_clip_laplace,
+    "gaussian": numerical.dp_clip_gaussian,
+    "exponential": categorical.dp_exponential,
+    "randomized_response_binary": categorical.dp_randomized_response_binary,
+    "randomized_response_kary": categorical.dp_randomized_response_kary,
+}
+
+NUMERICAL_MECHANISMS = ("laplace", "gaussian")
+CATEGORICAL_MECHANISMS = (
+    "exponential",
+    "randomized_response_binary",
+    "randomized_response_kary",
+)
+
+# Arguments handled by the plan itself instead of by each column specification.
+_PLAN_ARGUMENTS = (
+    "df",
+    "column",
+    "epsilon",
+    "new_column",
+    "inplace",
+    "rng",
+    "accountant",
+)
+
+
+class PrivatizationPlan:
+    """Plan mapping each column of a dataframe to the mechanism applied to it.
+
+    The plan is validated once and then applied to a dataframe copying it at most
+    once, with every mechanism writing its column in that same copy.
+
+    Example::
+
+        plan = PrivatizationPlan(
+            {
+                "age": {"mechanism": "laplace", "epsilon": 1, "lower_bound": 17},
+                "workclass": {"mechanism": "exponential", "epsilon": 2},
+            }
+        )
+        df_dp = plan.apply(df)
+        plan.timings  # seconds spent in each column
+    """
+
+    def __init__(self, columns: dict = None):
+        """Create the plan.
+
+        :param columns: dictionary mapping each column to its specification: a
+            dictionary with the name of the mechanism (one of the keys of
+            ``MECHANISMS``), the privacy budget (epsilon) and, optionally, the rest of
+            arguments of the mechanism (e.g. delta, lower_bound, upper_bound,
+            positive_label).
+        :type columns: dict
+        """
+        self.columns = {}
+        self.timings = {}
+        for column, spec in (columns or {}).items():
+            self.add(column, **spec)
+
+    def add(self, column: str, mechanism: str, epsilon: float, **params):
+        """Add (or replace) the mechanism to be applied to a column.
+
+        :param column: column to which the DP mechanism will be applied.
+        :type column: string
+
+        :param mechanism: name of the mechanism, one of the keys of ``MECHANISMS``.
+        :type mechanism: string
+
+        :param epsilon: privacy budget.
+        :type epsilon: float
+
+        :param params: rest of arguments of the mechanism.
+        :type params: dict
+
+        :return: the plan, so several calls can be chained.
+        :rtype: PrivatizationPlan
+        """
+        if mechanism not in MECHANISMS:
+            raise ValueError(f"Mechanism not allowed: {mechanism}.")
+
+        if epsilon <= 0:
+            raise ValueError("The privacy budget must be greater than 0.")
+
+        allowed = inspect.signature(MECHANISMS[mechanism]).parameters
+        for param in params:
+            if param not in allowed or param in _PLAN_ARGUMENTS:
+                raise ValueError(
+                    f"Argument {param} not allowed for the {mechanism} mechanism."
+                )
+
+        lower_bound = params.get("lower_bound")
+        upper_bound = params.get("upper_bound")
+        if lower_bound is not None and upper_bound is not None:
+            if lower_bound > upper_bound:
+                raise ValueError("The lower bound must not exceed the upper bound.")
+
+        delta = params.get("delta")
+        if delta is not None and (delta <= 0 or delta >= 1):
+            raise ValueError("The value of delta must be between 0 and 1.")
+
+        # The lookup table of the categories is built once for every application
+        # of the plan (e.g. to each chunk of a file).
+        categories = params.get("categories")
+        if categories is not None and not isinstance(
+            categories, categorical.CategoryEncoder
+        ):
+            params["categories"] = categorical.CategoryEncoder(categories)
+
+        self.columns[column] = {"mechanism": mechanism, "epsilon": epsilon, **params}
+        return self
+
+    def validate(self, df: pd.DataFrame):
+        """Check that the plan can be applied to a dataframe.
+
+        :param df: dataframe with the data under study.
+        :type df: pandas dataframe
+        """
+        for column, spec in self.columns.items():
+            if column not in df.keys():
+                raise ValueError(f"Column: {column} not in the dataframe.")
+            if spec["mechanism"] in NUMERICAL_MECHANISMS and not np.issubdtype(
+                df[column].dtype, np.number
+            ):
+                raise ValueError(
+                    f"Type of the column {column} not allowed for the "
+                    f"{spec['mechanism']} mechanism."
+                )
+
+    def apply(
+        self,
+        df: pd.DataFrame,
+        new_column=False,
+        inplace=False,
+        rng=None,
+        accountant=None,
+    ) -> pd.DataFrame:
+        """Apply every mechanism of the plan to its column.
+
+        The time spent in each column is stored in the attribute ``timings``.
+
+        :param df: dataframe with the data under study.
+        :type df: pandas dataframe
+
+        :param new_column: boolean, default to False. If False, the new values
+            obtained with the mechanims applied are stored in the same column. If
+            True, a new column 'dp_{column}' is created for each column.
+        :type  new_column: boolean
+
+        :param inplace: boolean, default to False. If True, the dataframe passed is
+            modified directly and no copy of it is made. If False, a single copy is
+            returned (shallow if the pandas copy-on-write mode is enabled).
+        :type  inplace: boolean
+
+        :param rng: random number generator (numpy Generator) or seed used to
+            create it, shared by all the columns. If None, it is created from the
+            global numpy random state.
+        :type rng: numpy Generator, int or None
+
+        :param accountant: accountant to which the privacy budget spent by all the
+            columns is reported at once. If None, the one active in a with block,
+            if any.
+        :type accountant: trasgodp.BudgetAccountant
+
+        :return: dataframe with the columns transformed applying the mechanisms.
+        :rtype: pandas dataframe.
+        """
+        self.validate(df)
+        # The budget is known from the plan, so it is spent (or refused) before
+        # any column is written.
+        self.spend(accountant)
+        df = output_frame(df, inplace)
+        rng = get_rng(rng)
+
+        self.timings = {}
+        for column, spec in self.columns.items():
+            params = dict(spec)
+            mechanism = MECHANISMS[params.pop("mechanism")]
+            epsilon = params.pop("epsilon")
+
+            start = time.perf_counter()
+            with suspended():
+                mechanism(
+                    df,
+                    column,
+                    epsilon,
+                    new_column=new_column,
+                    inplace=True,
+                    rng=rng,
+                    **params,
+                )
+            self.timings[column] = time.perf_counter() - start
+
+        return df
+
+    def spend(self, accountant=None):
+        """Report the privacy budget spent by applying the plan once.
+
+        The columns are reported together, so either all or none of them are
+        recorded. Applying the plan to disjoint parts of the rows of a dataset
+        (e.g. chunks or shards) spends the budget only once.
+
+        :param accountant: accountant to which the budget is reported. If None,
+            the one active in a with block, if any.
+        :type accountant: trasgodp.BudgetAccountant
+        """
+        accountant = get_accountant(accountant)
+        if accountant is None:
+            return
+        entries = []
+        for column, spec in self.columns.items():
+            parameters = inspect.signature(MECHANISMS[spec["mechanism"]]).parameters
+            delta = 0.0
+            if "delta" in parameters:
+                delta = spec.get("delta", parameters["delta"].default)
+            entries.append(
+                {
+                    "mechanism": spec["mechanism"],
+                    "column": column,
+                    "epsilon": spec["epsilon"],
+                    "delta": delta,
+                }
+            )
+        accountant.spend_all(entries)
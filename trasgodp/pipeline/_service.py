@@ -0,0 +1,314 @@
+# Copyright 2026 Spanish National Research Council (CSIC)
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Asynchronous privatization of small batches of records, coalesced by column."""
+
+import numpy as np
+import pandas as pd
+import asyncio
+import collections
+import functools
+import inspect
+import time
+import typing
+from .. import numerical
+from ..numerical._clip import check_data, integer_bounds
+from .._random import get_rng
+from .._utils import output_frame
+from ._arrow import ARRAY_MECHANISMS
+from ._domains import _missing_domains
+from ._plan import NUMERICAL_MECHANISMS, PrivatizationPlan
+
+
+class PrivatizationService:
+    """Asyncio front end that privatizes many small requests in few vectorized calls.
+
+    The requests for the same column that arrive within a latency window (or
+    until a number of rows is reached) are concatenated, privatized with a single
+    call of the mechanism of the column, and the results are scattered back to
+    each request. The mechanisms are prepared once: the bounds and categories
+    must be given in the plan, so every batch is privatized with the same domain.
+
+    Example::
+
+        async with PrivatizationService(plan, max_delay=0.005) as service:
+            ages = await service.privatize("age", [39, 50, 38])
+            df_dp = await service.privatize_frame(df)
+        service.metrics()
+    """
+
+    def __init__(
+        self,
+        plan: PrivatizationPlan,
+        max_delay: float = 0.002,
+        max_rows: int = 65_536,
+        rng=None,
+        accountant=None,
+        window: int = 10_000,
+    ):
+        """Prepare the mechanism of each column of the plan.
+
+        The records of different requests belong to different individuals, so the
+        privacy budget of the plan is reported once, when the service is created.
+
+        :param plan: plan with the mechanism applied to each column, with the
+            bounds of the numerical columns and the categories of the categorical
+            ones.
+        :type plan: PrivatizationPlan
+
+        :param max_delay: seconds that a request waits for others of its column
+            before the batch is privatized.
+        :type max_delay: float
+
+        :param max_rows: number of rows of a column that triggers the
+            privatization of the batch without waiting.
+        :type max_rows: int
+
+        :param rng: random number generator (numpy Generator, see
+            :func:`trasgodp.make_rng`) or seed used to create it. If None, it is
+            created from the global numpy random state.
+        :type rng: numpy Generator, int or None
+
+        :param accountant: accountant to which the privacy budget is reported. If
+            None, the one active in a with block, if any.
+        :type accountant: trasgodp.BudgetAccountant
+
+        :param window: number of latest requests whose latency is kept for the
+            metrics.
+        :type window: int
+        """
+        missing = _missing_domains(plan)
+        if missing:
+            raise ValueError(
+                f"The bounds or categories of the columns {missing} must be given."
+            )
+        if max_delay < 0:
+            raise ValueError("The maximum delay must not be negative.")
+        if max_rows < 1:
+            raise ValueError("The maximum number of rows must be positive.")
+
+        self.plan = plan
+        self.max_delay = max_delay
+        self.max_rows = max_rows
+        rng = get_rng(rng)
+        self._mechanisms = {
+            column: _prepare(spec, child)
+            for (column, spec), child in zip(
+                plan.columns.items(), rng.spawn(len(plan.columns))
+            )
+        }
+        self._pending = {column: [] for column in plan.columns}
+        self._pending_rows = dict.fromkeys(plan.columns, 0)
+        self._timers = {}
+        self._latencies = collections.deque(maxlen=window)
+        self._requests = 0
+        self._rows = 0
+        self._batches = 0
+        self._start = None
+        plan.spend(accountant)
+
+    async def privatize(
+        self, column: str, values: typing.Union[typing.List, np.ndarray]
+    ) -> np.ndarray:
+        """Privatize the values of a column, batched with concurrent requests.
+
+        :param column: column of the plan to which the values belong.
+        :type column: string
+
+        :param values: values of some records.
+        :type values: list or numpy array
+
+        :return: values with the mechanism of the column applied.
+        :rtype: numpy array
+        """
+        if column not in self._mechanisms:
+            raise ValueError(f"Column: {column} not in the plan.")
+        # Each request is checked (and encoded) on its own, so an invalid one
+        # fails without affecting the requests batched with it.
+        values = self._mechanisms[column].check(values)
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        start = time.perf_counter()
+        if self._start is None:
+            self._start = start
+        self._pending[column].append((values, future, start))
+        self._pending_rows[column] += len(values)
+        if self._pending_rows[column] >= self.max_rows:
+            self._flush(column)
+        elif column not in self._timers:
+            self._timers[column] = loop.call_later(self.max_delay, self._flush, column)
+        return await future
+
+    async def privatize_frame(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Privatize the columns of the plan present in a dataframe of records.
+
+        :param df: dataframe with some records.
+        :type df: pandas dataframe
+
+        :return: copy of the dataframe with the columns transformed.
+        :rtype: pandas dataframe
+        """
+        columns = [column for column in self.plan.columns if column in df.columns]
+        results = await asyncio.gather(
+            *(self.privatize(column, df[column].to_numpy()) for column in columns)
+        )
+        df = output_frame(df)
+        for column, result in zip(columns, results):
+            df[column] = result
+        return df
+
+    def flush(self):
+        """Privatize the pending requests of every column without waiting."""
+        for column in self._pending:
+            if self._pending[column]:
+                self._flush(column)
+
+    async def close(self):
+        """Privatize the pending requests and let their results be delivered."""
+        self.flush()
+        await asyncio.sleep(0)
+
+    async def __aenter__(self) -> "PrivatizationService":
+        """Use the service in an async with block."""
+        return self
+
+    async def __aexit__(self, *exc_info):
+        """Privatize the pending requests when leaving the block."""
+        await self.close()
+        return False
+
+    def metrics(self) -> dict:
+        """Get the throughput and latency of the service.
+
+        :return: dictionary with the number of requests, rows and batches, the
+            mean rows per batch, the rows per second since the first request and
+            the median and 99th percentile of the latency of the latest requests
+            in seconds.
+        :rtype: dict
+        """
+        elapsed = time.perf_counter() - self._start if self._start else 0.0
+        if self._latencies:
+            p50, p99 = np.percentile(np.fromiter(self._latencies, float), [50, 99])
+        else:
+            p50 = p99 = float("nan")
+        return {
+            "requests": self._requests,
+            "rows": self._rows,
+            "batches": self._batches,
+            "rows_per_batch": self._rows / self._batches if self._batches else 0.0,
+            "rows_per_second": self._rows / elapsed if elapsed > 0 else 0.0,
+            "latency_p50": float(p50),
+            "latency_p99": float(p99),
+        }
+
+    def _flush(self, column):
+        """Privatize the pending requests of a column in a single call."""
+        timer = self._timers.pop(column, None)
+        if timer is not None:
+            timer.cancel()
+        pending = self._pending[column]
+        self._pending[column] = []
+        self._pending_rows[column] = 0
+        if not pending:
+            return
+
+        try:
+            results = self._mechanisms[column]([values for values, _, _ in pending])
+        except Exception as e:
+            for _, future, _ in pending:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        end = time.perf_counter()
+        for (values, future, start), result in zip(pending, results):
+            if not future.done():
+                future.set_result(result)
+            self._latencies.append(end - start)
+            self._rows += len(values)
+        self._requests += len(pending)
+        self._batches += 1
+
+
+def _prepare(spec, rng):
+    """Build the vectorized mechanism of a column."""
+    params = dict(spec)
+    mechanism = params.pop("mechanism")
+    epsilon = params.pop("epsilon")
+    if mechanism in NUMERICAL_MECHANISMS:
+        return _NumericColumn(
+            numerical.NumericMechanism(mechanism, epsilon, rng=rng, **params)
+        )
+    function = ARRAY_MECHANISMS[mechanism]
+    allowed = inspect.signature(function).parameters
+    params = {key: value for key, value in params.items() if key in allowed}
+    return _CategoricalColumn(function, epsilon, rng, params)
+
+
+class _NumericColumn:
+    """Numerical mechanism applied to the requests of a column at once."""
+
+    def __init__(self, mechanism):
+        """Keep the mechanism of the column."""
+        self.mechanism = mechanism
+        self.name = "Laplace" if mechanism.mechanism == "laplace" else "Gaussian"
+
+    def check(self, values):
+        """Check the values of a request."""
+        data, _ = check_data(values, self.name)
+        if data.ndim != 1:
+            raise ValueError("Only 1-D arrays are supported.")
+        return data
+
+    def __call__(self, parts):
+        """Privatize the values of several requests, keeping the type of each."""
+        data = np.concatenate(parts, dtype=np.float64)
+        result = self.mechanism(data, copy=False)
+        offsets = np.cumsum([len(part) for part in parts[:-1]])
+        results = np.split(result, offsets)
+        for i, part in enumerate(parts):
+            if np.issubdtype(part.dtype, np.integer):
+                # Rounded as the mechanism does with integer data.
+                lower, upper = integer_bounds(
+                    self.mechanism.lower_bound, self.mechanism.upper_bound
+                )
+                rounded = np.clip(np.round(results[i]), lower, upper)
+                results[i] = rounded.astype(part.dtype)
+        return results
+
+
+class _CategoricalColumn:
+    """Categorical mechanism applied to the codes of the requests of a column."""
+
+    def __init__(self, function, epsilon, rng, params):
+        """Keep the mechanism of the column with its parameters."""
+        self.encoder = params["categories"]
+        self.function = functools.partial(function, epsilon=epsilon, rng=rng, **params)
+
+    def check(self, values):
+        """Encode the values of a request in the categories of the column."""
+        values = np.asarray(values)
+        if values.ndim != 1:
+            raise ValueError("Only 1-D arrays are supported.")
+        return self.encoder.encode(values)
+
+    def __call__(self, parts):
+        """Privatize the codes of several requests."""
+        codes = pd.Categorical.from_codes(
+            np.concatenate(parts), categories=self.encoder.index
+        )
+        result = np.asarray(self.function(codes))
+        offsets = np.cumsum([len(part) for part in parts[:-1]])
+        return np.split(result, offsets)
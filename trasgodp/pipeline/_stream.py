@@ -0,0 +1,263 @@
+# Copyright 2026 Spanish National Research Council (CSIC)
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Privatization of CSV and Parquet files by chunks."""
+
+import numpy as np
+import pandas as pd
+import collections
+import concurrent.futures
+import time
+from .._accountant import suspended
+from .._random import make_rng
+from ._arrow import apply_arrow, column_values
+from ._domains import _missing_domains, fix_domains
+from ._plan import PrivatizationPlan
+
+
+def privatize_csv(
+    plan: PrivatizationPlan,
+    input_path: str,
+    output_path: str,
+    chunksize: int = 100_000,
+    new_column=False,
+    accountant=None,
+    n_workers: int = 1,
+    seed=None,
+    **kwargs,
+) -> dict:
+    """Apply a privatization plan to a CSV file reading and writing it by chunks.
+
+    The bounds of the numerical columns and the categories of the categorical
+    ones not given in the plan are obtained in a first pass over the file (reading
+    only those columns), so every chunk is privatized with the same values as if
+    the whole file were processed in memory.
+
+    :param plan: plan with the mechanism applied to each column.
+    :type plan: PrivatizationPlan
+
+    :param input_path: path of the CSV file with the data under study.
+    :type input_path: string
+
+    :param output_path: path of the CSV file where the data with DP is written.
+    :type output_path: string
+
+    :param chunksize: number of rows read and privatized at a time.
+    :type chunksize: int
+
+    :param new_column: boolean, default to False. If False, the new values
+        obtained with the mechanims applied are stored in the same column. If
+        True, a new column 'dp_{column}' is created for each column.
+    :type  new_column: boolean
+
+    :param accountant: accountant to which the privacy budget spent is reported,
+        once for the whole file. If None, the one active in a with block, if any.
+    :type accountant: trasgodp.BudgetAccountant
+
+    :param n_workers: number of processes privatizing chunks at the same time,
+        which are written in order.
+    :type n_workers: int
+
+    :param seed: seed of the SeedSequence from which a generator is spawned for
+        each chunk, so the result does not depend on the number of workers. If
+        None, the global numpy random state (one worker) or fresh entropy.
+    :type seed: int, numpy SeedSequence or None
+
+    :param kwargs: other arguments for reading the file with pandas read_csv.
+    :type kwargs: dict
+
+    :return: dictionary with the number of rows, the seconds spent, the rows per
+        second and the seconds spent in each column.
+    :rtype: dict
+    """
+    missing = _missing_domains(plan)
+    if missing:
+        chunks = pd.read_csv(input_path, usecols=missing, chunksize=chunksize, **kwargs)
+        plan = fix_domains(plan, chunks)
+
+    def write(chunk, first):
+        chunk.to_csv(output_path, mode="w" if first else "a", header=first, index=False)
+
+    chunks = pd.read_csv(input_path, chunksize=chunksize, **kwargs)
+    return _privatize_chunks(
+        plan, chunks, write, new_column, accountant, n_workers=n_workers, seed=seed
+    )
+
+
+def privatize_parquet(
+    plan: PrivatizationPlan,
+    input_path: str,
+    output_path: str,
+    batch_size: int = 100_000,
+    new_column=False,
+    accountant=None,
+    n_workers: int = 1,
+    seed=None,
+) -> dict:
+    """Apply a privatization plan to a Parquet file reading and writing it by batches.
+
+    Requires pyarrow. The bounds and categories not given in the plan are obtained
+    as in :func:`privatize_csv`. The batches are privatized as Arrow data (see
+    :func:`apply_arrow`): the string columns are read dictionary encoded and
+    written back as dictionaries, without building pandas object columns.
+
+    :param plan: plan with the mechanism applied to each column.
+    :type plan: PrivatizationPlan
+
+    :param input_path: path of the Parquet file with the data under study.
+    :type input_path: string
+
+    :param output_path: path of the Parquet file where the data with DP is written.
+    :type output_path: string
+
+    :param batch_size: number of rows read and privatized at a time.
+    :type batch_size: int
+
+    :param new_column: boolean, default to False. If False, the new values
+        obtained with the mechanims applied are stored in the same column. If
+        True, a new column 'dp_{column}' is created for each column.
+    :type  new_column: boolean
+
+    :param accountant: accountant to which the privacy budget spent is reported,
+        once for the whole file. If None, the one active in a with block, if any.
+    :type accountant: trasgodp.BudgetAccountant
+
+    :param n_workers: number of processes privatizing chunks at the same time,
+        which are written in order.
+    :type n_workers: int
+
+    :param seed: seed of the SeedSequence from which a generator is spawned for
+        each chunk, so the result does not depend on the number of workers. If
+        None, the global numpy random state (one worker) or fresh entropy.
+    :type seed: int, numpy SeedSequence or None
+
+    :return: dictionary with the number of rows, the seconds spent, the rows per
+        second and the seconds spent in each column.
+    :rtype: dict
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError("pyarrow is required for reading Parquet files.") from e
+
+    schema = pq.read_schema(input_path)
+    string_types = (pa.string(), pa.large_string())
+    strings = [
+        field.name
+        for field in schema
+        if field.name in plan.columns and field.type in string_types
+    ]
+    parquet_file = pq.ParquetFile(input_path, read_dictionary=strings)
+    missing = _missing_domains(plan)
+    if missing:
+        batches = parquet_file.iter_batches(batch_size=batch_size, columns=missing)
+        plan = fix_domains(
+            plan,
+            (
+                pd.DataFrame({c: column_values(batch.column(c)) for c in missing})
+                for batch in batches
+            ),
+        )
+
+    writer = None
+
+    def write(batch, first):
+        nonlocal writer
+        if first:
+            writer = pq.ParquetWriter(output_path, batch.schema)
+        if batch.schema != writer.schema:
+            batch = batch.cast(writer.schema)
+        writer.write_batch(batch)
+
+    batches = parquet_file.iter_batches(batch_size=batch_size)
+    try:
+        return _privatize_chunks(
+            plan,
+            batches,
+            write,
+            new_column,
+            accountant,
+            arrow=True,
+            n_workers=n_workers,
+            seed=seed,
+        )
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+def _privatize_chunks(
+    plan, chunks, write, new_column, accountant, arrow=False, n_workers=1, seed=None
+):
+    """Apply a plan to each chunk and write it, measuring the throughput."""
+    if n_workers < 1:
+        raise ValueError("The number of workers must be positive.")
+    # The chunks are disjoint sets of rows, so the budget is spent once, before
+    # anything is written.
+    plan.spend(accountant)
+    seeds = None
+    if seed is not None or n_workers > 1:
+        seeds = np.random.SeedSequence(seed)
+
+    rows = 0
+    timings = {}
+    start = time.perf_counter()
+    results = _apply_chunks(plan, chunks, new_column, arrow, n_workers, seeds)
+    for i, (chunk, chunk_timings) in enumerate(results):
+        write(chunk, i == 0)
+        rows += len(chunk)
+        for column, seconds in chunk_timings.items():
+            timings[column] = timings.get(column, 0) + seconds
+
+    seconds = time.perf_counter() - start
+    return {
+        "rows": rows,
+        "seconds": seconds,
+        "rows_per_second": rows / seconds if seconds > 0 else float("inf"),
+        "timings": timings,
+    }
+
+
+def _apply_chunks(plan, chunks, new_column, arrow, n_workers, seeds):
+    """Apply a plan to the chunks in order, in a pool of processes if several."""
+    tasks = (
+        (plan, chunk, None if seeds is None else seeds.spawn(1)[0], new_column, arrow)
+        for chunk in chunks
+    )
+    if n_workers == 1:
+        for task in tasks:
+            yield _apply_chunk(*task)
+        return
+
+    # Only a few chunks are read ahead, so the memory used stays bounded.
+    with concurrent.futures.ProcessPoolExecutor(max_workers=n_workers) as pool:
+        pending = collections.deque()
+        for task in tasks:
+            pending.append(pool.submit(_apply_chunk, *task))
+            if len(pending) >= 2 * n_workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def _apply_chunk(plan, chunk, seed, new_column, arrow):
+    """Apply a plan to a chunk, returning it with the time spent in each column."""
+    rng = None if seed is None else make_rng(seed)
+    with suspended():
+        if arrow:
+            chunk = apply_arrow(plan, chunk, new_column=new_column, rng=rng)
+        else:
+            chunk = plan.apply(chunk, new_column=new_column, inplace=True, rng=rng)
+    return chunk, plan.timings
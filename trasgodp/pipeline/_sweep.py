@@ -0,0 +1,291 @@
+# Copyright 2026 Spanish National Research Council (CSIC)
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Privacy-utility curves of a mechanism over a grid of privacy budgets."""
+
+import numpy as np
+import pandas as pd
+import typing
+import concurrent.futures
+import scipy
+from .._parameters import binary_labels, gaussian_sigma
+from .._random import gaussian_noise, get_rng, laplace_noise
+from ..categorical._encoding import decode, encode
+from ..categorical._exponential import _exponential_codes
+from ..categorical._randomized_response import _binary_bits, _kary_codes
+from ..metrics import DatasetProfile, UtilityEvaluator
+from ..numerical._clip import check_data, clip_noise, get_bounds
+from ._plan import MECHANISMS, NUMERICAL_MECHANISMS
+
+SWEEP_PARAMETERS = {
+    "laplace": {"lower_bound", "upper_bound"},
+    "gaussian": {"lower_bound", "upper_bound", "delta", "calibration"},
+    "exponential": {"categories"},
+    "randomized_response_binary": {"positive_label"},
+    "randomized_response_kary": {"categories"},
+}
+
+
+def sweep(
+    df: pd.DataFrame,
+    column: str,
+    mechanism: str,
+    epsilons: typing.Union[typing.List[float], np.ndarray],
+    repetitions: int = 10,
+    features: typing.Optional[typing.List[str]] = None,
+    method: str = "pearson",
+    confidence: float = 0.95,
+    n_workers=None,
+    rng=None,
+    **params,
+) -> pd.DataFrame:
+    """Evaluate the utility of a mechanism applied to a column for several budgets.
+
+    The original dataset is profiled once (see
+    :class:`trasgodp.metrics.DatasetProfile`) and the random numbers of each
+    repetition are drawn once and shared by all the privacy budgets of the grid:
+    the noise of the numerical mechanisms is sampled at unit scale and rescaled,
+    and the uniform values of the categorical mechanisms are compared with the
+    probabilities of each budget. The curves are therefore smooth in epsilon and
+    cheaper to compute. The budgets of the grid are privatized and evaluated in
+    parallel by a pool of threads.
+
+    :param df: dataframe with the data under study.
+    :type df: pandas dataframe
+
+    :param column: column to which the DP mechanism is applied.
+    :type column: string
+
+    :param mechanism: name of the mechanism (a key of
+        :data:`trasgodp.pipeline.MECHANISMS`).
+    :type mechanism: string
+
+    :param epsilons: grid of privacy budgets.
+    :type epsilons: list or numpy array
+
+    :param repetitions: number of times the mechanism is applied to each budget.
+    :type repetitions: int
+
+    :param features: list of featured for calculating the correlation loss. If
+        None, all the columns.
+    :type features: list
+
+    :param method: method for calculating the correlation.
+    :type method: string
+
+    :param confidence: confidence level of the intervals of the mean.
+    :type confidence: float
+
+    :param n_workers: number of threads. If None, the default of the executor.
+    :type n_workers: int
+
+    :param rng: random number generator (numpy Generator, see
+        :func:`trasgodp.make_rng`) or seed used to create it. If None, it is
+        created from the global numpy random state.
+    :type rng: numpy Generator, int or None
+
+    :param params: parameters of the mechanism: 'lower_bound' and 'upper_bound'
+        (and 'delta' and 'calibration' for the Gaussian mechanism) for the
+        numerical ones, 'categories' for the Exponential and k-ary Randomized
+        Response, and 'positive_label' for the binary Randomized Response.
+
+    :return: dataframe with a row per budget and metric ('correlation_loss',
+        'tvd', 'js' and 'kl') with the mean, the standard deviation and the
+        confidence interval of the mean over the repetitions.
+    :rtype: pandas dataframe.
+    """
+    if mechanism not in MECHANISMS:
+        raise ValueError(f"Mechanism not allowed: {mechanism}.")
+    unknown = set(params) - SWEEP_PARAMETERS[mechanism]
+    if unknown:
+        raise ValueError(f"Parameters not allowed for {mechanism}: {unknown}.")
+    if column not in df.columns:
+        raise ValueError(f"Column: {column} not in the dataframe.")
+
+    epsilons = np.asarray(epsilons, dtype=float).ravel()
+    if len(epsilons) == 0 or np.any(epsilons <= 0):
+        raise ValueError("The privacy budgets must be greater than 0.")
+    if repetitions < 1:
+        raise ValueError("At least one repetition is required.")
+    if not 0 < confidence < 1:
+        raise ValueError("The confidence level must be between 0 and 1.")
+
+    evaluator = UtilityEvaluator(DatasetProfile(df), features, method)
+    needed = list(dict.fromkeys(evaluator.features + [column]))
+    base = df[needed]
+    privatize = _Privatizer(df[column].values, mechanism, params)
+    rng = get_rng(rng)
+
+    records = []
+    with concurrent.futures.ThreadPoolExecutor(max_workers=n_workers) as pool:
+        for _ in range(repetitions):
+            draws = privatize.draw(rng)
+
+            def evaluate(epsilon, draws=draws):
+                df_dp = base.copy(deep=False)
+                df_dp[column] = privatize(epsilon, draws)
+                result = evaluator.evaluate(df_dp, columns=[column])
+                return {
+                    "epsilon": epsilon,
+                    "correlation_loss": result["correlation_loss"],
+                    **result["divergence"][column],
+                }
+
+            records.extend(pool.map(evaluate, epsilons))
+
+    return _summarize(pd.DataFrame(records), repetitions, confidence)
+
+
+class _Privatizer:
+    """Apply a mechanism to a column from random numbers drawn beforehand.
+
+    The random numbers are given to the kernels of the mechanisms, which are the
+    same ones used when they are applied to a dataframe.
+    """
+
+    def __init__(self, data, mechanism, params):
+        """Check the column and prepare the domain of the mechanism.
+
+        :param data: values of the column.
+        :type data: numpy array
+
+        :param mechanism: name of the mechanism.
+        :type mechanism: string
+
+        :param params: parameters of the mechanism.
+        :type params: dict
+        """
+        self.mechanism = mechanism
+        self.n = len(data)
+        if mechanism in NUMERICAL_MECHANISMS:
+            self.name = "Laplace" if mechanism == "laplace" else "Gaussian"
+            self.data, self.integer = check_data(data, self.name)
+            self.lower, self.upper = get_bounds(
+                self.data, params.get("lower_bound"), params.get("upper_bound")
+            )
+            self.sensitivity = self.upper - self.lower
+            if mechanism == "gaussian":
+                self.delta = params.get("delta", 1e-3)
+                if self.delta <= 0 or self.delta >= 1:
+                    raise ValueError("The value of delta must be between 0 and 1.")
+                self.calibration = params.get("calibration", "classic")
+                gaussian_sigma(self.sensitivity, 1, self.delta, self.calibration)
+            return
+
+        if mechanism == "exponential" and not isinstance(data[0], str):
+            raise ValueError(
+                "Type of the column not allowed for the Exponential mechanism."
+            )
+        self.categories, self.codes = encode(data, params.get("categories"))
+        self.k = len(self.categories)
+        if mechanism == "randomized_response_kary" and self.k < 3:
+            raise ValueError("Three or more categories are required.")
+        if mechanism == "randomized_response_binary":
+            if self.k != 2:
+                raise ValueError("The column must have exactly two categories.")
+            self.labels = binary_labels(self.categories, params.get("positive_label"))
+            self.positive = self.codes == list(self.categories).index(self.labels[0])
+
+    def draw(self, rng):
+        """Draw the random numbers of one repetition, shared by all the budgets.
+
+        :param rng: random number generator.
+        :type rng: numpy Generator
+
+        :return: random numbers used by the mechanism.
+        :rtype: tuple of numpy arrays.
+        """
+        if self.mechanism == "laplace":
+            return (laplace_noise(rng, 1.0, size=self.n),)
+        if self.mechanism == "gaussian":
+            return (gaussian_noise(rng, 1.0, size=self.n),)
+        uniform = rng.random(self.n)
+        if self.mechanism == "exponential":
+            high = max(self.k - 1, 1)
+            return uniform, rng.integers(0, high, size=self.n, dtype=self.codes.dtype)
+        if self.mechanism == "randomized_response_kary":
+            return uniform, rng.integers(0, self.k, size=self.n, dtype=self.codes.dtype)
+        return (uniform,)
+
+    def __call__(self, epsilon, draws):
+        """Apply the mechanism with a privacy budget.
+
+        :param epsilon: privacy budget.
+        :type epsilon: float
+
+        :param draws: random numbers returned by :meth:`draw`.
+        :type draws: tuple of numpy arrays
+
+        :return: values of the column with the mechanism applied.
+        :rtype: numpy array.
+        """
+        if self.mechanism in NUMERICAL_MECHANISMS:
+            if self.mechanism == "laplace":
+                scale = self.sensitivity / epsilon
+            else:
+                scale = gaussian_sigma(
+                    self.sensitivity, epsilon, self.delta, self.calibration
+                )
+            return clip_noise(
+                self.data,
+                self.lower,
+                self.upper,
+                scale,
+                self.name,
+                self.integer,
+                copy=True,
+                rng=None,
+                noise=draws[0],
+            )
+
+        if self.mechanism == "exponential":
+            codes = _exponential_codes(self.codes, self.k, epsilon, None, *draws)
+        elif self.mechanism == "randomized_response_kary":
+            codes = _kary_codes(self.codes, self.k, epsilon, None, *draws)
+        else:
+            positive = _binary_bits(self.positive, epsilon, None, *draws)
+            return np.where(positive, self.labels[0], self.labels[1])
+        return decode(codes, self.categories, False)
+
+
+def _summarize(results, repetitions, confidence):
+    """Get the mean and the confidence interval of each metric and budget.
+
+    :param results: dataframe with the metrics of each budget and repetition.
+    :type results: pandas dataframe
+
+    :param repetitions: number of repetitions.
+    :type repetitions: int
+
+    :param confidence: confidence level of the intervals.
+    :type confidence: float
+
+    :return: tidy dataframe with a row per budget and metric.
+    :rtype: pandas dataframe.
+    """
+    tidy = results.melt(id_vars="epsilon", var_name="metric")
+    summary = (
+        tidy.groupby(["epsilon", "metric"], sort=False)["value"]
+        .agg(["mean", "std"])
+        .reset_index()
+    )
+    if repetitions > 1:
+        t = scipy.stats.t.ppf((1 + confidence) / 2, repetitions - 1)
+        half_width = t * summary["std"] / np.sqrt(repetitions)
+    else:
+        half_width = np.nan
+    summary["ci_lower"] = summary["mean"] - half_width
+    summary["ci_upper"] = summary["mean"] + half_width
+    summary["repetitions"] = repetitions
+    return summary.sort_values(["epsilon", "metric"], kind="stable", ignore_index=True)